@@ -1,4 +1,7 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
@@ -7,8 +10,11 @@ class CoreConfig(AppConfig):
     verbose_name = 'Core'
 
     def ready(self):
-        """Import signal handlers when the app is ready."""
+        """Import signal handlers and create the upload spool directory."""
         try:
             import apps.core.signals  # noqa F401
         except ImportError:
             pass
+        
+        if settings.FILE_UPLOAD_TEMP_DIR:
+            os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
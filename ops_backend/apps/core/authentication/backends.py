@@ -5,14 +5,58 @@ This module provides custom authentication backends that integrate
 with our RBAC system and security event logging.
 """
 
+import time
+
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
 from apps.core.models import SecurityEvent
 from apps.core.services.security_service import SecurityService
 
 User = get_user_model()
 
+# Upper bound (seconds) for caching the user resolved from a JWT
+JWT_USER_CACHE_TIMEOUT = 300
+JWT_USER_CACHE_KEY = 'jwt:user:{jti}'
+# When a user's cached entries were last invalidated (role or status change)
+JWT_USER_INVALIDATED_KEY = 'jwt:user:invalidated:{user_id}'
+
+# Per-minute login attempt counters, keyed by client IP and username
+LOGIN_THROTTLE_KEY = 'login:throttle:{ip}:{username}:{window}'
+LOGIN_THROTTLE_WINDOW_SECONDS = 60
+
+# Columns the login path reads or writes on the user; everything else is deferred
+LOGIN_USER_FIELDS = (
+    'id', 'username', 'password', 'is_active', 'failed_login_attempts',
+    'account_locked_until', 'role',
+)
+
+
+def _count_login_attempt(ip_address, username):
+    """
+    Count a login attempt in the current one-minute window.
+    
+    Returns:
+        int: Attempts from this IP for this username in the window, or 0
+        if the cache is unavailable (the throttle then fails open)
+    """
+    window = int(time.time()) // LOGIN_THROTTLE_WINDOW_SECONDS
+    key = LOGIN_THROTTLE_KEY.format(ip=ip_address, username=username, window=window)
+    try:
+        cache.add(key, 0, timeout=LOGIN_THROTTLE_WINDOW_SECONDS)
+        return cache.incr(key)
+    except Exception:
+        return 0
+
 
 class RBACAuthenticationBackend(ModelBackend):
     """
@@ -34,108 +78,151 @@ class RBACAuthenticationBackend(ModelBackend):
             
         Returns:
             User instance if authentication successful, None otherwise
+        
+        Raises:
+            PermissionDenied: If the attempt is throttled or the account is
+                locked, so later backends (e.g. ModelBackend) are not tried
         """
-        # Get client IP and user agent for security logging
+        # Get client IP and request details for security logging
         ip_address = self._get_client_ip(request)
-        user_agent = request.META.get('HTTP_USER_AGENT', '') if request else ''
+        user_agent, request_path, request_method = self._get_request_details(request)
+        
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        
+        # Throttle brute-force floods before touching the database
+        if username is not None:
+            limit = settings.LOGIN_ATTEMPTS_PER_MINUTE
+            attempts = _count_login_attempt(ip_address, username)
+            if attempts > limit:
+                # Record the first rejected attempt of the window only
+                if attempts == limit + 1:
+                    SecurityService.log_security_event_async(
+                        event_type='login_failure',
+                        user=None,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        request_path=request_path,
+                        request_method=request_method,
+                        details={'reason': 'rate_limited', 'username': username},
+                        severity='high',
+                        request=request
+                    )
+                raise PermissionDenied
         
         # Log login attempt
-        SecurityService.log_security_event(
+        SecurityService.log_security_event_async(
             event_type='login_attempt',
             user=None,
             ip_address=ip_address,
             user_agent=user_agent,
-            request_path=request.path if request else '',
-            request_method=request.method if request else '',
-            details={'username': username}
+            request_path=request_path,
+            request_method=request_method,
+            details={'username': username},
+            request=request
         )
         
-        # Check if account is locked
-        if username:
-            try:
-                user = User.objects.get(username=username)
-                if user.is_account_locked():
-                    SecurityService.log_security_event(
-                        event_type='login_failure',
-                        user=user,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_path=request.path if request else '',
-                        request_method=request.method if request else '',
-                        details={
-                            'reason': 'account_locked',
-                            'locked_until': user.account_locked_until.isoformat() if user.account_locked_until else None
-                        },
-                        severity='high'
-                    )
-                    return None
-            except User.DoesNotExist:
-                pass
+        if username is None:
+            return None
+        
+        # Look the user up once; the same row serves the lockout check,
+        # the password check and the failed-attempt bookkeeping
+        try:
+            user = (
+                User.objects
+                .only(*LOGIN_USER_FIELDS)
+                .select_related('role')
+                .get(username=username)
+            )
+        except User.DoesNotExist:
+            # Run the password hasher once to reduce the timing difference
+            # between existing and nonexistent users (as ModelBackend does)
+            User().set_password(password)
+            
+            SecurityService.log_security_event_async(
+                event_type='login_failure',
+                user=None,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                request_path=request_path,
+                request_method=request_method,
+                details={'reason': 'user_not_found'},
+                severity='medium',
+                request=request
+            )
+            return None
         
-        # Perform standard authentication
-        user = super().authenticate(request, username, password, **kwargs)
+        # Check if account is locked
+        if user.is_account_locked():
+            SecurityService.log_security_event_async(
+                event_type='login_failure',
+                user=user,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                request_path=request_path,
+                request_method=request_method,
+                details={
+                    'reason': 'account_locked',
+                    'locked_until': user.account_locked_until.isoformat() if user.account_locked_until else None
+                },
+                severity='high',
+                request=request
+            )
+            raise PermissionDenied
         
-        if user:
+        if user.check_password(password) and self.user_can_authenticate(user):
             # Reset failed login attempts on successful login
             user.reset_failed_login_attempts()
             
             # Log successful login
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='login_success',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path if request else '',
-                request_method=request.method if request else '',
-                details={'role': user.role.codename if user.role else None}
+                request_path=request_path,
+                request_method=request_method,
+                details={'role': user.role.codename if user.role else None},
+                request=request
             )
-        else:
-            # Log failed login attempt
-            if username:
-                try:
-                    user = User.objects.get(username=username)
-                    user.increment_failed_login_attempts()
-                    
-                    SecurityService.log_security_event(
-                        event_type='login_failure',
-                        user=user,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_path=request.path if request else '',
-                        request_method=request.method if request else '',
-                        details={
-                            'reason': 'invalid_password',
-                            'failed_attempts': user.failed_login_attempts
-                        },
-                        severity='medium'
-                    )
-                except User.DoesNotExist:
-                    SecurityService.log_security_event(
-                        event_type='login_failure',
-                        user=None,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_path=request.path if request else '',
-                        request_method=request.method if request else '',
-                        details={'reason': 'user_not_found'},
-                        severity='medium'
-                    )
+            return user
         
-        return user
+        # Log failed login attempt
+        user.increment_failed_login_attempts()
+        
+        SecurityService.log_security_event_async(
+            event_type='login_failure',
+            user=user,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            request_path=request_path,
+            request_method=request_method,
+            details={
+                'reason': 'invalid_password',
+                'failed_attempts': user.failed_login_attempts
+            },
+            severity='medium',
+            request=request
+        )
+        return None
+    
+    def get_user(self, user_id):
+        """Load the session user with the primary role joined for permission checks."""
+        try:
+            user = User._default_manager.select_related('role').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
     
     def _get_client_ip(self, request):
         """Get the client IP address from the request."""
+        return SecurityService.get_client_ip(request)
+    
+    def _get_request_details(self, request):
+        """Return the user agent, path and method of the request for logging."""
         if not request:
-            return '127.0.0.1'
-        
-        # Check for forwarded IP first
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR', '127.0.0.1')
-        
-        return ip
+            return '', '', ''
+        return request.META.get('HTTP_USER_AGENT', ''), request.path, request.method
 
 
 class JWTAuthenticationBackend(RBACAuthenticationBackend):
@@ -162,9 +249,6 @@ class JWTAuthenticationBackend(RBACAuthenticationBackend):
             return None
         
         try:
-            from rest_framework_simplejwt.tokens import AccessToken
-            from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-            
             # Validate JWT token
             access_token = AccessToken(token)
             user_id = access_token.get('user_id')
@@ -172,21 +256,46 @@ class JWTAuthenticationBackend(RBACAuthenticationBackend):
             if not user_id:
                 return None
             
-            # Get user and verify they're still active
-            user = User.objects.get(id=user_id, is_active=True)
+            # Reuse the user resolved for this token while it is cached and
+            # was cached after the user's last invalidation
+            jti = access_token.get('jti')
+            cache_key = JWT_USER_CACHE_KEY.format(jti=jti) if jti else None
+            user = None
+            if cache_key:
+                invalidated_key = JWT_USER_INVALIDATED_KEY.format(user_id=user_id)
+                cached = cache.get_many([cache_key, invalidated_key])
+                entry = cached.get(cache_key)
+                if entry is not None and entry[0] > cached.get(invalidated_key, 0):
+                    user = entry[1]
+            
+            if user is None:
+                # Taken before the read so a concurrent invalidation wins
+                cached_at = time.time()
+                # Get user and verify they're still active
+                user = (
+                    User.objects
+                    .select_related('role')
+                    .prefetch_related('additional_roles')
+                    .get(id=user_id, is_active=True)
+                )
+                if cache_key:
+                    timeout = min(access_token['exp'] - int(time.time()), JWT_USER_CACHE_TIMEOUT)
+                    if timeout > 0:
+                        cache.set(cache_key, (cached_at, user), timeout=timeout)
             
             # Log token validation
             ip_address = self._get_client_ip(request)
-            user_agent = request.META.get('HTTP_USER_AGENT', '') if request else ''
+            user_agent, request_path, request_method = self._get_request_details(request)
             
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='permission_check',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path if request else '',
-                request_method=request.method if request else '',
-                details={'auth_method': 'jwt_token'}
+                request_path=request_path,
+                request_method=request_method,
+                details={'auth_method': 'jwt_token'},
+                request=request
             )
             
             return user
@@ -194,17 +303,73 @@ class JWTAuthenticationBackend(RBACAuthenticationBackend):
         except (InvalidToken, TokenError, User.DoesNotExist):
             # Log invalid token attempt
             ip_address = self._get_client_ip(request)
-            user_agent = request.META.get('HTTP_USER_AGENT', '') if request else ''
+            user_agent, request_path, request_method = self._get_request_details(request)
             
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=None,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path if request else '',
-                request_method=request.method if request else '',
+                request_path=request_path,
+                request_method=request_method,
                 details={'reason': 'invalid_jwt_token'},
-                severity='medium'
+                severity='medium',
+                request=request
             )
             
             return None
+    
+    @staticmethod
+    def invalidate_cached_user(jti):
+        """Drop the cached user for a token, e.g. on logout."""
+        if jti:
+            cache.delete(JWT_USER_CACHE_KEY.format(jti=jti))
+    
+    @staticmethod
+    def invalidate_cached_users(user_id):
+        """
+        Stop serving every cached copy of a user, e.g. after a role change.
+        
+        Entries are tied to token jtis, so instead of deleting them this
+        records the invalidation time; entries cached earlier are ignored.
+        The marker only needs to outlive those entries.
+        """
+        cache.set(
+            JWT_USER_INVALIDATED_KEY.format(user_id=user_id),
+            time.time(),
+            timeout=JWT_USER_CACHE_TIMEOUT
+        )
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    DRF JWT authentication that loads the user's primary role with the user.
+    
+    Role checks read ``request.user.role_codename``; joining the role here
+    saves the extra query the first such check would otherwise make on
+    every request. Otherwise identical to simplejwt's ``get_user``.
+    """
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        try:
+            user = self.user_model.objects.select_related('role').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        
+        return user
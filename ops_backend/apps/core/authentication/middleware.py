@@ -5,18 +5,84 @@ This middleware provides security monitoring and logging for all requests,
 ensuring comprehensive security event tracking across the application.
 """
 
+import re
+import time
+
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
-from django.utils import timezone
 from django.http import HttpResponseForbidden
 from django.urls import resolve, Resolver404
 from apps.core.services.security_service import SecurityService
 
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; fall back to a compiled regex
+    ahocorasick = None
+
+
+# Request fragments that indicate SQL injection, XSS or path traversal attempts
+SUSPICIOUS_PATTERNS = (
+    'union select', 'drop table', 'delete from', 'insert into',
+    'update set', 'exec(', 'script>', '<script', 'javascript:',
+    '../', '..\\', '/etc/passwd', '/proc/version'
+)
+
+
+def _build_suspicious_automaton(patterns):
+    """Compile the patterns into a single Aho-Corasick automaton, if available."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+
+_SUSPICIOUS_AC = _build_suspicious_automaton(SUSPICIOUS_PATTERNS)
+
+# Single-pass fallback when pyahocorasick is not installed
+_SUSPICIOUS_RE = re.compile(
+    '|'.join(re.escape(pattern) for pattern in SUSPICIOUS_PATTERNS),
+    re.IGNORECASE
+)
+
+# Longest query string stored with a suspicious-activity event
+MAX_LOGGED_QUERY_STRING = 1024
+
+# Asset paths that bypass security monitoring (after the IP-block check)
+SKIP_PATH_PREFIXES = tuple(
+    prefix for prefix in (settings.STATIC_URL, settings.MEDIA_URL, '/favicon.ico') if prefix
+)
+
+# Liveness endpoints that also bypass monitoring. Matched by URL name, not
+# by prefix: the core URLs are mounted under health/ as well as api/
+HEALTH_CHECK_URL_NAMES = frozenset({'health_check', 'health_detailed'})
+
+
+def _contains_suspicious_pattern(request_string):
+    """Check a request string for any suspicious pattern (case-insensitive) in one pass."""
+    if _SUSPICIOUS_AC is not None:
+        return next(_SUSPICIOUS_AC.iter(request_string.lower()), None) is not None
+    return _SUSPICIOUS_RE.search(request_string) is not None
+
+
+def _is_health_check(path):
+    """Check whether a path resolves to one of the liveness endpoints."""
+    if '/health/' not in path:
+        return False
+    try:
+        return resolve(path).url_name in HEALTH_CHECK_URL_NAMES
+    except Resolver404:
+        return False
+
 
 class SecurityMiddleware(MiddlewareMixin):
     """
     Security middleware that logs and monitors all requests.
     
     This middleware provides comprehensive security monitoring by:
+    - Blocking IP addresses with too many failed login attempts
     - Logging all requests and responses
     - Detecting suspicious patterns
     - Enforcing security policies
@@ -33,25 +99,55 @@ class SecurityMiddleware(MiddlewareMixin):
         # Get client information
         ip_address = SecurityService.get_client_ip(request)
         user_agent = request.META.get('HTTP_USER_AGENT', '')
+        path = request.path
+        method = request.method
+        
+        # Fail fast for blocked IPs before any other work
+        if SecurityService.is_ip_blocked(ip_address):
+            SecurityService.log_security_event_async(
+                event_type='access_denied',
+                user=None,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                request_path=path,
+                request_method=method,
+                details={'reason': 'ip_blocked'},
+                severity='high'
+            )
+            
+            # The block itself is the only event recorded for this request
+            request._security_skip = True
+            return HttpResponseForbidden(
+                "Access denied: IP address has been temporarily blocked due to suspicious activity."
+            )
+        
+        # Assets and liveness probes are not monitored
+        if path.startswith(SKIP_PATH_PREFIXES) or _is_health_check(path):
+            request._security_skip = True
+            return None
+        
+        # Collect this request's security events for a single write
+        SecurityService.start_request_buffer(request)
         
         # Check for suspicious patterns
-        if self._is_suspicious_request(request, ip_address):
-            SecurityService.log_security_event(
+        if self._is_suspicious_request(request, user_agent):
+            SecurityService.log_security_event_async(
                 event_type='suspicious_activity',
                 user=getattr(request, 'user', None),
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path,
-                request_method=request.method,
+                request_path=path,
+                request_method=method,
                 details={
                     'reason': 'suspicious_pattern_detected',
-                    'query_params': dict(request.GET),
+                    'query_string': request.META.get('QUERY_STRING', '')[:MAX_LOGGED_QUERY_STRING],
                 },
-                severity='high'
+                severity='high',
+                request=request
             )
         
         # Store request info for response processing
-        request._security_start_time = timezone.now()
+        request._security_t0 = time.perf_counter()
         request._security_ip_address = ip_address
         request._security_user_agent = user_agent
         
@@ -59,14 +155,20 @@ class SecurityMiddleware(MiddlewareMixin):
     
     def process_response(self, request, response):
         """Process outgoing responses for security monitoring."""
+        if getattr(request, '_security_skip', False):
+            return response
+        
         # Get stored request info
-        start_time = getattr(request, '_security_start_time', None)
+        start_time = getattr(request, '_security_t0', None)
         ip_address = getattr(request, '_security_ip_address', '127.0.0.1')
         user_agent = getattr(request, '_security_user_agent', '')
+        path = request.path
+        method = request.method
+        status_code = response.status_code
         
         # Calculate response time
-        if start_time:
-            response_time = (timezone.now() - start_time).total_seconds() * 1000
+        if start_time is not None:
+            response_time = (time.perf_counter() - start_time) * 1000.0
         else:
             response_time = 0
         
@@ -77,98 +179,92 @@ class SecurityMiddleware(MiddlewareMixin):
         else:
             user = None
             
-        if response.status_code == 401:
-            SecurityService.log_security_event(
+        if status_code == 401:
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path,
-                request_method=request.method,
+                request_path=path,
+                request_method=method,
                 details={
                     'reason': 'unauthorized',
-                    'response_code': response.status_code
+                    'response_code': status_code
                 },
-                severity='medium'
+                severity='medium',
+                request=request
             )
-        elif response.status_code == 403:
-            SecurityService.log_security_event(
+        elif status_code == 403:
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path,
-                request_method=request.method,
+                request_path=path,
+                request_method=method,
                 details={
                     'reason': 'forbidden',
-                    'response_code': response.status_code
+                    'response_code': status_code
                 },
-                severity='medium'
+                severity='medium',
+                request=request
             )
-        elif response.status_code >= 500:
-            SecurityService.log_security_event(
+        elif status_code >= 500:
+            SecurityService.log_security_event_async(
                 event_type='suspicious_activity',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path,
-                request_method=request.method,
+                request_path=path,
+                request_method=method,
                 details={
                     'reason': 'server_error',
-                    'response_code': response.status_code
+                    'response_code': status_code
                 },
-                severity='high'
+                severity='high',
+                request=request
             )
         
         # Log slow responses (potential DoS attempts)
         if response_time > 5000:  # 5 seconds
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='suspicious_activity',
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
-                request_path=request.path,
-                request_method=request.method,
+                request_path=path,
+                request_method=method,
                 details={
                     'reason': 'slow_response',
                     'response_time_ms': response_time
                 },
-                severity='medium'
+                severity='medium',
+                request=request
             )
         
+        # Write every event logged during the request in one batch
+        SecurityService.flush_request_buffer(request)
+        
         return response
     
-    def _is_suspicious_request(self, request, ip_address):
+    def _is_suspicious_request(self, request, user_agent):
         """
         Detect suspicious request patterns.
         
         Args:
             request: HTTP request object
-            ip_address: Client IP address
+            user_agent: User agent string of the request
             
         Returns:
             bool: True if request appears suspicious
         """
         # Check for SQL injection patterns
-        suspicious_patterns = [
-            'union select', 'drop table', 'delete from', 'insert into',
-            'update set', 'exec(', 'script>', '<script', 'javascript:',
-            '../', '..\\', '/etc/passwd', '/proc/version'
-        ]
-        
         request_string = f"{request.path} {request.META.get('QUERY_STRING', '')}"
-        request_string = request_string.lower()
-        
-        for pattern in suspicious_patterns:
-            if pattern in request_string:
-                return True
         
-        # Check for rapid requests from same IP
-        if SecurityService.is_ip_blocked(ip_address, max_attempts=10, hours=1):
+        if _contains_suspicious_pattern(request_string):
             return True
         
         # Check for unusual user agents
-        user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
         if not user_agent or len(user_agent) < 10:
             return True
         
@@ -177,41 +273,3 @@ class SecurityMiddleware(MiddlewareMixin):
             return True
         
         return False
-
-
-class IPBlockingMiddleware(MiddlewareMixin):
-    """
-    Middleware that blocks requests from suspicious IP addresses.
-    
-    This middleware provides automatic IP blocking based on
-    security event patterns and failed authentication attempts.
-    """
-    
-    def __init__(self, get_response):
-        """Initialize the IP blocking middleware."""
-        self.get_response = get_response
-        super().__init__(get_response)
-    
-    def process_request(self, request):
-        """Check if IP should be blocked."""
-        ip_address = SecurityService.get_client_ip(request)
-        
-        # Check if IP is blocked
-        if SecurityService.is_ip_blocked(ip_address):
-            # Log blocking event
-            SecurityService.log_security_event(
-                event_type='access_denied',
-                user=None,
-                ip_address=ip_address,
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                request_path=request.path,
-                request_method=request.method,
-                details={'reason': 'ip_blocked'},
-                severity='high'
-            )
-            
-            return HttpResponseForbidden(
-                "Access denied: IP address has been temporarily blocked due to suspicious activity."
-            )
-        
-        return None
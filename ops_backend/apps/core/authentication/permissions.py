@@ -11,6 +11,39 @@ from apps.core.models import User, Role, Permission
 from apps.core.services.security_service import SecurityService
 
 
+def _has_all(required, granted):
+    """Return True if every required codename is granted."""
+    return required.issubset(granted)
+
+
+def _has_any(required, granted):
+    """Return True if at least one required codename is granted."""
+    return not required.isdisjoint(granted)
+
+
+def _get_user_roles_cached(request):
+    """
+    Return the role codenames of the requesting user, cached on the request.
+
+    The user is refetched once with its primary and additional roles loaded,
+    so stacked role checks on the same request do not hit the database again.
+    """
+    role_codenames = getattr(request, '_cached_user_role_codenames', None)
+    if role_codenames is None:
+        user = (
+            User.objects
+            .select_related('role')
+            .prefetch_related('additional_roles')
+            .get(pk=request.user.pk)
+        )
+        codenames = [role.codename for role in user.additional_roles.all()]
+        if user.role:
+            codenames.append(user.role.codename)
+        role_codenames = frozenset(codenames)
+        request._cached_user_role_codenames = role_codenames
+    return role_codenames
+
+
 class IsAuthenticatedUser(IsAuthenticated):
     """
     Permission class that requires user authentication.
@@ -23,7 +56,7 @@ class IsAuthenticatedUser(IsAuthenticated):
         """Check if user is authenticated."""
         if not super().has_permission(request, view):
             # Log unauthorized access attempt
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=None,
                 ip_address=SecurityService.get_client_ip(request),
@@ -31,7 +64,8 @@ class IsAuthenticatedUser(IsAuthenticated):
                 request_path=request.path,
                 request_method=request.method,
                 details={'reason': 'not_authenticated'},
-                severity='medium'
+                severity='medium',
+                request=request
             )
             return False
         
@@ -48,6 +82,15 @@ class HasRole(BasePermission):
     
     required_roles = []
     require_all_roles = False  # If True, user must have ALL roles; if False, ANY role
+    _required_set = frozenset()
+    _check = staticmethod(_has_any)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Freeze the subclass's required roles and pick its check once at class creation."""
+        super().__init_subclass__(**kwargs)
+        cls.required_roles = tuple(cls.required_roles)
+        cls._required_set = frozenset(cls.required_roles)
+        cls._check = staticmethod(_has_all if cls.require_all_roles else _has_any)
     
     def has_permission(self, request: Request, view) -> bool:
         """Check if user has required role(s)."""
@@ -57,20 +100,14 @@ class HasRole(BasePermission):
         user = request.user
         
         # Get user's roles (primary + additional)
-        user_roles = []
-        if user.role:
-            user_roles.append(user.role.codename)
-        user_roles.extend([role.codename for role in user.additional_roles.all()])
+        user_roles = _get_user_roles_cached(request)
         
-        # Check role requirements
-        if self.require_all_roles:
-            has_permission = all(role in user_roles for role in self.required_roles)
-        else:
-            has_permission = any(role in user_roles for role in self.required_roles)
+        # Check role requirements (any/all branch chosen at class creation)
+        has_permission = self._check(self._required_set, user_roles)
         
         if not has_permission:
             # Log access denied
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=user,
                 ip_address=SecurityService.get_client_ip(request),
@@ -80,9 +117,10 @@ class HasRole(BasePermission):
                 details={
                     'reason': 'insufficient_role',
                     'required_roles': self.required_roles,
-                    'user_roles': user_roles
+                    'user_roles': sorted(user_roles)
                 },
-                severity='medium'
+                severity='medium',
+                request=request
             )
         
         return has_permission
@@ -98,6 +136,15 @@ class HasPermission(BasePermission):
     
     required_permissions = []
     require_all_permissions = False  # If True, user must have ALL permissions; if False, ANY permission
+    _required_set = frozenset()
+    _check = staticmethod(_has_any)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Freeze the subclass's required permissions and pick its check once at class creation."""
+        super().__init_subclass__(**kwargs)
+        cls.required_permissions = tuple(cls.required_permissions)
+        cls._required_set = frozenset(cls.required_permissions)
+        cls._check = staticmethod(_has_all if cls.require_all_permissions else _has_any)
     
     def has_permission(self, request: Request, view) -> bool:
         """Check if user has required permission(s)."""
@@ -107,17 +154,14 @@ class HasPermission(BasePermission):
         user = request.user
         
         # Get user's permission codenames
-        user_permission_codenames = [p.codename for p in user.get_all_permissions()]
+        user_permission_codenames = user.get_permission_codenames()
         
-        # Check permission requirements
-        if self.require_all_permissions:
-            has_permission = all(perm in user_permission_codenames for perm in self.required_permissions)
-        else:
-            has_permission = any(perm in user_permission_codenames for perm in self.required_permissions)
+        # Check permission requirements (any/all branch chosen at class creation)
+        has_permission = self._check(self._required_set, user_permission_codenames)
         
         if not has_permission:
             # Log access denied
-            SecurityService.log_security_event(
+            SecurityService.log_security_event_async(
                 event_type='access_denied',
                 user=user,
                 ip_address=SecurityService.get_client_ip(request),
@@ -127,9 +171,10 @@ class HasPermission(BasePermission):
                 details={
                     'reason': 'insufficient_permission',
                     'required_permissions': self.required_permissions,
-                    'user_permissions': user_permission_codenames
+                    'user_permissions': sorted(user_permission_codenames)
                 },
-                severity='medium'
+                severity='medium',
+                request=request
             )
         
         return has_permission
@@ -228,7 +273,7 @@ class ReadOnlyForAuthenticated(BasePermission):
             return True
         
         # Log write operation attempt
-        SecurityService.log_security_event(
+        SecurityService.log_security_event_async(
             event_type='access_denied',
             user=request.user,
             ip_address=SecurityService.get_client_ip(request),
@@ -236,7 +281,8 @@ class ReadOnlyForAuthenticated(BasePermission):
             request_path=request.path,
             request_method=request.method,
             details={'reason': 'read_only_endpoint'},
-            severity='low'
+            severity='low',
+            request=request
         )
         
         return False
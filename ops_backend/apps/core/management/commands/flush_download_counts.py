@@ -0,0 +1,16 @@
+"""
+Django management command to apply buffered attachment download counts.
+
+Run this every minute (e.g. from cron) when ATTACHMENT_DOWNLOAD_BUFFER is enabled.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.services.download_service import DownloadCounterService
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered attachment download counts to the database'
+
+    def handle(self, *args, **options):
+        updated = DownloadCounterService.flush()
+        self.stdout.write(f"Updated download counts for {updated} attachments")
@@ -2,6 +2,8 @@
 Django management command to verify the document system.
 """
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Q
 from apps.core.models import DocumentTemplate, DocumentInstance
 from apps.core.services.pdf_service import PDFGenerationService
 from django.contrib.auth import get_user_model
@@ -15,23 +17,37 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write("=== DOCUMENT SYSTEM VERIFICATION ===")
         
-        # Check template count
-        total_templates = DocumentTemplate.objects.count()
-        published_templates = DocumentTemplate.objects.filter(status='PUBLISHED').count()
+        # Check template counts (and types on Postgres) in a single query
+        aggregates = {
+            'total': Count('id'),
+            'published': Count('id', filter=Q(status='PUBLISHED')),
+        }
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.aggregates import ArrayAgg
+            aggregates['types'] = ArrayAgg('template_type', distinct=True)
+        template_stats = DocumentTemplate.objects.aggregate(**aggregates)
         
-        self.stdout.write(f"Total templates: {total_templates}")
-        self.stdout.write(f"Published templates: {published_templates}")
+        self.stdout.write(f"Total templates: {template_stats['total']}")
+        self.stdout.write(f"Published templates: {template_stats['published']}")
         
         # Check document instances
         total_documents = DocumentInstance.objects.count()
         self.stdout.write(f"Total document instances: {total_documents}")
         
         # List template types
-        template_types = DocumentTemplate.objects.values_list('template_type', flat=True).distinct()
-        self.stdout.write(f"Available template types: {list(template_types)}")
+        template_types = template_stats.get('types')
+        if template_types is None:
+            template_types = list(
+                DocumentTemplate.objects.values_list('template_type', flat=True)
+                .distinct()
+                .iterator(chunk_size=500)
+            )
+        self.stdout.write(f"Available template types: {template_types}")
         
         # Test PDF generation with a real template
-        template = DocumentTemplate.objects.filter(status='PUBLISHED', template_type='INTAKE').first()
+        template = DocumentTemplate.objects.filter(
+            status='PUBLISHED', template_type='INTAKE'
+        ).only('id', 'name', 'template_type').first()
         if template:
             self.stdout.write(f"\n=== TESTING PDF GENERATION ===")
             self.stdout.write(f"Using template: {template.name} ({template.template_type})")
@@ -2,10 +2,23 @@
 Data migration to populate sample document templates.
 """
 
+import pathlib
+
 from django.db import migrations
 from django.core.files.base import ContentFile
+from django.utils import timezone
 import os
 
+from apps.core.utils.bulk import copy_from, supports_copy
+
+# Sample template HTML lives next to this migration
+TEMPLATES_DIR = pathlib.Path(__file__).with_name('templates')
+
+
+def _read_template(filename):
+    """Read a sample template's HTML content."""
+    return (TEMPLATES_DIR / filename).read_text(encoding='utf-8')
+
 
 def populate_sample_templates(apps, schema_editor):
     """
@@ -34,7 +47,7 @@ def populate_sample_templates(apps, schema_editor):
             'name': 'Client Intake Form',
             'description': 'Standard client intake form for new projects',
             'template_type': 'INTAKE',
-            'content': _get_intake_template_content(),
+            'content': _read_template('intake.html'),
             'required_fields': ['company_name', 'contact_name', 'email', 'project_type', 'description'],
             'optional_fields': ['phone', 'address', 'budget_range', 'timeline', 'requirements'],
         },
@@ -42,7 +55,7 @@ def populate_sample_templates(apps, schema_editor):
             'name': 'Project Acceptance Document',
             'description': 'Formal project acceptance and agreement document',
             'template_type': 'ACCEPTANCE',
-            'content': _get_acceptance_template_content(),
+            'content': _read_template('acceptance.html'),
             'required_fields': ['project_name', 'client_name', 'project_manager', 'start_date', 'completion_date'],
             'optional_fields': ['service_type', 'description', 'deliverables', 'budget', 'payment_terms'],
         },
@@ -50,7 +63,7 @@ def populate_sample_templates(apps, schema_editor):
             'name': 'Change Request Form',
             'description': 'Document for tracking project change requests',
             'template_type': 'CHANGE',
-            'content': _get_change_template_content(),
+            'content': _read_template('change.html'),
             'required_fields': ['request_id', 'project_name', 'requested_by', 'request_date', 'change_type', 'description'],
             'optional_fields': ['priority', 'justification', 'business_impact', 'technical_impact', 'cost_impact'],
         },
@@ -58,7 +71,7 @@ def populate_sample_templates(apps, schema_editor):
             'name': 'Project Handover Document',
             'description': 'Document for project completion and handover',
             'template_type': 'HANDOVER',
-            'content': _get_handover_template_content(),
+            'content': _read_template('handover.html'),
             'required_fields': ['project_name', 'client_name', 'project_manager', 'start_date', 'completion_date'],
             'optional_fields': ['project_status', 'primary_deliverables', 'documentation', 'testing_results', 'support_contact'],
         },
@@ -66,213 +79,43 @@ def populate_sample_templates(apps, schema_editor):
             'name': 'Legal Agreement Template',
             'description': 'Template for legal agreements and contracts',
             'template_type': 'LEGAL',
-            'content': _get_legal_template_content(),
+            'content': _read_template('legal.html'),
             'required_fields': ['document_type', 'first_party', 'second_party', 'effective_date', 'term'],
             'optional_fields': ['scope_of_work', 'payment_terms', 'intellectual_property', 'liability', 'governing_law'],
         },
     ]
     
-    # Create templates
-    for template_data in templates_data:
-        template, created = DocumentTemplate.objects.get_or_create(
-            name=template_data['name'],
-            defaults={
-                'description': template_data['description'],
-                'template_type': template_data['template_type'],
-                'content': template_data['content'],
-                'required_fields': template_data['required_fields'],
-                'optional_fields': template_data['optional_fields'],
-                'status': 'PUBLISHED',
-                'created_by': admin_user,
-            }
+    existing = set(
+        DocumentTemplate.objects.filter(
+            name__in=[template_data['name'] for template_data in templates_data]
+        ).values_list('name', flat=True)
+    )
+    new_templates = [
+        DocumentTemplate(**template_data, status='PUBLISHED', created_by=admin_user)
+        for template_data in templates_data
+        if template_data['name'] not in existing
+    ]
+    
+    using = schema_editor.connection.alias
+    if supports_copy(using):
+        # COPY bypasses auto_now_add/auto_now, so stamp the rows here
+        now = timezone.now()
+        fields = DocumentTemplate._meta.concrete_fields
+        for template in new_templates:
+            template.created_at = template.updated_at = now
+        created = copy_from(
+            DocumentTemplate,
+            [field.name for field in fields],
+            ([getattr(template, field.attname) for field in fields] for template in new_templates),
+            using=using,
         )
-        if created:
-            print(f"Created template: {template.name}")
-
-
-def _get_intake_template_content():
-    """Get the intake template HTML content."""
-    return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Client Intake Document</title>
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; color: #333; }
-        .header { text-align: center; border-bottom: 3px solid #2c5aa0; padding-bottom: 20px; margin-bottom: 30px; }
-        .company-logo { font-size: 24px; font-weight: bold; color: #2c5aa0; margin-bottom: 10px; }
-        .document-title { font-size: 28px; font-weight: bold; color: #2c5aa0; margin-bottom: 10px; }
-        .section { margin-bottom: 25px; }
-        .section-title { font-size: 18px; font-weight: bold; color: #2c5aa0; border-bottom: 2px solid #e0e0e0; padding-bottom: 5px; margin-bottom: 15px; }
-        .field { margin-bottom: 10px; }
-        .field-label { font-weight: bold; display: inline-block; width: 150px; }
-        .field-value { display: inline-block; min-height: 20px; padding: 5px; border-bottom: 1px solid #ccc; min-width: 300px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-logo">{{ system.company }}</div>
-        <div class="document-title">Client Intake Document</div>
-        <div class="document-subtitle">Project: {{ data.project_name|default:"Not specified" }}</div>
-    </div>
-    <div class="section">
-        <div class="section-title">Client Information</div>
-        <div class="field">
-            <span class="field-label">Company Name:</span>
-            <span class="field-value">{{ data.company_name|default:"Not provided" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Contact Person:</span>
-            <span class="field-value">{{ data.contact_name|default:"Not provided" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Email:</span>
-            <span class="field-value">{{ data.email|default:"Not provided" }}</span>
-        </div>
-    </div>
-</body>
-</html>"""
-
-
-def _get_acceptance_template_content():
-    """Get the acceptance template HTML content."""
-    return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Project Acceptance Document</title>
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; color: #333; }
-        .header { text-align: center; border-bottom: 3px solid #28a745; padding-bottom: 20px; margin-bottom: 30px; }
-        .company-logo { font-size: 24px; font-weight: bold; color: #28a745; margin-bottom: 10px; }
-        .document-title { font-size: 28px; font-weight: bold; color: #28a745; margin-bottom: 10px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-logo">{{ system.company }}</div>
-        <div class="document-title">Project Acceptance Document</div>
-        <div class="document-subtitle">Project: {{ data.project_name|default:"Not specified" }}</div>
-    </div>
-    <div class="section">
-        <div class="section-title">Project Overview</div>
-        <div class="field">
-            <span class="field-label">Project Name:</span>
-            <span class="field-value">{{ data.project_name|default:"Not provided" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Client:</span>
-            <span class="field-value">{{ data.client_name|default:"Not provided" }}</span>
-        </div>
-    </div>
-</body>
-</html>"""
-
-
-def _get_change_template_content():
-    """Get the change template HTML content."""
-    return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Change Request Document</title>
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; color: #333; }
-        .header { text-align: center; border-bottom: 3px solid #ffc107; padding-bottom: 20px; margin-bottom: 30px; }
-        .company-logo { font-size: 24px; font-weight: bold; color: #ffc107; margin-bottom: 10px; }
-        .document-title { font-size: 28px; font-weight: bold; color: #ffc107; margin-bottom: 10px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-logo">{{ system.company }}</div>
-        <div class="document-title">Change Request Document</div>
-        <div class="document-subtitle">Project: {{ data.project_name|default:"Not specified" }}</div>
-    </div>
-    <div class="section">
-        <div class="section-title">Change Request Information</div>
-        <div class="field">
-            <span class="field-label">Request ID:</span>
-            <span class="field-value">{{ data.request_id|default:"Not assigned" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Project Name:</span>
-            <span class="field-value">{{ data.project_name|default:"Not provided" }}</span>
-        </div>
-    </div>
-</body>
-</html>"""
-
-
-def _get_handover_template_content():
-    """Get the handover template HTML content."""
-    return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Project Handover Document</title>
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; color: #333; }
-        .header { text-align: center; border-bottom: 3px solid #17a2b8; padding-bottom: 20px; margin-bottom: 30px; }
-        .company-logo { font-size: 24px; font-weight: bold; color: #17a2b8; margin-bottom: 10px; }
-        .document-title { font-size: 28px; font-weight: bold; color: #17a2b8; margin-bottom: 10px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-logo">{{ system.company }}</div>
-        <div class="document-title">Project Handover Document</div>
-        <div class="document-subtitle">Project: {{ data.project_name|default:"Not specified" }}</div>
-    </div>
-    <div class="section">
-        <div class="section-title">Project Information</div>
-        <div class="field">
-            <span class="field-label">Project Name:</span>
-            <span class="field-value">{{ data.project_name|default:"Not provided" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Client:</span>
-            <span class="field-value">{{ data.client_name|default:"Not provided" }}</span>
-        </div>
-    </div>
-</body>
-</html>"""
-
-
-def _get_legal_template_content():
-    """Get the legal template HTML content."""
-    return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Legal Document</title>
-    <style>
-        body { font-family: Times New Roman, serif; line-height: 1.8; margin: 20px; color: #333; }
-        .header { text-align: center; border-bottom: 3px solid #6f42c1; padding-bottom: 20px; margin-bottom: 30px; }
-        .company-logo { font-size: 24px; font-weight: bold; color: #6f42c1; margin-bottom: 10px; }
-        .document-title { font-size: 28px; font-weight: bold; color: #6f42c1; margin-bottom: 10px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-logo">{{ system.company }}</div>
-        <div class="document-title">Legal Document</div>
-        <div class="document-subtitle">{{ data.document_type|default:"Legal Agreement" }}</div>
-    </div>
-    <div class="section">
-        <div class="section-title">Parties</div>
-        <div class="field">
-            <span class="field-label">First Party:</span>
-            <span class="field-value">{{ data.first_party|default:"Sumano Tech" }}</span>
-        </div>
-        <div class="field">
-            <span class="field-label">Second Party:</span>
-            <span class="field-value">{{ data.second_party|default:"Client" }}</span>
-        </div>
-    </div>
-</body>
-</html>"""
+    else:
+        # Create missing templates with a single multi-row INSERT
+        created = len(DocumentTemplate.objects.using(using).bulk_create(
+            new_templates, ignore_conflicts=True
+        ))
+    if created:
+        print(f"Created {created} sample templates")
 
 
 def reverse_populate_templates(apps, schema_editor):
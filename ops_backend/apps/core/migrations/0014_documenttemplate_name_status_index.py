@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0013_attachment"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="documenttemplate",
+            name="core_docume_name_441f80_idx",
+        ),
+        migrations.AddIndex(
+            model_name="documenttemplate",
+            index=models.Index(
+                fields=["name", "status"], name="doctpl_name_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0014_documenttemplate_name_status_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="attachment",
+            name="core_attach_is_acti_4d918a_idx",
+        ),
+        migrations.AddIndex(
+            model_name="attachment",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["project", "-created_at"],
+                name="att_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="changerequest",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["submitted", "under_review", "impact_assessed"])
+                ),
+                fields=["-created_at"],
+                name="cr_pending_created_idx",
+            ),
+        ),
+    ]
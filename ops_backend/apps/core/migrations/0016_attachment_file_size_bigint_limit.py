@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0015_partial_active_pending_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attachment",
+            name="file_size",
+            field=models.PositiveBigIntegerField(help_text="File size in bytes"),
+        ),
+        migrations.AddConstraint(
+            model_name="attachment",
+            constraint=models.CheckConstraint(
+                check=models.Q(("file_size__lte", 10737418240)), name="att_size_limit"
+            ),
+        ),
+    ]
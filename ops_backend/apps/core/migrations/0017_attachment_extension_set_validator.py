@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:28
+
+import apps.core.models.attachment
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0016_attachment_file_size_bigint_limit"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attachment",
+            name="file",
+            field=models.FileField(
+                help_text="Uploaded file with unified storage",
+                upload_to="attachments/%Y/%m/%d/",
+                validators=[
+                    apps.core.models.attachment.ExtensionSetValidator(
+                        allowed_extensions=frozenset(
+                            [
+                                "7z",
+                                "bmp",
+                                "csv",
+                                "doc",
+                                "docx",
+                                "gif",
+                                "gz",
+                                "jpeg",
+                                "jpg",
+                                "odp",
+                                "ods",
+                                "odt",
+                                "pdf",
+                                "png",
+                                "ppt",
+                                "pptx",
+                                "rar",
+                                "rtf",
+                                "svg",
+                                "tar",
+                                "txt",
+                                "webp",
+                                "xls",
+                                "xlsx",
+                                "zip",
+                            ]
+                        )
+                    )
+                ],
+            ),
+        ),
+    ]
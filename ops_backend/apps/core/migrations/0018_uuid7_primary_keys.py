@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:39
+
+import apps.core.utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0017_attachment_extension_set_validator"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="client",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.utils.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="contact",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.utils.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documentinstance",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.utils.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documenttemplate",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.utils.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="organization",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.utils.ids.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_primary_contacts(apps, schema_editor):
+    """
+    Keep one primary contact per organization and record it on the organization.
+    
+    Where an organization has several primary contacts, the most recently
+    updated one is kept.
+    """
+    Contact = apps.get_model('core', 'Contact')
+    Organization = apps.get_model('core', 'Organization')
+    
+    seen = set()
+    demoted = []
+    primaries = Contact.objects.filter(is_primary_contact=True).order_by('organization_id', '-updated_at')
+    for contact in primaries.only('id', 'organization_id').iterator():
+        if contact.organization_id in seen:
+            demoted.append(contact.pk)
+            continue
+        seen.add(contact.organization_id)
+        Organization.objects.filter(pk=contact.organization_id).update(primary_contact=contact)
+    
+    Contact.objects.filter(pk__in=demoted).update(is_primary_contact=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0018_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organization",
+            name="primary_contact",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Primary contact for this organization",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="core.contact",
+            ),
+        ),
+        migrations.RunPython(backfill_primary_contacts, migrations.RunPython.noop),
+    ]
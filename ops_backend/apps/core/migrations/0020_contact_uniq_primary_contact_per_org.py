@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0019_organization_primary_contact"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="contact",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_primary_contact", True)),
+                fields=("organization",),
+                name="uniq_primary_contact_per_org",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_client_features(apps, schema_editor):
+    """Create a ClientFeature row for every value in the clients' list fields."""
+    Client = apps.get_model('core', 'Client')
+    ClientFeature = apps.get_model('core', 'ClientFeature')
+    
+    feature_types = ('project_type', 'project_purpose', 'pilot_scope_features')
+    features = []
+    for client in Client.objects.only('id', *feature_types).iterator():
+        for feature_type in feature_types:
+            for code in set(map(str, getattr(client, feature_type) or [])):
+                features.append(ClientFeature(client_id=client.pk, feature_type=feature_type, code=code))
+        if len(features) >= 1000:
+            ClientFeature.objects.bulk_create(features)
+            features = []
+    ClientFeature.objects.bulk_create(features)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0020_contact_uniq_primary_contact_per_org"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientFeature",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "feature_type",
+                    models.CharField(
+                        choices=[
+                            ("project_type", "Project Type"),
+                            ("project_purpose", "Project Purpose"),
+                            ("pilot_scope_features", "Pilot Scope Features"),
+                        ],
+                        help_text="Client list field this value comes from",
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "code",
+                    models.CharField(
+                        help_text="Selected value, e.g. 'website_development'",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        help_text="Client this value belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="features",
+                        to="core.client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Client Feature",
+                "verbose_name_plural": "Client Features",
+                "indexes": [
+                    models.Index(
+                        fields=["client", "feature_type"],
+                        name="core_client_client__d77a20_idx",
+                    ),
+                    models.Index(
+                        fields=["feature_type", "code"],
+                        name="core_client_feature_7af2a4_idx",
+                    ),
+                ],
+                "unique_together": {("client", "feature_type", "code")},
+            },
+        ),
+        migrations.RunPython(backfill_client_features, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:57
+
+import django.core.validators
+from django.db import migrations, models
+import re
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0021_clientfeature"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="contact",
+            name="mobile",
+            field=models.CharField(
+                blank=True,
+                help_text="Mobile phone number",
+                max_length=17,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.",
+                        regex=re.compile("^\\+?1?\\d{9,15}$"),
+                    )
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="contact",
+            name="phone",
+            field=models.CharField(
+                blank=True,
+                help_text="Primary phone number",
+                max_length=17,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.",
+                        regex=re.compile("^\\+?1?\\d{9,15}$"),
+                    )
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="organization",
+            name="phone",
+            field=models.CharField(
+                blank=True,
+                help_text="Primary contact phone number",
+                max_length=17,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.",
+                        regex=re.compile("^\\+?1?\\d{9,15}$"),
+                    )
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0022_shared_phone_validator"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="contact",
+            name="core_contac_organiz_b98e65_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="organization",
+            name="core_organi_status_65d0dc_idx",
+        ),
+        migrations.AddIndex(
+            model_name="documentinstance",
+            index=models.Index(
+                condition=models.Q(("status", "GENERATED")),
+                fields=["project", "-created_at"],
+                name="doc_generated",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="organization",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["name"],
+                name="org_active_name",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:00
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_file_metadata(apps, schema_editor):
+    """Record the size and SHA-256 digest of PDFs generated before these columns existed."""
+    DocumentInstance = apps.get_model('core', 'DocumentInstance')
+    
+    documents = DocumentInstance.objects.exclude(generated_pdf='').exclude(generated_pdf__isnull=True)
+    for document in documents.only('id', 'generated_pdf').iterator():
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with document.generated_pdf.open('rb') as pdf:
+                for chunk in pdf.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+        except (ValueError, OSError):
+            continue
+        DocumentInstance.objects.filter(pk=document.pk).update(
+            file_size=size,
+            file_sha256=digest.hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0023_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentinstance",
+            name="file_sha256",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Hex SHA-256 digest of the generated PDF",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="documentinstance",
+            name="file_size",
+            field=models.PositiveBigIntegerField(
+                default=0, help_text="Size of the generated PDF in bytes"
+            ),
+        ),
+        migrations.RunPython(backfill_file_metadata, migrations.RunPython.noop),
+    ]
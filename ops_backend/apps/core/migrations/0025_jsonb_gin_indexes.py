@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:10
+
+from django.db import migrations
+
+
+# (model, JSON column, index name) for columns filtered with @> containment
+GIN_INDEXES = [
+    ('PilotHandover', 'assigned_team_members', 'ph_team_members_gin'),
+]
+
+
+def create_gin_indexes(apps, schema_editor):
+    """
+    Create jsonb_path_ops GIN indexes on PostgreSQL.
+    
+    Other databases have no GIN indexes (and SQLite no JSON containment),
+    so nothing is created there.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for model_name, column, index_name in GIN_INDEXES:
+        model = apps.get_model('core', model_name)
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS %s ON %s USING gin (%s jsonb_path_ops)' % (
+                schema_editor.quote_name(index_name),
+                schema_editor.quote_name(model._meta.db_table),
+                schema_editor.quote_name(column),
+            )
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    """Drop the indexes created by create_gin_indexes."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for _, _, index_name in GIN_INDEXES:
+        schema_editor.execute('DROP INDEX IF EXISTS %s' % schema_editor.quote_name(index_name))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0024_documentinstance_file_size_sha256"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:30
+
+from django.db import migrations
+
+
+# (model, JSON column, SQL default) for columns whose Python default is list/dict
+JSONB_DEFAULTS = [
+    ('Client', 'project_type', "'[]'::jsonb"),
+    ('Client', 'project_purpose', "'[]'::jsonb"),
+    ('Client', 'pilot_scope_features', "'[]'::jsonb"),
+    ('Client', 'design_preferences', "'{}'::jsonb"),
+    ('Client', 'logo_colors', "'{}'::jsonb"),
+    ('Client', 'maintenance_plan', "'{}'::jsonb"),
+    ('Client', 'acknowledgment', "'{}'::jsonb"),
+    ('DocumentTemplate', 'required_fields', "'[]'::jsonb"),
+    ('DocumentTemplate', 'optional_fields', "'[]'::jsonb"),
+    ('DocumentInstance', 'filled_data', "'{}'::jsonb"),
+    ('PilotHandover', 'assigned_team_members', "'[]'::jsonb"),
+]
+
+
+def set_jsonb_defaults(apps, schema_editor):
+    """
+    Give JSON columns a server-side empty default on PostgreSQL.
+    
+    Django 4.2 never relies on these (the model's default=list/dict still
+    fills new instances), but raw SQL and COPY loads such as
+    apps.core.utils.bulk.copy_from may now omit the columns. Other
+    databases keep Django's behaviour of no column default.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for model_name, column, default in JSONB_DEFAULTS:
+        model = apps.get_model('core', model_name)
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN %s SET DEFAULT %s' % (
+                schema_editor.quote_name(model._meta.db_table),
+                schema_editor.quote_name(column),
+                default,
+            )
+        )
+
+
+def drop_jsonb_defaults(apps, schema_editor):
+    """Drop the defaults set by set_jsonb_defaults."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for model_name, column, _ in JSONB_DEFAULTS:
+        model = apps.get_model('core', model_name)
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN %s DROP DEFAULT' % (
+                schema_editor.quote_name(model._meta.db_table),
+                schema_editor.quote_name(column),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0025_jsonb_gin_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_jsonb_defaults, drop_jsonb_defaults),
+    ]
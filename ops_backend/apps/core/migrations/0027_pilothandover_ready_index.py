@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0026_jsonb_column_defaults"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pilothandover",
+            index=models.Index(
+                condition=models.Q(("status", "ready_for_review"), ("team_lead_signed", True)),
+                fields=["-created_at"],
+                name="handover_ready",
+            ),
+        ),
+    ]
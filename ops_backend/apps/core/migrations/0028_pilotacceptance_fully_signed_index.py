@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0027_pilothandover_ready_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pilotacceptance",
+            index=models.Index(
+                condition=models.Q(
+                    ("company_representative_signed", True),
+                    ("school_representative_signed", True),
+                ),
+                fields=["completion_date"],
+                name="acceptance_fully_signed",
+            ),
+        ),
+    ]
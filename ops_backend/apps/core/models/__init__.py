@@ -7,7 +7,7 @@ Models are organized by domain to maintain clear separation of concerns.
 
 # Import all models for easy access
 from .base import TimeStampedModel
-from .client import Client, Organization, Contact
+from .client import Client, ClientFeature, Organization, Contact
 from .project import Project, ProjectPhase, StatusTransition
 from .document import DocumentTemplate, DocumentInstance
 from .pilot_acceptance import PilotAcceptance
@@ -21,6 +21,7 @@ __all__ = [
     'TimeStampedModel',
     # Client domain
     'Client',
+    'ClientFeature',
     'Organization', 
     'Contact',
     # Project domain
@@ -5,15 +5,154 @@ This module provides models for file attachments and management,
 leveraging the unified storage system for secure file handling.
 """
 
+import mimetypes
 import uuid
 import os
 from django.db import models
+from django.db.models import F
+from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 from django.core.files.storage import default_storage
 from django.utils import timezone
+from django.utils.deconstruct import deconstructible
 from django.conf import settings
 
+from apps.core.utils.storage import cached_file_url
+
 from .base import TimeStampedModel
+from .system import STAFF_ROLE_CODENAMES
+
+
+# MIME types for the allowed upload extensions. These take precedence over
+# the platform mimetypes database, which varies by OS and has no type for .gz
+_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain',
+    '.rtf': 'application/rtf',
+    '.odt': 'application/vnd.oasis.opendocument.text',
+    '.xls': 'application/vnd.ms-excel',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.csv': 'text/csv',
+    '.ods': 'application/vnd.oasis.opendocument.spreadsheet',
+    '.ppt': 'application/vnd.ms-powerpoint',
+    '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    '.odp': 'application/vnd.oasis.opendocument.presentation',
+    '.zip': 'application/zip',
+    '.rar': 'application/vnd.rar',
+    '.7z': 'application/x-7z-compressed',
+    '.tar': 'application/x-tar',
+    '.gz': 'application/gzip',
+}
+
+# Units for human-readable file sizes
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Attachment file_type category by lowercase file extension
+_EXTENSION_CATEGORIES = {
+    extension: category
+    for category, extensions in (
+        ('image', ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg')),
+        ('pdf', ('.pdf',)),
+        ('document', ('.doc', '.docx', '.txt', '.rtf', '.odt')),
+        ('spreadsheet', ('.xls', '.xlsx', '.csv', '.ods')),
+        ('presentation', ('.ppt', '.pptx', '.odp')),
+        ('archive', ('.zip', '.rar', '.7z', '.tar', '.gz')),
+    )
+    for extension in extensions
+}
+
+# Extensions accepted for upload (without the leading dot)
+_ALLOWED_EXTENSIONS = frozenset(extension[1:] for extension in _EXTENSION_CATEGORIES)
+
+# Hard ceiling on file_size enforced by the database, whatever MAX_FILE_SIZE is
+_MAX_STORED_SIZE = 10 * 1024 * 1024 * 1024  # 10GB in bytes
+
+
+@deconstructible
+class ExtensionSetValidator(FileExtensionValidator):
+    """FileExtensionValidator that checks extensions against a frozenset."""
+    
+    def __init__(self, allowed_extensions=None, message=None, code=None):
+        super().__init__(allowed_extensions, message, code)
+        if self.allowed_extensions is not None:
+            self.allowed_extensions = frozenset(self.allowed_extensions)
+    
+    def __call__(self, value):
+        extension = os.path.splitext(value.name)[1][1:].lower()
+        if self.allowed_extensions is not None and extension not in self.allowed_extensions:
+            raise ValidationError(
+                self.message,
+                code=self.code,
+                params={
+                    'extension': extension,
+                    'allowed_extensions': ', '.join(sorted(self.allowed_extensions)),
+                    'value': value,
+                }
+            )
+
+
+class AttachmentQuerySet(models.QuerySet):
+    """QuerySet for attachments with helpers for list views and bulk updates."""
+    
+    def with_related(self):
+        """Join the project and uploader (with role) used by __str__, serializers and permission checks."""
+        return self.select_related('project', 'uploaded_by__role')
+    
+    def deactivate(self):
+        """Deactivate every attachment in the queryset with one UPDATE."""
+        return self.update(is_active=False, updated_at=timezone.now())
+    
+    def bump_downloads(self, downloaded_at=None):
+        """Count one download of every attachment in the queryset with one UPDATE."""
+        downloaded_at = downloaded_at or timezone.now()
+        return self.update(
+            download_count=F('download_count') + 1,
+            last_downloaded_at=downloaded_at,
+            updated_at=downloaded_at,
+        )
+    
+    def refresh_file_metadata(self, batch_size=500):
+        """
+        Recompute file_type and mime_type from the stored file names.
+        
+        Only rows whose metadata changed are written, with one bulk_update
+        per batch.
+        
+        Args:
+            batch_size (int): Rows read and written per round-trip
+            
+        Returns:
+            int: Number of attachments updated
+        """
+        now = timezone.now()
+        changed = []
+        updated = 0
+        for attachment in self.only('id', 'file', 'file_type', 'mime_type').iterator(chunk_size=batch_size):
+            file_type = attachment._categorize_file_type()
+            mime_type = attachment._get_mime_type()
+            if (file_type, mime_type) == (attachment.file_type, attachment.mime_type):
+                continue
+            
+            attachment.file_type = file_type
+            attachment.mime_type = mime_type
+            attachment.updated_at = now
+            changed.append(attachment)
+            if len(changed) >= batch_size:
+                updated += self.model.objects.bulk_update(changed, ['file_type', 'mime_type', 'updated_at'])
+                changed = []
+        
+        if changed:
+            updated += self.model.objects.bulk_update(changed, ['file_type', 'mime_type', 'updated_at'])
+        return updated
 
 
 class Attachment(TimeStampedModel):
@@ -38,29 +177,15 @@ class Attachment(TimeStampedModel):
     # Default file size limit (10MB)
     DEFAULT_SIZE_LIMIT = 10 * 1024 * 1024  # 10MB in bytes
     
+    # Extensions accepted for upload, e.g. 'pdf'
+    ALLOWED_EXTENSIONS = _ALLOWED_EXTENSIONS
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
     # File storage
     file = models.FileField(
         upload_to='attachments/%Y/%m/%d/',
-        validators=[
-            FileExtensionValidator(
-                allowed_extensions=[
-                    # Images
-                    'jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'svg',
-                    # PDFs
-                    'pdf',
-                    # Documents
-                    'doc', 'docx', 'txt', 'rtf', 'odt',
-                    # Spreadsheets
-                    'xls', 'xlsx', 'csv', 'ods',
-                    # Presentations
-                    'ppt', 'pptx', 'odp',
-                    # Archives
-                    'zip', 'rar', '7z', 'tar', 'gz',
-                ]
-            )
-        ],
+        validators=[ExtensionSetValidator(allowed_extensions=_ALLOWED_EXTENSIONS)],
         help_text="Uploaded file with unified storage"
     )
     
@@ -74,7 +199,7 @@ class Attachment(TimeStampedModel):
         choices=ALLOWED_FILE_TYPES,
         help_text="Categorized file type for filtering and validation"
     )
-    file_size = models.PositiveIntegerField(
+    file_size = models.PositiveBigIntegerField(
         help_text="File size in bytes"
     )
     mime_type = models.CharField(
@@ -120,6 +245,8 @@ class Attachment(TimeStampedModel):
         help_text="Whether this file is active and accessible"
     )
     
+    objects = AttachmentQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Attachment"
         verbose_name_plural = "Attachments"
@@ -128,7 +255,18 @@ class Attachment(TimeStampedModel):
             models.Index(fields=['project', 'created_at']),
             models.Index(fields=['uploaded_by', 'created_at']),
             models.Index(fields=['file_type', 'created_at']),
-            models.Index(fields=['is_active', 'created_at']),
+            # Most attachments are active, so index only those rows
+            models.Index(
+                fields=['project', '-created_at'],
+                name='att_active_idx',
+                condition=models.Q(is_active=True)
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(file_size__lte=_MAX_STORED_SIZE),
+                name='att_size_limit'
+            ),
         ]
     
     def __str__(self):
@@ -159,34 +297,11 @@ class Attachment(TimeStampedModel):
             return ''
         
         extension = os.path.splitext(self.file.name)[1].lower()
-        mime_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.bmp': 'image/bmp',
-            '.webp': 'image/webp',
-            '.svg': 'image/svg+xml',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.txt': 'text/plain',
-            '.rtf': 'application/rtf',
-            '.odt': 'application/vnd.oasis.opendocument.text',
-            '.xls': 'application/vnd.ms-excel',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.csv': 'text/csv',
-            '.ods': 'application/vnd.oasis.opendocument.spreadsheet',
-            '.ppt': 'application/vnd.ms-powerpoint',
-            '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            '.odp': 'application/vnd.oasis.opendocument.presentation',
-            '.zip': 'application/zip',
-            '.rar': 'application/vnd.rar',
-            '.7z': 'application/x-7z-compressed',
-            '.tar': 'application/x-tar',
-            '.gz': 'application/gzip',
-        }
-        return mime_types.get(extension, 'application/octet-stream')
+        return (
+            _MIME_TYPES.get(extension)
+            or mimetypes.guess_type(self.file.name, strict=False)[0]
+            or 'application/octet-stream'
+        )
     
     def _categorize_file_type(self):
         """Categorize file type based on extension."""
@@ -194,54 +309,30 @@ class Attachment(TimeStampedModel):
             return 'other'
         
         extension = os.path.splitext(self.file.name)[1].lower()
-        
-        # Image files
-        if extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg']:
-            return 'image'
-        
-        # PDF files
-        elif extension == '.pdf':
-            return 'pdf'
-        
-        # Document files
-        elif extension in ['.doc', '.docx', '.txt', '.rtf', '.odt']:
-            return 'document'
-        
-        # Spreadsheet files
-        elif extension in ['.xls', '.xlsx', '.csv', '.ods']:
-            return 'spreadsheet'
-        
-        # Presentation files
-        elif extension in ['.ppt', '.pptx', '.odp']:
-            return 'presentation'
-        
-        # Archive files
-        elif extension in ['.zip', '.rar', '.7z', '.tar', '.gz']:
-            return 'archive'
-        
-        else:
-            return 'other'
+        return _EXTENSION_CATEGORIES.get(extension, 'other')
     
     def get_file_size_display(self):
         """Get human-readable file size."""
-        if self.file_size == 0:
+        if not self.file_size:
             return "0 B"
         
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        size = float(self.file_size)
-        
-        while size >= 1024.0 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
-        
-        return f"{size:.1f} {size_names[i]}"
+        # Each unit is 2**10 times the previous, so the unit index is the
+        # binary magnitude divided by ten
+        i = min((self.file_size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{self.file_size / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
     
     def get_file_url(self):
-        """Get the URL for downloading the file."""
-        if self.file and hasattr(self.file, 'url'):
-            return self.file.url
-        return None
+        """
+        Get the URL for downloading the file.
+        
+        URLs are memoized per file for ATTACHMENT_URL_CACHE_SECONDS, so list
+        views do not rebuild (or, on signing backends, re-sign) the same URL
+        for every row. Keep the timeout below the storage's URL expiry.
+        """
+        if not self.file:
+            return None
+        
+        return cached_file_url(self.file, getattr(settings, 'ATTACHMENT_URL_CACHE_SECONDS', 0))
     
     def can_be_accessed_by(self, user):
         """Check if user can access this file."""
@@ -252,40 +343,53 @@ class Attachment(TimeStampedModel):
         if not self.is_active:
             return False
         
+        role_codename = getattr(user, 'role_codename', '')
+        
         # Staff and superadmin can access all files
-        if hasattr(user, 'role') and user.role.codename in ['staff', 'superadmin']:
+        if role_codename in STAFF_ROLE_CODENAMES:
             return True
         
         # Client contacts can access files from their projects
-        if hasattr(user, 'role') and user.role.codename == 'client_contact':
+        if role_codename == 'client_contact':
             # For now, client contacts can access all files
             # In a real implementation, this would check project-specific permissions
             return True
         
         # Uploader can always access their files
-        return self.uploaded_by == user
+        return self.uploaded_by_id == user.pk
     
     def can_be_deleted_by(self, user):
         """Check if user can delete this file."""
         if not user or not user.is_authenticated:
             return False
         
+        role_codename = getattr(user, 'role_codename', '')
+        
         # Staff and superadmin can delete any file
-        if hasattr(user, 'role') and user.role.codename in ['staff', 'superadmin']:
+        if role_codename in STAFF_ROLE_CODENAMES:
             return True
         
-        # Client contacts can only delete files they uploaded
-        if hasattr(user, 'role') and user.role.codename == 'client_contact':
-            return self.uploaded_by == user
-        
-        # Uploader can delete their own files
-        return self.uploaded_by == user
+        # Client contacts and other users can only delete files they uploaded
+        return self.uploaded_by_id == user.pk
     
     def record_download(self, user):
-        """Record that this file was downloaded by a user."""
+        """
+        Record that this file was downloaded by a user.
+        
+        The counter is incremented in a single atomic UPDATE, so concurrent
+        downloads cannot lose increments. When ATTACHMENT_DOWNLOAD_BUFFER is
+        enabled the increment is buffered in Redis and applied in batches by
+        the flush_download_counts command instead.
+        """
+        from apps.core.services.download_service import DownloadCounterService
+        
+        now = timezone.now()
+        if not DownloadCounterService.record(self, now):
+            Attachment.objects.filter(pk=self.pk).bump_downloads(now)
+        
         self.download_count += 1
-        self.last_downloaded_at = timezone.now()
-        self.save(update_fields=['download_count', 'last_downloaded_at', 'updated_at'])
+        self.last_downloaded_at = now
+        self.updated_at = now
     
     def get_file_extension(self):
         """Get file extension."""
@@ -6,8 +6,17 @@ all other model modules in the system.
 """
 
 import uuid
+from functools import lru_cache
+
 from django.db import models
-from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.hashable import make_hashable
+
+
+@lru_cache(maxsize=None)
+def _choices_map(field):
+    """Map a field's choice values to labels; choices are fixed per field."""
+    return dict(make_hashable(field.flatchoices))
 
 
 class TimeStampedModel(models.Model):
@@ -25,7 +34,13 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
     
-    def save(self, *args, **kwargs):
-        """Override save to ensure updated_at is always set."""
-        self.updated_at = timezone.now()
-        super().save(*args, **kwargs)
+    def _get_FIELD_display(self, field):
+        """
+        Back every get_FOO_display() with a per-field dict.
+        
+        Django rebuilds the choices dict on each call; here it is built once
+        per field, so list serializers and PDF data pay one lookup per row.
+        """
+        value = getattr(self, field.attname)
+        # force_str() resolves lazy labels in the active language on each call
+        return force_str(_choices_map(field).get(make_hashable(value), value), strings_only=True)
@@ -6,16 +6,43 @@ leveraging the unified document system for change authorization documents.
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
 from .base import TimeStampedModel
+from .system import STAFF_ROLE_CODENAMES
+from .client import Client
 from .project import Project
-from .document import DocumentInstance
+from .document import DocumentInstance, FilledDataMixin
 
 
-class ChangeRequest(TimeStampedModel):
+class ChangeRequestQuerySet(models.QuerySet):
+    """QuerySet for change requests with helpers for list views and document generation."""
+    
+    def list_light(self):
+        """
+        Join what list serializers render, without the document's filled_data.
+        
+        filled_data holds the whole change request form and is not rendered
+        in lists, so it is only loaded if something reads it. The same goes
+        for the client's intake columns; lists only show the organization.
+        """
+        return self.select_related(
+            'project__client__organization', 'document_instance', 'created_by', 'assessed_by'
+        ).defer(
+            'document_instance__filled_data',
+            *(f'project__client__{name}' for name in Client.LIST_DEFERRED_FIELDS)
+        )
+    
+    def for_pdf(self):
+        """Join everything _prepare_pdf_data and PDF generation read."""
+        return self.select_related(
+            'project__client__organization', 'document_instance', 'created_by', 'assessed_by'
+        )
+
+
+class ChangeRequest(FilledDataMixin, TimeStampedModel):
     """
     Change Request model for tracking formal change requests during pilot projects.
     
@@ -125,6 +152,8 @@ class ChangeRequest(TimeStampedModel):
         help_text="User who assessed the change request impact"
     )
     
+    objects = ChangeRequestQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Change Request"
         verbose_name_plural = "Change Requests"
@@ -134,6 +163,12 @@ class ChangeRequest(TimeStampedModel):
             models.Index(fields=['status', 'request_date']),
             models.Index(fields=['created_by', 'created_at']),
             models.Index(fields=['assessed_by', 'status']),
+            # Dashboard queues only list change requests still awaiting action
+            models.Index(
+                fields=['-created_at'],
+                name='cr_pending_created_idx',
+                condition=models.Q(status__in=['submitted', 'under_review', 'impact_assessed'])
+            ),
         ]
     
     def __str__(self):
@@ -152,19 +187,19 @@ class ChangeRequest(TimeStampedModel):
     
     def get_change_request_data(self):
         """Get change request data from document instance."""
-        return self.document_instance.filled_data.get('change_request', {})
+        return self._get_filled_data().get('change_request', {})
     
     def get_impact_assessment_data(self):
         """Get impact assessment data from document instance."""
-        return self.document_instance.filled_data.get('impact_assessment', {})
+        return self._get_filled_data().get('impact_assessment', {})
     
     def get_client_decision_data(self):
         """Get client decision data from document instance."""
-        return self.document_instance.filled_data.get('client_decision', {})
+        return self._get_filled_data().get('client_decision', {})
     
     def get_signature_data(self):
         """Get signature data from document instance."""
-        return self.document_instance.filled_data.get('signatures', {})
+        return self._get_filled_data().get('signatures', {})
     
     @classmethod
     def get_required_change_fields(cls):
@@ -189,24 +224,32 @@ class ChangeRequest(TimeStampedModel):
         if field_name not in self.get_required_change_fields():
             raise ValueError(f"Invalid change request field: {field_name}")
         
-        filled_data = self.document_instance.filled_data.copy()
-        if 'change_request' not in filled_data:
-            filled_data['change_request'] = {}
+        self._set_filled_data(['change_request', field_name], value)
+    
+    def update_impact_assessment(self, assessment_data, assessed_by=None):
+        """
+        Update impact assessment data.
+        
+        The document data and the change request status are written with one
+        UPDATE each, in a single transaction.
+        
+        Args:
+            assessment_data (dict): Impact assessment values
+            assessed_by (User, optional): Staff member recording the assessment
+        """
+        now = timezone.now()
+        updates = {'status': 'impact_assessed', 'updated_at': now}
+        if assessed_by is not None:
+            updates['assessed_by'] = assessed_by
         
-        filled_data['change_request'][field_name] = value
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
-    
-    def update_impact_assessment(self, assessment_data):
-        """Update impact assessment data."""
-        filled_data = self.document_instance.filled_data.copy()
-        filled_data['impact_assessment'] = assessment_data
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        with transaction.atomic():
+            self._set_filled_data(['impact_assessment'], assessment_data)
+            
+            # Update status to impact_assessed
+            ChangeRequest.objects.filter(pk=self.pk).update(**updates)
         
-        # Update status to impact_assessed
-        self.status = 'impact_assessed'
-        self.save(update_fields=['status'])
+        for field_name, value in updates.items():
+            setattr(self, field_name, value)
     
     def sign_change_request(self, user, signature_data):
         """
@@ -216,40 +259,32 @@ class ChangeRequest(TimeStampedModel):
             user: User signing the document
             signature_data: Dictionary containing signature information
         """
-        filled_data = self.document_instance.filled_data.copy()
-        if 'signatures' not in filled_data:
-            filled_data['signatures'] = {}
-        
         # Determine if this is client or provider representative
-        user_role = getattr(user, 'role', None)
-        is_client_rep = user_role and user_role.codename == 'client_contact'
+        is_client_rep = getattr(user, 'role_codename', '') == 'client_contact'
         
         if is_client_rep:
             self.client_rep_signed = True
             self.client_rep_signed_at = timezone.now()
-            filled_data['signatures']['client_representative'] = signature_data
+            signer_key = 'client_representative'
         else:
             self.provider_signed = True
             self.provider_signed_at = timezone.now()
-            filled_data['signatures']['provider_representative'] = signature_data
+            signer_key = 'provider_representative'
         
         # Update document instance
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        self._set_filled_data(['signatures', signer_key], signature_data)
         
         # Save change request record
         self.save()
     
     def can_be_signed_by(self, user):
         """Check if user can sign this change request."""
-        user_role = getattr(user, 'role', None)
-        if not user_role:
-            return False
+        role_codename = getattr(user, 'role_codename', '')
         
-        if user_role.codename == 'client_contact':
+        if role_codename == 'client_contact':
             # Client representative can sign if not already signed
             return not self.client_rep_signed
-        elif user_role.codename in ['staff', 'superadmin']:
+        elif role_codename in STAFF_ROLE_CODENAMES:
             # Provider representative can sign if not already signed
             return not self.provider_signed
         
@@ -257,17 +292,16 @@ class ChangeRequest(TimeStampedModel):
     
     def can_be_assessed_by(self, user):
         """Check if user can assess this change request."""
-        user_role = getattr(user, 'role', None)
-        if not user_role:
-            return False
-        
         # Only staff can assess change requests
-        return user_role.codename in ['staff', 'superadmin']
+        return getattr(user, 'role_codename', '') in STAFF_ROLE_CODENAMES
     
     def generate_change_authorization_document(self, user):
         """
         Generate change authorization PDF.
         
+        Load the change request with ``ChangeRequest.objects.for_pdf()`` so
+        the project, client and document data come from one query.
+        
         Args:
             user: User generating the document
         """
@@ -289,16 +323,16 @@ class ChangeRequest(TimeStampedModel):
     def _prepare_pdf_data(self):
         """Prepare data for PDF generation."""
         project = self.project
-        change_data = self.get_change_request_data()
-        impact_data = self.get_impact_assessment_data()
-        decision_data = self.get_client_decision_data()
-        signature_data = self.get_signature_data()
+        filled_data = self._get_filled_data()
+        change_data = filled_data.get('change_request', {})
+        impact_data = filled_data.get('impact_assessment', {})
+        signature_data = filled_data.get('signatures', {})
         
         return {
             # Project Reference
             'project_title': project.project_name,
             'client_name': project.client.organization.name,
-            'request_date': self.request_date.strftime('%Y-%m-%d'),
+            'request_date': self.request_date.isoformat(),
             'reference_agreement': self.reference_agreement,
             
             # Requested Change
@@ -4,13 +4,73 @@ Client domain models for Sumano OMS.
 This module contains models related to client management and organization structure.
 """
 
-import uuid
-from django.db import models
+import operator
+import re
+from functools import reduce
+
+from django.db import models, router, transaction
 from django.core.validators import EmailValidator, RegexValidator
 
+from apps.core.utils.ids import uuid7
+
 from .base import TimeStampedModel
 
 
+# Phone number format shared by Organization and Contact
+_PHONE_VALIDATOR = RegexValidator(
+    regex=re.compile(r'^\+?1?\d{9,15}$'),
+    message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
+)
+
+# Client fields counted by intake_completion_percentage
+_INTAKE_FIELDS = (
+    'school_name', 'address', 'contact_person', 'role_position',
+    'phone_whatsapp', 'email', 'current_website', 'number_of_students',
+    'number_of_staff', 'project_type', 'project_purpose',
+    'pilot_scope_features', 'pilot_start_date', 'pilot_end_date',
+    'timeline_preference', 'design_preferences', 'logo_colors',
+    'content_availability', 'maintenance_plan', 'token_commitment_fee',
+    'additional_notes', 'acknowledgment',
+)
+
+# Client list fields mirrored row-per-value into ClientFeature
+_FEATURE_FIELDS = ('project_type', 'project_purpose', 'pilot_scope_features')
+
+# Large Client columns that queries joining clients for their name never read
+_LIST_DEFERRED_FIELDS = (
+    'notes', 'address', 'additional_notes', 'project_type', 'project_purpose',
+    'pilot_scope_features', 'design_preferences', 'logo_colors',
+    'maintenance_plan', 'acknowledgment',
+)
+
+# Contact columns overwritten when bulk_upsert meets an existing email
+_CONTACT_UPSERT_FIELDS = (
+    'first_name', 'last_name', 'title', 'department', 'phone', 'mobile',
+    'role_type', 'status', 'updated_at',
+)
+
+# Client fields that must be filled in for is_intake_complete, most often blank first
+_REQUIRED_INTAKE_FIELDS = (
+    'school_name', 'contact_person', 'email', 'timeline_preference',
+    'project_type', 'project_purpose', 'pilot_scope_features',
+)
+
+
+def _empty_intake_field(field):
+    """Return a Q matching rows where an intake field is not filled in, or None if it always is."""
+    if isinstance(field, models.JSONField):
+        return (
+            models.Q(**{field.name: field.get_default()})
+            | models.Q(**{field.name: None})
+            | models.Q(**{f'{field.name}__isnull': True})
+        )
+    if field.null:
+        return models.Q(**{f'{field.name}__isnull': True})
+    if isinstance(field, models.BooleanField):
+        return None
+    return models.Q(**{field.name: ''})
+
+
 class Organization(TimeStampedModel):
     """
     Represents a client organization that contracts with Sumano Tech.
@@ -19,7 +79,23 @@ class Organization(TimeStampedModel):
     our services (web development, mobile apps, OMS, portals, audits).
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ORGANIZATION_TYPE_CHOICES = [
+        ('business', 'Business'),
+        ('nonprofit', 'Non-Profit Organization'),
+        ('educational', 'Educational Institution'),
+        ('government', 'Government Agency'),
+        ('healthcare', 'Healthcare Organization'),
+        ('other', 'Other'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('inactive', 'Inactive'),
+        ('prospect', 'Prospect'),
+        ('former', 'Former Client'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(
         max_length=200,
         help_text="Official organization name"
@@ -31,14 +107,7 @@ class Organization(TimeStampedModel):
     )
     organization_type = models.CharField(
         max_length=50,
-        choices=[
-            ('business', 'Business'),
-            ('nonprofit', 'Non-Profit Organization'),
-            ('educational', 'Educational Institution'),
-            ('government', 'Government Agency'),
-            ('healthcare', 'Healthcare Organization'),
-            ('other', 'Other'),
-        ],
+        choices=ORGANIZATION_TYPE_CHOICES,
         default='business',
         help_text="Type of organization"
     )
@@ -57,12 +126,8 @@ class Organization(TimeStampedModel):
     )
     
     # Contact information
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
     phone = models.CharField(
-        validators=[phone_regex],
+        validators=[_PHONE_VALIDATOR],
         max_length=17,
         blank=True,
         help_text="Primary contact phone number"
@@ -108,30 +173,74 @@ class Organization(TimeStampedModel):
     # Business status
     status = models.CharField(
         max_length=20,
-        choices=[
-            ('active', 'Active'),
-            ('inactive', 'Inactive'),
-            ('prospect', 'Prospect'),
-            ('former', 'Former Client'),
-        ],
+        choices=STATUS_CHOICES,
         default='prospect',
         help_text="Current relationship status with Sumano Tech"
     )
     
+    # Denormalized from Contact.is_primary_contact by the Contact signals
+    primary_contact = models.ForeignKey(
+        'Contact',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Primary contact for this organization"
+    )
+    
     class Meta:
         verbose_name = "Organization"
         verbose_name_plural = "Organizations"
         ordering = ['name']
         indexes = [
             models.Index(fields=['name']),
-            models.Index(fields=['status']),
             models.Index(fields=['organization_type']),
+            # Active organizations are the ones listed day to day
+            models.Index(
+                fields=['name'],
+                name='org_active_name',
+                condition=models.Q(status='active')
+            ),
         ]
 
     def __str__(self):
         return self.name
 
 
+class ContactQuerySet(models.QuerySet):
+    """QuerySet for contacts with helpers for list views."""
+    
+    def with_related(self):
+        """Join the organization used by __str__."""
+        return self.select_related('organization')
+    
+    def bulk_upsert(self, organization, rows, batch_size=500):
+        """
+        Insert or update an organization's contacts keyed by email.
+        
+        Each row is a dict of Contact field values and must include
+        ``email``. Rows whose email already exists for the organization
+        update the columns in ``_CONTACT_UPSERT_FIELDS``; the rest are
+        inserted, all in batches of ``batch_size`` rows per INSERT.
+        
+        ``save()`` and signals are bypassed, so primary contacts must still
+        be set through ``save()``; ``is_primary_contact`` is not accepted.
+        Returned objects for updated rows do not carry the existing pk.
+        """
+        contacts = []
+        for row in rows:
+            if 'is_primary_contact' in row:
+                raise ValueError("bulk_upsert cannot set is_primary_contact")
+            contacts.append(self.model(organization=organization, **row))
+        return self.bulk_create(
+            contacts,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['organization', 'email'],
+            update_fields=list(_CONTACT_UPSERT_FIELDS),
+        )
+
+
 class Contact(TimeStampedModel):
     """
     Represents individual contacts within client organizations.
@@ -140,7 +249,7 @@ class Contact(TimeStampedModel):
     at client organizations (project managers, decision makers, etc.).
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     organization = models.ForeignKey(
         Organization,
         on_delete=models.CASCADE,
@@ -172,18 +281,14 @@ class Contact(TimeStampedModel):
     email = models.EmailField(
         help_text="Primary email address"
     )
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
     phone = models.CharField(
-        validators=[phone_regex],
+        validators=[_PHONE_VALIDATOR],
         max_length=17,
         blank=True,
         help_text="Primary phone number"
     )
     mobile = models.CharField(
-        validators=[phone_regex],
+        validators=[_PHONE_VALIDATOR],
         max_length=17,
         blank=True,
         help_text="Mobile phone number"
@@ -226,18 +331,26 @@ class Contact(TimeStampedModel):
         help_text="Additional notes about this contact"
     )
 
+    objects = ContactQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Contact"
         verbose_name_plural = "Contacts"
         ordering = ['organization', 'last_name', 'first_name']
         indexes = [
-            models.Index(fields=['organization', 'is_primary_contact']),
             models.Index(fields=['email']),
             models.Index(fields=['role_type']),
         ]
         unique_together = [
             ['organization', 'email'],  # Each email should be unique per organization
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organization'],
+                condition=models.Q(is_primary_contact=True),
+                name='uniq_primary_contact_per_org'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.organization.name})"
@@ -248,6 +361,45 @@ class Contact(TimeStampedModel):
         return f"{self.first_name} {self.last_name}"
 
 
+class ClientQuerySet(models.QuerySet):
+    """QuerySet for clients with helpers for list views."""
+    
+    def with_related(self):
+        """Join the organization, its primary contact and the billing contact."""
+        return self.select_related('organization__primary_contact', 'billing_contact')
+    
+    def list_default(self):
+        """Leave out the large text and JSON columns; they load on first access if needed."""
+        return self.defer(*_LIST_DEFERRED_FIELDS)
+    
+    def with_completion(self):
+        """
+        Annotate intake completion so it is computed in the same SELECT.
+        
+        Adds ``intake_complete`` (bool) and ``intake_fields_completed`` (int),
+        which Client.is_intake_complete and intake_completion_percentage read
+        instead of inspecting every field in Python.
+        """
+        get_field = self.model._meta.get_field
+        empty = {name: _empty_intake_field(get_field(name)) for name in _INTAKE_FIELDS}
+        filled = [
+            models.Value(1) if empty[name] is None
+            else models.Case(models.When(empty[name], then=models.Value(0)), default=models.Value(1))
+            for name in _INTAKE_FIELDS
+        ]
+        return self.annotate(
+            intake_fields_completed=models.ExpressionWrapper(
+                reduce(operator.add, filled),
+                output_field=models.IntegerField()
+            ),
+            intake_complete=models.Case(
+                models.When(reduce(operator.or_, (empty[name] for name in _REQUIRED_INTAKE_FIELDS)), then=models.Value(False)),
+                default=models.Value(True),
+                output_field=models.BooleanField()
+            ),
+        )
+
+
 class Client(TimeStampedModel):
     """
     Represents a client relationship with Sumano Tech.
@@ -256,7 +408,22 @@ class Client(TimeStampedModel):
     linking organizations to our service delivery projects.
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    RELATIONSHIP_STATUS_CHOICES = [
+        ('prospect', 'Prospect'),
+        ('active', 'Active Client'),
+        ('on_hold', 'On Hold'),
+        ('former', 'Former Client'),
+    ]
+    
+    TIMELINE_CHOICES = [
+        ('asap', 'ASAP'),
+        ('1_month', 'Within 1 Month'),
+        ('3_months', 'Within 3 Months'),
+        ('6_months', 'Within 6 Months'),
+        ('flexible', 'Flexible'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     organization = models.OneToOneField(
         Organization,
         on_delete=models.CASCADE,
@@ -270,12 +437,7 @@ class Client(TimeStampedModel):
     )
     relationship_status = models.CharField(
         max_length=20,
-        choices=[
-            ('prospect', 'Prospect'),
-            ('active', 'Active Client'),
-            ('on_hold', 'On Hold'),
-            ('former', 'Former Client'),
-        ],
+        choices=RELATIONSHIP_STATUS_CHOICES,
         default='prospect',
         help_text="Current relationship status"
     )
@@ -371,6 +533,7 @@ class Client(TimeStampedModel):
     )
     
     # Project Information
+    # JSON columns also default to '[]'/'{}' server-side on PostgreSQL (migration 0026)
     project_type = models.JSONField(
         default=list,
         blank=True,
@@ -400,13 +563,7 @@ class Client(TimeStampedModel):
     )
     timeline_preference = models.CharField(
         max_length=50,
-        choices=[
-            ('asap', 'ASAP'),
-            ('1_month', 'Within 1 Month'),
-            ('3_months', 'Within 3 Months'),
-            ('6_months', 'Within 6 Months'),
-            ('flexible', 'Flexible'),
-        ],
+        choices=TIMELINE_CHOICES,
         blank=True,
         help_text="Timeline preference for project start"
     )
@@ -454,6 +611,11 @@ class Client(TimeStampedModel):
         help_text="Acknowledgment and signature data"
     )
     
+    # Columns left out by ClientQuerySet.list_default(), e.g. for project__client joins
+    LIST_DEFERRED_FIELDS = _LIST_DEFERRED_FIELDS
+    
+    objects = ClientQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Client"
         verbose_name_plural = "Clients"
@@ -462,43 +624,82 @@ class Client(TimeStampedModel):
     @property
     def is_intake_complete(self):
         """Check if intake form is complete."""
-        required_fields = [
-            'school_name', 'contact_person', 'email', 'project_type',
-            'project_purpose', 'pilot_scope_features', 'timeline_preference'
-        ]
+        if hasattr(self, 'intake_complete'):
+            return self.intake_complete
         
-        for field in required_fields:
-            value = getattr(self, field, None)
-            if not value or (isinstance(value, list) and len(value) == 0):
-                return False
-        return True
+        # Empty strings, lists, dicts and None are all falsy
+        return all(getattr(self, field, None) for field in _REQUIRED_INTAKE_FIELDS)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored list field values, so save() can tell if they changed."""
+        instance = super().from_db(db, field_names, values)
+        if all(field in field_names for field in _FEATURE_FIELDS):
+            instance._saved_features = instance._feature_values()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """
+        Save the client and mirror its list fields into ClientFeature.
+        
+        The ClientFeature rows are only touched when the list fields differ
+        from what was loaded, so ordinary intake edits cost no extra queries.
+        The client and its mirror rows are written in one transaction.
+        """
+        saved_features = frozenset() if self._state.adding else getattr(self, '_saved_features', None)
+        update_fields = kwargs.get('update_fields')
+        sync = update_fields is None or not set(_FEATURE_FIELDS).isdisjoint(update_fields)
+        features = self._feature_values() if sync else None
+        
+        using = kwargs.get('using') or router.db_for_write(Client, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            if sync and features != saved_features:
+                self._sync_features(features)
+        
+        if sync:
+            self._saved_features = features
+    
+    def _feature_values(self):
+        """Return the (feature_type, code) pairs in this client's list fields."""
+        return frozenset(
+            (feature_type, str(code))
+            for feature_type in _FEATURE_FIELDS
+            for code in (getattr(self, feature_type) or [])
+        )
+    
+    def _sync_features(self, wanted):
+        """Replace this client's ClientFeature rows with the given (feature_type, code) pairs."""
+        existing = {
+            (feature.feature_type, feature.code): feature.pk
+            for feature in ClientFeature.objects.filter(client=self).only('pk', 'feature_type', 'code')
+        }
+        
+        stale = [pk for key, pk in existing.items() if key not in wanted]
+        if stale:
+            ClientFeature.objects.filter(pk__in=stale).delete()
+        
+        ClientFeature.objects.bulk_create([
+            ClientFeature(client=self, feature_type=feature_type, code=code)
+            for feature_type, code in wanted if (feature_type, code) not in existing
+        ])
     
     @property
     def intake_completion_percentage(self):
         """Calculate intake form completion percentage."""
-        intake_fields = [
-            'school_name', 'address', 'contact_person', 'role_position',
-            'phone_whatsapp', 'email', 'current_website', 'number_of_students',
-            'number_of_staff', 'project_type', 'project_purpose',
-            'pilot_scope_features', 'pilot_start_date', 'pilot_end_date',
-            'timeline_preference', 'design_preferences', 'logo_colors',
-            'content_availability', 'maintenance_plan', 'token_commitment_fee',
-            'additional_notes', 'acknowledgment'
-        ]
-        
-        completed_fields = 0
-        total_fields = len(intake_fields)
-        
-        for field in intake_fields:
-            value = getattr(self, field, None)
-            if value is not None:
-                if isinstance(value, (list, dict)):
-                    if len(value) > 0:
+        completed_fields = getattr(self, 'intake_fields_completed', None)
+        if completed_fields is None:
+            completed_fields = 0
+            for field in _INTAKE_FIELDS:
+                value = getattr(self, field, None)
+                if value is not None:
+                    if isinstance(value, (list, dict)):
+                        if len(value) > 0:
+                            completed_fields += 1
+                    elif value != '':
                         completed_fields += 1
-                elif value != '':
-                    completed_fields += 1
         
-        return round((completed_fields / total_fields) * 100, 1)
+        return round((completed_fields / len(_INTAKE_FIELDS)) * 100, 1)
 
     def __str__(self):
         return f"{self.organization.name} (Client since {self.client_since})"
@@ -506,12 +707,52 @@ class Client(TimeStampedModel):
     @property
     def primary_contact(self):
         """Return the primary contact for this client."""
-        try:
-            return self.organization.contacts.filter(is_primary_contact=True).first()
-        except Contact.DoesNotExist:
-            return None
+        return self.organization.primary_contact
 
     @property
     def is_active(self):
         """Check if this client is currently active."""
         return self.relationship_status == 'active'
+
+
+class ClientFeature(models.Model):
+    """
+    One value of a Client intake list field, stored as a row.
+    
+    Mirrors Client.project_type, project_purpose and pilot_scope_features so
+    they can be filtered and counted with indexed SQL instead of decoding the
+    JSON of every client. Client.save() keeps these rows in sync; the JSON
+    fields remain the source of truth for the API.
+    """
+    
+    FEATURE_TYPES = [(name, name.replace('_', ' ').title()) for name in _FEATURE_FIELDS]
+    
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='features',
+        help_text="Client this value belongs to"
+    )
+    feature_type = models.CharField(
+        max_length=30,
+        choices=FEATURE_TYPES,
+        help_text="Client list field this value comes from"
+    )
+    code = models.CharField(
+        max_length=100,
+        help_text="Selected value, e.g. 'website_development'"
+    )
+    
+    class Meta:
+        verbose_name = "Client Feature"
+        verbose_name_plural = "Client Features"
+        indexes = [
+            models.Index(fields=['client', 'feature_type']),
+            models.Index(fields=['feature_type', 'code']),
+        ]
+        unique_together = [
+            ['client', 'feature_type', 'code'],
+        ]
+    
+    def __str__(self):
+        return f"{self.get_feature_type_display()}: {self.code}"
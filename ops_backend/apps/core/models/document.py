@@ -5,14 +5,19 @@ This module provides unified document template and instance models for all
 document types across the system, ensuring consistent PDF generation and storage.
 """
 
-import uuid
+import hashlib
 import json
+from django.conf import settings
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.utils import timezone
 
+from apps.core.utils.ids import uuid7
+from apps.core.utils.storage import cached_file_url
+
 from .base import TimeStampedModel
 
 
@@ -25,7 +30,7 @@ class DocumentTemplate(TimeStampedModel):
     handover, and legal documents.
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     
     # Template identification
     name = models.CharField(
@@ -104,7 +109,7 @@ class DocumentTemplate(TimeStampedModel):
         indexes = [
             models.Index(fields=['template_type', 'status']),
             models.Index(fields=['status', 'created_at']),
-            models.Index(fields=['name']),
+            models.Index(fields=['name', 'status'], name='doctpl_name_status_idx'),
         ]
         unique_together = [['name', 'version']]
     
@@ -132,9 +137,39 @@ class DocumentTemplate(TimeStampedModel):
         Returns:
             tuple: (is_valid, missing_fields)
         """
-        required_fields = self.required_fields or []
-        missing_fields = [field for field in required_fields if field not in data or not data[field]]
-        return len(missing_fields) == 0, missing_fields
+        # One dict lookup per required field; a missing key and an empty value both count as missing
+        missing_fields = [field for field in self.required_fields or () if not data.get(field)]
+        return not missing_fields, missing_fields
+
+
+class DocumentInstanceQuerySet(models.QuerySet):
+    """QuerySet for document instances with helpers for list views."""
+    
+    def with_related(self):
+        """Join the template, project and users used by __str__ and serializers."""
+        return self.select_related('template', 'project', 'created_by', 'signed_by')
+    
+    def sign(self, user):
+        """
+        Sign every signable document in the queryset with one UPDATE.
+        
+        Only generated documents with a PDF are signed, as in
+        DocumentInstance.sign().
+        
+        Args:
+            user: User signing the documents
+            
+        Returns:
+            int: Number of documents signed
+        """
+        now = timezone.now()
+        return self.filter(status='GENERATED').exclude(generated_pdf='').exclude(
+            generated_pdf__isnull=True
+        ).update(status='SIGNED', signed_by=user, signed_at=now, updated_at=now)
+    
+    def archive(self):
+        """Archive every document in the queryset with one UPDATE."""
+        return self.exclude(status='ARCHIVED').update(status='ARCHIVED', updated_at=timezone.now())
 
 
 class DocumentInstance(TimeStampedModel):
@@ -145,7 +180,7 @@ class DocumentInstance(TimeStampedModel):
     a template with actual data, including the generated PDF file.
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     
     # Document relationships
     template = models.ForeignKey(
@@ -177,6 +212,16 @@ class DocumentInstance(TimeStampedModel):
         null=True,
         help_text="Generated PDF file"
     )
+    file_size = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Size of the generated PDF in bytes"
+    )
+    file_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="Hex SHA-256 digest of the generated PDF"
+    )
     
     # Document metadata
     document_title = models.CharField(
@@ -227,6 +272,8 @@ class DocumentInstance(TimeStampedModel):
         help_text="User who generated this document"
     )
     
+    objects = DocumentInstanceQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Document Instance"
         verbose_name_plural = "Document Instances"
@@ -236,6 +283,12 @@ class DocumentInstance(TimeStampedModel):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['project', 'created_at']),
             models.Index(fields=['document_number']),
+            # Documents waiting for a signature, per project
+            models.Index(
+                fields=['project', '-created_at'],
+                name='doc_generated',
+                condition=models.Q(status='GENERATED')
+            ),
         ]
     
     def __str__(self):
@@ -263,17 +316,98 @@ class DocumentInstance(TimeStampedModel):
             self.signed_at = timezone.now()
             self.save(update_fields=['status', 'signed_by', 'signed_at', 'updated_at'])
     
+    def store_pdf(self, pdf_bytes, save=True):
+        """
+        Store the generated PDF under a content-addressed name.
+        
+        The file is named after the SHA-256 of its bytes, so identical renders
+        (e.g. a re-sent intake form) share one stored file and are uploaded
+        only once. The size and digest are recorded on the instance.
+        
+        Args:
+            pdf_bytes (bytes): PDF content
+            save (bool): Whether to save the instance afterwards
+        """
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        name = f"documents/{digest[:2]}/{digest}.pdf"
+        storage = self.generated_pdf.storage
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(pdf_bytes))
+        
+        self.generated_pdf = name
+        self.file_size = len(pdf_bytes)
+        self.file_sha256 = digest
+        if save:
+            self.save()
+    
     def get_file_size(self):
-        """Get the size of the generated PDF file."""
-        if self.generated_pdf:
-            try:
-                return self.generated_pdf.size
-            except (ValueError, OSError):
-                return 0
-        return 0
+        """Get the size of the generated PDF file, as recorded when it was stored."""
+        return self.file_size
     
     def get_file_url(self):
-        """Get the URL for downloading the PDF file."""
+        """
+        Get the URL for downloading the PDF file.
+        
+        URLs are memoized per file for DOCUMENT_URL_CACHE_SECONDS, as for
+        attachments.
+        """
         if self.generated_pdf:
-            return self.generated_pdf.url
-        return None
\ No newline at end of file
+            return cached_file_url(
+                self.generated_pdf, getattr(settings, 'DOCUMENT_URL_CACHE_SECONDS', 0)
+            )
+        return None
+
+class FilledDataMixin:
+    """
+    Read and patch the filled_data of a model's ``document_instance``.
+    
+    Shared by the workflow models (change requests, pilot acceptances and
+    handovers) that keep their form data in DocumentInstance.filled_data.
+    """
+    
+    def _get_filled_data(self):
+        """Get the document instance's filled_data, or {} if it is empty."""
+        return self.document_instance.filled_data or {}
+    
+    def _set_filled_data(self, path, value, merge=False):
+        """
+        Set one key of the document's filled_data in a single UPDATE.
+        
+        The key is patched in the database, so the document instance does not
+        have to be loaded and its JSON is not copied and rewritten. A loaded
+        document instance is updated in memory to match, unless its
+        filled_data was deferred. With ``merge=True`` the keys of the dict
+        ``value`` are set inside the object at ``path`` and its other keys kept.
+        
+        Args:
+            path (list): Keys leading to the value, e.g. ['signatures', 'client_representative']
+            value: JSON-serializable value to store
+            merge (bool): Merge the dict ``value`` into the object at ``path``
+        """
+        from apps.core.utils.expressions import JSONMerge, JSONSet
+        
+        now = timezone.now()
+        expression = JSONMerge if merge else JSONSet
+        DocumentInstance.objects.filter(pk=self.document_instance_id).update(
+            filled_data=expression('filled_data', path, value),
+            updated_at=now,
+        )
+        
+        # A deferred filled_data is simply read back, already patched, on access
+        if (
+            self._meta.get_field('document_instance').is_cached(self)
+            and 'filled_data' not in self.document_instance.get_deferred_fields()
+        ):
+            document_instance = self.document_instance
+            filled_data = document_instance.filled_data or {}
+            node = filled_data
+            for key in path[:-1]:
+                if not isinstance(node.get(key), dict):
+                    node[key] = {}
+                node = node[key]
+            if merge and isinstance(node.get(path[-1]), dict):
+                node[path[-1]].update(value)
+            else:
+                node[path[-1]] = dict(value) if merge else value
+            document_instance.filled_data = filled_data
+            document_instance.updated_at = now
@@ -6,16 +6,53 @@ leveraging the unified document system for acceptance certificates.
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
 from .base import TimeStampedModel
+from .system import STAFF_ROLE_CODENAMES
 from .project import Project
-from .document import DocumentInstance
+from .document import DocumentInstance, FilledDataMixin
 
 
-class PilotAcceptance(TimeStampedModel):
+# Acceptance checklist items, in certificate order
+_CHECKLIST_ORDER = (
+    'digital_gateway_live',
+    'mobile_friendly',
+    'pages_present',
+    'portals_linked',
+    'social_media_embedded',
+    'logo_colors_correct',
+    'photos_content_displayed',
+    'layout_design_ok',
+    'staff_training_completed',
+    'training_materials_provided',
+    'no_critical_errors',
+    'minor_issues_resolved',
+)
+_CHECKLIST_FIELDS = frozenset(_CHECKLIST_ORDER)
+
+# Certificate text for an unchecked/checked item, indexed by bool
+_YES_NO = ('No', 'Yes')
+
+# SQL form of PilotAcceptance.is_fully_signed
+_FULLY_SIGNED = models.Q(school_representative_signed=True, company_representative_signed=True)
+
+
+class PilotAcceptanceQuerySet(models.QuerySet):
+    """QuerySet for pilot acceptances with helpers for document generation."""
+    
+    def for_pdf(self):
+        """Join everything _prepare_pdf_data and PDF generation read."""
+        return self.select_related('project__client__organization', 'document_instance', 'created_by')
+    
+    def fully_signed(self):
+        """Acceptances whose is_fully_signed is True; served by the acceptance_fully_signed index."""
+        return self.filter(_FULLY_SIGNED)
+
+
+class PilotAcceptance(FilledDataMixin, TimeStampedModel):
     """
     Pilot Acceptance model for tracking pilot project acceptance workflows.
     
@@ -104,6 +141,8 @@ class PilotAcceptance(TimeStampedModel):
         help_text="User who created this acceptance record"
     )
     
+    objects = PilotAcceptanceQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Pilot Acceptance"
         verbose_name_plural = "Pilot Acceptances"
@@ -112,6 +151,11 @@ class PilotAcceptance(TimeStampedModel):
             models.Index(fields=['project', 'acceptance_status']),
             models.Index(fields=['acceptance_status', 'completion_date']),
             models.Index(fields=['created_by', 'created_at']),
+            models.Index(
+                fields=['completion_date'],
+                name='acceptance_fully_signed',
+                condition=_FULLY_SIGNED
+            ),
         ]
     
     def __str__(self):
@@ -125,100 +169,97 @@ class PilotAcceptance(TimeStampedModel):
     @property
     def completion_percentage(self):
         """Calculate completion percentage based on checklist items."""
-        checklist_data = self.get_checklist_data()
+        return self._completion_percentage(self.get_checklist_data())
+    
+    @staticmethod
+    def _completion_percentage(checklist_data):
+        """Calculate completion percentage from already loaded checklist data."""
         if not checklist_data:
             return 0
         
-        total_items = len(self.get_checklist_fields())
+        total_items = len(_CHECKLIST_FIELDS)
         completed_items = sum(1 for value in checklist_data.values() if value is True)
         
         return round((completed_items / total_items) * 100, 1) if total_items > 0 else 0
     
     def get_checklist_data(self):
         """Get checklist data from document instance."""
-        return self.document_instance.filled_data.get('checklist', {})
+        return self._get_filled_data().get('checklist', {})
     
     def get_signature_data(self):
         """Get signature data from document instance."""
-        return self.document_instance.filled_data.get('signatures', {})
+        return self._get_filled_data().get('signatures', {})
     
     def get_project_reference_data(self):
         """Get project reference data from document instance."""
-        return self.document_instance.filled_data.get('project_reference', {})
+        return self._get_filled_data().get('project_reference', {})
     
     @classmethod
     def get_checklist_fields(cls):
-        """Get list of all checklist field names."""
-        return [
-            'digital_gateway_live',
-            'mobile_friendly',
-            'pages_present',
-            'portals_linked',
-            'social_media_embedded',
-            'logo_colors_correct',
-            'photos_content_displayed',
-            'layout_design_ok',
-            'staff_training_completed',
-            'training_materials_provided',
-            'no_critical_errors',
-            'minor_issues_resolved',
-        ]
+        """Get the set of all checklist field names."""
+        return _CHECKLIST_FIELDS
     
     def update_checklist_item(self, field_name, value):
         """Update a specific checklist item."""
-        if field_name not in self.get_checklist_fields():
+        if field_name not in _CHECKLIST_FIELDS:
             raise ValueError(f"Invalid checklist field: {field_name}")
         
-        filled_data = self.document_instance.filled_data.copy()
-        if 'checklist' not in filled_data:
-            filled_data['checklist'] = {}
+        self._set_filled_data(['checklist', field_name], value)
+    
+    def update_checklist_items(self, items):
+        """
+        Update several checklist items with a single UPDATE.
         
-        filled_data['checklist'][field_name] = value
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        Args:
+            items (dict): Checklist field names mapped to their new values
+        """
+        invalid_fields = sorted(items.keys() - _CHECKLIST_FIELDS)
+        if invalid_fields:
+            raise ValueError(f"Invalid checklist fields: {invalid_fields}")
+        
+        self._set_filled_data(['checklist'], items, merge=True)
     
     def sign_acceptance(self, user, signature_data):
         """
         Sign the acceptance document.
         
+        The signature and the signed flags are written with one UPDATE each,
+        in a single transaction.
+        
         Args:
             user: User signing the document
             signature_data: Dictionary containing signature information
         """
-        filled_data = self.document_instance.filled_data.copy()
-        if 'signatures' not in filled_data:
-            filled_data['signatures'] = {}
+        now = timezone.now()
         
         # Determine if this is school or company representative
-        user_role = getattr(user, 'role', None)
-        is_school_rep = user_role and user_role.codename == 'client_contact'
+        is_school_rep = getattr(user, 'role_codename', '') == 'client_contact'
         
         if is_school_rep:
-            self.school_representative_signed = True
-            self.school_representative_signed_at = timezone.now()
-            filled_data['signatures']['school_representative'] = signature_data
+            signer_key = 'school_representative'
         else:
-            self.company_representative_signed = True
-            self.company_representative_signed_at = timezone.now()
-            filled_data['signatures']['company_representative'] = signature_data
+            signer_key = 'company_representative'
+        updates = {
+            f'{signer_key}_signed': True,
+            f'{signer_key}_signed_at': now,
+            'updated_at': now,
+        }
         
-        # Update document instance
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        with transaction.atomic():
+            self._set_filled_data(['signatures', signer_key], signature_data)
+            PilotAcceptance.objects.filter(pk=self.pk).update(**updates)
         
-        # Save acceptance record
-        self.save()
+        for field_name, value in updates.items():
+            setattr(self, field_name, value)
     
     def can_be_signed_by(self, user):
         """Check if user can sign this acceptance."""
-        user_role = getattr(user, 'role', None)
-        if not user_role:
-            return False
+        role_codename = getattr(user, 'role_codename', '')
         
-        if user_role.codename == 'client_contact':
+        if role_codename == 'client_contact':
             # School representative can sign if not already signed
             return not self.school_representative_signed
-        elif user_role.codename in ['staff', 'superadmin']:
+        elif role_codename in STAFF_ROLE_CODENAMES:
             # Company representative can sign if not already signed
             return not self.company_representative_signed
         
@@ -228,6 +269,9 @@ class PilotAcceptance(TimeStampedModel):
         """
         Generate acceptance certificate PDF.
         
+        Load the acceptance with ``PilotAcceptance.objects.for_pdf()`` so
+        the project, client and document data come from one query.
+        
         Args:
             user: User generating the certificate
         """
@@ -249,14 +293,15 @@ class PilotAcceptance(TimeStampedModel):
     def _prepare_pdf_data(self):
         """Prepare data for PDF generation."""
         project = self.project
-        checklist_data = self.get_checklist_data()
-        signature_data = self.get_signature_data()
+        filled_data = self._get_filled_data()
+        checklist_data = filled_data.get('checklist', {})
+        signature_data = filled_data.get('signatures', {})
         
         return {
             # Project Reference
             'school_name': project.client.organization.name,
-            'pilot_start_date': project.start_date.strftime('%Y-%m-%d') if project.start_date else '',
-            'completion_date': self.completion_date.strftime('%Y-%m-%d'),
+            'pilot_start_date': project.start_date.isoformat() if project.start_date else '',
+            'completion_date': self.completion_date.isoformat(),
             'token_payment': str(self.token_payment) if self.token_payment else '0',
             
             # Acceptance Status
@@ -264,18 +309,7 @@ class PilotAcceptance(TimeStampedModel):
             'issues_to_resolve': self.issues_to_resolve,
             
             # Checklist Items
-            'digital_gateway_live': 'Yes' if checklist_data.get('digital_gateway_live') else 'No',
-            'mobile_friendly': 'Yes' if checklist_data.get('mobile_friendly') else 'No',
-            'pages_present': 'Yes' if checklist_data.get('pages_present') else 'No',
-            'portals_linked': 'Yes' if checklist_data.get('portals_linked') else 'No',
-            'social_media_embedded': 'Yes' if checklist_data.get('social_media_embedded') else 'No',
-            'logo_colors_correct': 'Yes' if checklist_data.get('logo_colors_correct') else 'No',
-            'photos_content_displayed': 'Yes' if checklist_data.get('photos_content_displayed') else 'No',
-            'layout_design_ok': 'Yes' if checklist_data.get('layout_design_ok') else 'No',
-            'staff_training_completed': 'Yes' if checklist_data.get('staff_training_completed') else 'No',
-            'training_materials_provided': 'Yes' if checklist_data.get('training_materials_provided') else 'No',
-            'no_critical_errors': 'Yes' if checklist_data.get('no_critical_errors') else 'No',
-            'minor_issues_resolved': 'Yes' if checklist_data.get('minor_issues_resolved') else 'No',
+            **{field: _YES_NO[bool(checklist_data.get(field))] for field in _CHECKLIST_ORDER},
             
             # Signatures
             'school_representative_name': signature_data.get('school_representative', {}).get('name', ''),
@@ -288,5 +322,5 @@ class PilotAcceptance(TimeStampedModel):
             
             # System Information
             'generation_date': timezone.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'completion_percentage': f"{self.completion_percentage}%",
+            'completion_percentage': f"{self._completion_percentage(checklist_data)}%",
         }
@@ -5,17 +5,64 @@ This module provides models for internal handover workflows for completed pilot
 leveraging the unified document system for internal handover documentation.
 """
 
+import datetime
 import uuid
-from django.db import models
+from types import MappingProxyType
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
 from .base import TimeStampedModel
+from .system import STAFF_ROLE_CODENAMES
 from .project import Project
-from .document import DocumentInstance
+from .document import DocumentInstance, FilledDataMixin
+
+
+# Signature values serialized to ISO strings (datetime is a date subclass)
+_DATE_TYPES = (datetime.datetime, datetime.date)
+
+# Handover checklist sections and their items, in document order
+_CHECKLIST_SECTIONS = MappingProxyType({
+    'technical_setup': (
+        'domain_configured', 'ssl_active', 'site_load_ok',
+        'responsive_design', 'no_broken_links'
+    ),
+    'core_pages': (
+        'home_completed', 'about_news_added', 'contact_correct',
+        'portal_links_ok', 'social_media_tested'
+    ),
+    'content_accuracy': (
+        'logo_correct', 'photos_optimized', 'text_proofread',
+        'info_matches_official'
+    ),
+    'security_compliance': (
+        'admin_created', 'restricted_access', 'privacy_statement_included'
+    ),
+    'training_handover_prep': (
+        'training_scheduled', 'training_materials_ready',
+        'howto_instructions', 'support_contact_added'
+    ),
+    'final_test_run': (
+        'browsers_tested', 'forms_tested', 'backup_taken',
+        'screenshots_captured'
+    ),
+})
+
+
+class PilotHandoverQuerySet(models.QuerySet):
+    """QuerySet for pilot handovers with helpers for document generation."""
+    
+    def for_pdf(self):
+        """Join everything _prepare_pdf_data and PDF generation read."""
+        return self.select_related('project__client__organization', 'document_instance', 'created_by')
+    
+    def ready_for_handover(self):
+        """Handovers whose is_ready_for_handover is True; served by the handover_ready index."""
+        return self.filter(status='ready_for_review', team_lead_signed=True)
 
 
-class PilotHandover(TimeStampedModel):
+class PilotHandover(FilledDataMixin, TimeStampedModel):
     """
     Pilot Handover model for tracking internal handover processes for completed pilot projects.
     
@@ -60,6 +107,9 @@ class PilotHandover(TimeStampedModel):
         help_text="Expected delivery date for the handover"
     )
     
+    # Usernames (not user ids), matched with __contains=[username] by
+    # my_handovers. Kept as JSON rather than an ArrayField so SQLite still
+    # works; PostgreSQL has a GIN index on it (migration 0025)
     assigned_team_members = models.JSONField(
         default=list,
         help_text="List of team members assigned to this handover"
@@ -110,6 +160,8 @@ class PilotHandover(TimeStampedModel):
         help_text="User who reviewed this handover"
     )
     
+    objects = PilotHandoverQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Pilot Handover"
         verbose_name_plural = "Pilot Handovers"
@@ -119,6 +171,11 @@ class PilotHandover(TimeStampedModel):
             models.Index(fields=['status', 'expected_delivery_date']),
             models.Index(fields=['created_by', 'created_at']),
             models.Index(fields=['reviewed_by', 'status']),
+            models.Index(
+                fields=['-created_at'],
+                name='handover_ready',
+                condition=models.Q(status='ready_for_review', team_lead_signed=True)
+            ),
         ]
     
     def __str__(self):
@@ -132,145 +189,118 @@ class PilotHandover(TimeStampedModel):
     @property
     def completion_percentage(self):
         """Calculate completion percentage based on checklist items."""
-        checklist_data = self.get_checklist_data()
+        return self._completion_percentage(self.get_checklist_data())
+    
+    @staticmethod
+    def _completion_percentage(checklist_data):
+        """Calculate completion percentage from already loaded checklist data."""
         if not checklist_data:
             return 0
         
-        total_items = 0
-        completed_items = 0
-        
-        for section, items in checklist_data.items():
-            if isinstance(items, dict):
-                for item, value in items.items():
-                    total_items += 1
-                    if value:
-                        completed_items += 1
-        
-        return int((completed_items / total_items * 100)) if total_items > 0 else 0
+        # Flatten the sections' item values once, then count the truthy ones
+        values = [
+            value
+            for items in checklist_data.values() if isinstance(items, dict)
+            for value in items.values()
+        ]
+        if not values:
+            return 0
+        return int(sum(map(bool, values)) / len(values) * 100)
     
     def get_project_reference_data(self):
         """Get project reference data from document instance."""
-        return self.document_instance.filled_data.get('project_reference', {})
+        return self._get_filled_data().get('project_reference', {})
     
     def get_checklist_data(self):
         """Get checklist data from document instance."""
-        return self.document_instance.filled_data.get('checklist', {})
+        return self._get_filled_data().get('checklist', {})
     
     def get_handover_approval_data(self):
         """Get handover approval data from document instance."""
-        return self.document_instance.filled_data.get('handover_approval', {})
+        return self._get_filled_data().get('handover_approval', {})
     
     def get_signature_data(self):
         """Get signature data from document instance."""
-        return self.document_instance.filled_data.get('signatures', {})
+        return self._get_filled_data().get('signatures', {})
     
     @classmethod
     def get_checklist_sections(cls):
-        """Get list of checklist sections and their items."""
-        return {
-            'technical_setup': [
-                'domain_configured', 'ssl_active', 'site_load_ok', 
-                'responsive_design', 'no_broken_links'
-            ],
-            'core_pages': [
-                'home_completed', 'about_news_added', 'contact_correct',
-                'portal_links_ok', 'social_media_tested'
-            ],
-            'content_accuracy': [
-                'logo_correct', 'photos_optimized', 'text_proofread',
-                'info_matches_official'
-            ],
-            'security_compliance': [
-                'admin_created', 'restricted_access', 'privacy_statement_included'
-            ],
-            'training_handover_prep': [
-                'training_scheduled', 'training_materials_ready',
-                'howto_instructions', 'support_contact_added'
-            ],
-            'final_test_run': [
-                'browsers_tested', 'forms_tested', 'backup_taken',
-                'screenshots_captured'
-            ]
-        }
+        """Get a read-only mapping of checklist sections to their items."""
+        return _CHECKLIST_SECTIONS
     
     def update_checklist_section(self, section_name, section_data):
         """Update a specific checklist section."""
-        if section_name not in self.get_checklist_sections():
+        if section_name not in _CHECKLIST_SECTIONS:
             raise ValueError(f"Invalid checklist section: {section_name}")
         
-        filled_data = self.document_instance.filled_data.copy()
-        if 'checklist' not in filled_data:
-            filled_data['checklist'] = {}
+        self._set_filled_data(['checklist', section_name], section_data)
+    
+    def update_checklist_sections(self, sections):
+        """
+        Replace several checklist sections with a single UPDATE.
         
-        filled_data['checklist'][section_name] = section_data
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        Args:
+            sections (dict): Section names mapped to their new item data
+        """
+        invalid_sections = sorted(sections.keys() - _CHECKLIST_SECTIONS.keys())
+        if invalid_sections:
+            raise ValueError(f"Invalid checklist sections: {invalid_sections}")
+        
+        self._set_filled_data(['checklist'], sections, merge=True)
     
     def update_project_reference(self, reference_data):
         """Update project reference data."""
-        filled_data = self.document_instance.filled_data.copy()
-        filled_data['project_reference'] = reference_data
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        self._set_filled_data(['project_reference'], reference_data)
     
     def sign_handover(self, user, signature_data):
         """
         Sign the handover document.
         
+        The signature and the signed flag are written with one UPDATE each,
+        in a single transaction.
+        
         Args:
             user: User signing the document
             signature_data: Dictionary containing signature information
         """
-        filled_data = self.document_instance.filled_data.copy()
-        if 'signatures' not in filled_data:
-            filled_data['signatures'] = {}
-        
         # Only team leads can sign handovers
-        user_role = getattr(user, 'role', None)
-        if not user_role or user_role.codename not in ['staff', 'superadmin']:
+        if getattr(user, 'role_codename', '') not in STAFF_ROLE_CODENAMES:
             raise ValueError("Only staff members can sign handover documents.")
         
-        self.team_lead_signed = True
-        self.team_lead_signed_at = timezone.now()
-        # Convert datetime objects to ISO strings for JSON serialization
-        serialized_signature_data = {}
-        for key, value in signature_data.items():
-            if hasattr(value, 'isoformat'):  # datetime object
-                serialized_signature_data[key] = value.isoformat()
-            else:
-                serialized_signature_data[key] = value
+        now = timezone.now()
+        updates = {'team_lead_signed': True, 'team_lead_signed_at': now, 'updated_at': now}
         
-        filled_data['signatures']['team_lead'] = serialized_signature_data
+        # Convert datetime objects to ISO strings for JSON serialization
+        serialized_signature_data = {
+            key: value.isoformat() if isinstance(value, _DATE_TYPES) else value
+            for key, value in signature_data.items()
+        }
         
-        # Update document instance
-        self.document_instance.filled_data = filled_data
-        self.document_instance.save(update_fields=['filled_data', 'updated_at'])
+        with transaction.atomic():
+            self._set_filled_data(['signatures', 'team_lead'], serialized_signature_data)
+            PilotHandover.objects.filter(pk=self.pk).update(**updates)
         
-        # Save handover record
-        self.save()
+        for field_name, value in updates.items():
+            setattr(self, field_name, value)
     
     def can_be_signed_by(self, user):
         """Check if user can sign this handover document."""
-        user_role = getattr(user, 'role', None)
-        if not user_role:
-            return False
-        
         # Only staff can sign handovers, and only if not already signed
-        return user_role.codename in ['staff', 'superadmin'] and not self.team_lead_signed
+        role_codename = getattr(user, 'role_codename', '')
+        return role_codename in STAFF_ROLE_CODENAMES and not self.team_lead_signed
     
     def can_be_reviewed_by(self, user):
         """Check if user can review this handover."""
-        user_role = getattr(user, 'role', None)
-        if not user_role:
-            return False
-        
         # Only staff can review handovers
-        return user_role.codename in ['staff', 'superadmin']
+        return getattr(user, 'role_codename', '') in STAFF_ROLE_CODENAMES
     
     def generate_handover_document(self, user):
         """
         Generate internal handover PDF.
         
+        Load the handover with ``PilotHandover.objects.for_pdf()`` so the
+        project, client and document data come from one query.
+        
         Args:
             user: User generating the document
         """
@@ -292,16 +322,15 @@ class PilotHandover(TimeStampedModel):
     def _prepare_pdf_data(self):
         """Prepare data for PDF generation."""
         project = self.project
-        project_ref = self.get_project_reference_data()
-        checklist_data = self.get_checklist_data()
-        approval_data = self.get_handover_approval_data()
-        signature_data = self.get_signature_data()
+        filled_data = self._get_filled_data()
+        checklist_data = filled_data.get('checklist', {})
+        signature_data = filled_data.get('signatures', {})
         
         return {
             # Project Reference
             'client_school_name': project.client.organization.name,
-            'pilot_start_date': project.start_date.strftime('%Y-%m-%d') if project.start_date else 'N/A',
-            'expected_delivery_date': self.expected_delivery_date.strftime('%Y-%m-%d'),
+            'pilot_start_date': project.start_date.isoformat() if project.start_date else 'N/A',
+            'expected_delivery_date': self.expected_delivery_date.isoformat(),
             'assigned_team_members': ', '.join(self.assigned_team_members),
             
             # Checklist sections
@@ -320,6 +349,6 @@ class PilotHandover(TimeStampedModel):
             # System Information
             'generation_date': timezone.now().strftime('%Y-%m-%d %H:%M:%S'),
             'status': self.get_status_display(),
-            'completion_percentage': f"{self.completion_percentage}%",
+            'completion_percentage': f"{self._completion_percentage(checklist_data)}%",
             'handover_id': str(self.id),
         }
@@ -6,12 +6,22 @@ for the internal system access control.
 """
 
 import uuid
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Case, F, Value, When
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import EmailValidator, RegexValidator
 
 from .base import TimeStampedModel
 
+# Failed logins allowed before an account is locked, and for how long
+MAX_FAILED_LOGIN_ATTEMPTS = 5
+ACCOUNT_LOCKOUT_MINUTES = 30
+
+# Role codenames that act for the company (sign, assess and review documents)
+STAFF_ROLE_CODENAMES = frozenset({'staff', 'superadmin'})
+
 
 class Permission(TimeStampedModel):
     """
@@ -336,6 +346,13 @@ class User(AbstractUser):
         """Return the user's full name."""
         return f"{self.first_name} {self.last_name}"
 
+    @property
+    def role_codename(self):
+        """Codename of the primary role, or '' without a query when no role is set."""
+        if self.role_id is None:
+            return ''
+        return self.role.codename
+
     def get_all_roles(self):
         """Get all roles assigned to this user."""
         roles = []
@@ -351,11 +368,28 @@ class User(AbstractUser):
             permissions.update(role.get_all_permissions())
         return permissions
 
+    def get_permission_codenames(self):
+        """
+        Get the codenames of all permissions for this user.
+        
+        The result is memoized on the instance so repeated permission checks
+        in one request share the role/permission queries.
+        """
+        codenames = getattr(self, '_cached_perm_codenames', None)
+        if codenames is None:
+            codenames = frozenset(p.codename for p in self.get_all_permissions())
+            self._cached_perm_codenames = codenames
+        return codenames
+
+    def clear_permission_cache(self):
+        """Drop the memoized permission codenames."""
+        self.__dict__.pop('_cached_perm_codenames', None)
+
     def has_permission(self, permission_codename):
         """Check if this user has a specific permission."""
         if self.is_superuser:
             return True
-        return permission_codename in [p.codename for p in self.get_all_permissions()]
+        return permission_codename in self.get_permission_codenames()
 
     def is_account_locked(self):
         """Check if the user's account is currently locked."""
@@ -364,7 +398,7 @@ class User(AbstractUser):
         from django.utils import timezone
         return timezone.now() < self.account_locked_until
 
-    def lock_account(self, duration_minutes=30):
+    def lock_account(self, duration_minutes=ACCOUNT_LOCKOUT_MINUTES):
         """Lock the user's account for a specified duration."""
         from django.utils import timezone
         from datetime import timedelta
@@ -378,18 +412,40 @@ class User(AbstractUser):
         self.save(update_fields=['account_locked_until', 'failed_login_attempts'])
     
     def reset_failed_login_attempts(self):
-        """Reset failed login attempts counter."""
+        """
+        Reset failed login attempts counter.
+        
+        The stored counter decides whether to write: failures are counted
+        in the database, so the in-memory value may be stale.
+        """
+        User.objects.filter(pk=self.pk, failed_login_attempts__gt=0).update(failed_login_attempts=0)
         self.failed_login_attempts = 0
-        self.save(update_fields=['failed_login_attempts'])
     
     def increment_failed_login_attempts(self):
-        """Increment failed login attempts counter."""
-        self.failed_login_attempts += 1
-        self.save(update_fields=['failed_login_attempts'])
+        """
+        Increment failed login attempts counter.
         
-        # Lock account after 5 failed attempts
-        if self.failed_login_attempts >= 5:
-            self.lock_account()
+        The counter and the lockout are updated in one atomic UPDATE, so
+        concurrent failures cannot lose increments or skip the lock.
+        """
+        from django.utils import timezone
+        locked_until = timezone.now() + timedelta(minutes=ACCOUNT_LOCKOUT_MINUTES)
+        
+        # Lock account after MAX_FAILED_LOGIN_ATTEMPTS failed attempts
+        User.objects.filter(pk=self.pk).update(
+            failed_login_attempts=F('failed_login_attempts') + 1,
+            account_locked_until=Case(
+                When(
+                    failed_login_attempts__gte=MAX_FAILED_LOGIN_ATTEMPTS - 1,
+                    then=Value(locked_until),
+                ),
+                default=F('account_locked_until'),
+            ),
+        )
+        
+        self.failed_login_attempts += 1
+        if self.failed_login_attempts >= MAX_FAILED_LOGIN_ATTEMPTS:
+            self.account_locked_until = locked_until
 
 
 class SecurityEvent(TimeStampedModel):
@@ -93,22 +93,7 @@ class AttachmentCreateSerializer(serializers.ModelSerializer):
         
         # Check file extension
         file_extension = os.path.splitext(value.name)[1].lower()
-        allowed_extensions = [
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg',
-            # PDFs
-            '.pdf',
-            # Documents
-            '.doc', '.docx', '.txt', '.rtf', '.odt',
-            # Spreadsheets
-            '.xls', '.xlsx', '.csv', '.ods',
-            # Presentations
-            '.ppt', '.pptx', '.odp',
-            # Archives
-            '.zip', '.rar', '.7z', '.tar', '.gz',
-        ]
-        
-        if file_extension not in allowed_extensions:
+        if file_extension[1:] not in Attachment.ALLOWED_EXTENSIONS:
             raise serializers.ValidationError(f"File type '{file_extension}' is not allowed.")
         
         # Check for potentially dangerous files
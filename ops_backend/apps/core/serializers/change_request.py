@@ -194,7 +194,7 @@ class ChangeRequestSerializer(serializers.ModelSerializer):
         signatures_data = validated_data.pop('signatures', {})
         
         # Update DocumentInstance filled_data
-        filled_data = instance.document_instance.filled_data.copy()
+        filled_data = instance.document_instance.filled_data
         
         if change_request_data:
             if 'change_request' not in filled_data:
@@ -217,7 +217,6 @@ class ChangeRequestSerializer(serializers.ModelSerializer):
             filled_data['signatures'].update(signatures_data)
         
         # Save DocumentInstance
-        instance.document_instance.filled_data = filled_data
         instance.document_instance.save(update_fields=['filled_data', 'updated_at'])
         
         # Update ChangeRequest
@@ -308,8 +307,7 @@ class ChangeRequestSignatureSerializer(serializers.Serializer):
         
         # Check if user can sign this change request
         if not change_request.can_be_signed_by(user):
-            user_role = getattr(user, 'role', None)
-            role_name = user_role.codename if user_role else 'unknown'
+            role_name = getattr(user, 'role_codename', '') or 'unknown'
             raise serializers.ValidationError(
                 f"User with role '{role_name}' cannot sign this change request document."
             )
@@ -342,15 +340,15 @@ class ImpactAssessmentUpdateSerializer(serializers.Serializer):
         
         # Check if user can assess this change request
         if not change_request.can_be_assessed_by(user):
-            user_role = getattr(user, 'role', None)
-            role_name = user_role.codename if user_role else 'unknown'
+            role_name = getattr(user, 'role_codename', '') or 'unknown'
             raise serializers.ValidationError(
                 f"User with role '{role_name}' cannot assess this change request."
             )
         
         # Update impact assessment
-        change_request.update_impact_assessment(self.validated_data['impact_assessment'])
-        change_request.assessed_by = user
-        change_request.save(update_fields=['assessed_by'])
+        change_request.update_impact_assessment(
+            self.validated_data['impact_assessment'],
+            assessed_by=user
+        )
         
         return change_request
@@ -12,6 +12,30 @@ from apps.core.models import Client, Organization, Contact
 User = get_user_model()
 # Note: UserProfileSerializer not available, using basic user representation
 
+# Allowed values of the Client list fields mirrored into ClientFeature
+VALID_PROJECT_TYPES = frozenset({
+    'website_development', 'mobile_app', 'student_portal',
+    'parent_portal', 'teacher_portal', 'admin_portal',
+    'learning_management_system', 'communication_system',
+    'assessment_tools', 'reporting_system', 'other'
+})
+
+VALID_PROJECT_PURPOSES = frozenset({
+    'improve_student_engagement', 'enhance_communication',
+    'streamline_administration', 'modernize_technology',
+    'improve_parent_involvement', 'enhance_learning_experience',
+    'reduce_manual_processes', 'improve_data_management',
+    'increase_accessibility', 'other'
+})
+
+VALID_PILOT_SCOPE_FEATURES = frozenset({
+    'user_authentication', 'student_management', 'class_management',
+    'gradebook', 'attendance_tracking', 'parent_communication',
+    'teacher_tools', 'admin_dashboard', 'reporting_analytics',
+    'mobile_responsive', 'multi_language', 'integration_apis',
+    'data_export', 'backup_recovery', 'security_features'
+})
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Basic User serializer for client relationships."""
@@ -51,7 +75,55 @@ class ContactSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'organization_name', 'created_at', 'updated_at']
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientFeatureListsMixin:
+    """
+    Validate the Client list fields that are mirrored into ClientFeature.
+    
+    Every serializer that writes these fields uses this mixin, so only
+    known values (which fit ClientFeature.code) reach Client.save().
+    """
+    
+    def validate_project_type(self, value):
+        """Validate project type selections."""
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Project type must be a list.")
+        
+        for project_type in value:
+            if project_type not in VALID_PROJECT_TYPES:
+                raise serializers.ValidationError(
+                    f"Invalid project type: {project_type}"
+                )
+        
+        return value
+    
+    def validate_project_purpose(self, value):
+        """Validate project purpose selections."""
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Project purpose must be a list.")
+        
+        for purpose in value:
+            if purpose not in VALID_PROJECT_PURPOSES:
+                raise serializers.ValidationError(
+                    f"Invalid project purpose: {purpose}"
+                )
+        
+        return value
+    
+    def validate_pilot_scope_features(self, value):
+        """Validate pilot scope feature selections."""
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Pilot scope features must be a list.")
+        
+        for feature in value:
+            if feature not in VALID_PILOT_SCOPE_FEATURES:
+                raise serializers.ValidationError(
+                    f"Invalid pilot scope feature: {feature}"
+                )
+        
+        return value
+
+
+class ClientSerializer(ClientFeatureListsMixin, serializers.ModelSerializer):
     """Serializer for Client model with intake functionality."""
     
     # Related object serializers
@@ -113,51 +185,21 @@ class ClientSerializer(serializers.ModelSerializer):
     
     def get_primary_contact(self, obj):
         """Get the primary contact for this client."""
-        if obj.primary_contact:
-            return ContactSerializer(obj.primary_contact).data
+        primary_contact = obj.primary_contact
+        if primary_contact:
+            return ContactSerializer(primary_contact).data
         return None
     
     def get_is_intake_complete(self, obj):
         """Check if intake form is complete."""
-        required_fields = [
-            'school_name', 'contact_person', 'email', 'project_type',
-            'project_purpose', 'pilot_scope_features', 'timeline_preference'
-        ]
-        
-        for field in required_fields:
-            value = getattr(obj, field, None)
-            if not value or (isinstance(value, list) and len(value) == 0):
-                return False
-        return True
+        return obj.is_intake_complete
     
     def get_intake_completion_percentage(self, obj):
         """Calculate intake form completion percentage."""
-        intake_fields = [
-            'school_name', 'address', 'contact_person', 'role_position',
-            'phone_whatsapp', 'email', 'current_website', 'number_of_students',
-            'number_of_staff', 'project_type', 'project_purpose',
-            'pilot_scope_features', 'pilot_start_date', 'pilot_end_date',
-            'timeline_preference', 'design_preferences', 'logo_colors',
-            'content_availability', 'maintenance_plan', 'token_commitment_fee',
-            'additional_notes', 'acknowledgment'
-        ]
-        
-        completed_fields = 0
-        total_fields = len(intake_fields)
-        
-        for field in intake_fields:
-            value = getattr(obj, field, None)
-            if value is not None:
-                if isinstance(value, (list, dict)):
-                    if len(value) > 0:
-                        completed_fields += 1
-                elif value != '':
-                    completed_fields += 1
-        
-        return round((completed_fields / total_fields) * 100, 1)
+        return obj.intake_completion_percentage
 
 
-class ClientCreateSerializer(serializers.ModelSerializer):
+class ClientCreateSerializer(ClientFeatureListsMixin, serializers.ModelSerializer):
     """Serializer for creating new clients with intake data."""
     
     class Meta:
@@ -177,71 +219,9 @@ class ClientCreateSerializer(serializers.ModelSerializer):
             'maintenance_plan', 'token_commitment_fee',
             'additional_notes', 'acknowledgment'
         ]
-    
-    def validate_project_type(self, value):
-        """Validate project type selections."""
-        if not isinstance(value, list):
-            raise serializers.ValidationError("Project type must be a list.")
-        
-        valid_types = [
-            'website_development', 'mobile_app', 'student_portal',
-            'parent_portal', 'teacher_portal', 'admin_portal',
-            'learning_management_system', 'communication_system',
-            'assessment_tools', 'reporting_system', 'other'
-        ]
-        
-        for project_type in value:
-            if project_type not in valid_types:
-                raise serializers.ValidationError(
-                    f"Invalid project type: {project_type}"
-                )
-        
-        return value
-    
-    def validate_project_purpose(self, value):
-        """Validate project purpose selections."""
-        if not isinstance(value, list):
-            raise serializers.ValidationError("Project purpose must be a list.")
-        
-        valid_purposes = [
-            'improve_student_engagement', 'enhance_communication',
-            'streamline_administration', 'modernize_technology',
-            'improve_parent_involvement', 'enhance_learning_experience',
-            'reduce_manual_processes', 'improve_data_management',
-            'increase_accessibility', 'other'
-        ]
-        
-        for purpose in value:
-            if purpose not in valid_purposes:
-                raise serializers.ValidationError(
-                    f"Invalid project purpose: {purpose}"
-                )
-        
-        return value
-    
-    def validate_pilot_scope_features(self, value):
-        """Validate pilot scope feature selections."""
-        if not isinstance(value, list):
-            raise serializers.ValidationError("Pilot scope features must be a list.")
-        
-        valid_features = [
-            'user_authentication', 'student_management', 'class_management',
-            'gradebook', 'attendance_tracking', 'parent_communication',
-            'teacher_tools', 'admin_dashboard', 'reporting_analytics',
-            'mobile_responsive', 'multi_language', 'integration_apis',
-            'data_export', 'backup_recovery', 'security_features'
-        ]
-        
-        for feature in value:
-            if feature not in valid_features:
-                raise serializers.ValidationError(
-                    f"Invalid pilot scope feature: {feature}"
-                )
-        
-        return value
 
 
-class ClientIntakeUpdateSerializer(serializers.ModelSerializer):
+class ClientIntakeUpdateSerializer(ClientFeatureListsMixin, serializers.ModelSerializer):
     """Serializer specifically for updating client intake information."""
     
     class Meta:
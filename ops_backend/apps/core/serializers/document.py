@@ -225,6 +225,19 @@ class DocumentGenerationSerializer(serializers.Serializer):
         return value
 
 
+class DocumentBulkSignSerializer(serializers.Serializer):
+    """
+    Serializer for signing several documents at once.
+    """
+    
+    document_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=500,
+        help_text="IDs of the documents to sign"
+    )
+
+
 class DocumentSignSerializer(serializers.Serializer):
     """
     Serializer for document signing requests.
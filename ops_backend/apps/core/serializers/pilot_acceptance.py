@@ -181,7 +181,7 @@ class PilotAcceptanceSerializer(serializers.ModelSerializer):
         project_reference_data = validated_data.pop('project_reference', {})
         
         # Update DocumentInstance filled_data
-        filled_data = instance.document_instance.filled_data.copy()
+        filled_data = instance.document_instance.filled_data
         
         if checklist_data:
             filled_data['checklist'].update(checklist_data)
@@ -202,7 +202,6 @@ class PilotAcceptanceSerializer(serializers.ModelSerializer):
                 filled_data[field] = value
         
         # Save DocumentInstance
-        instance.document_instance.filled_data = filled_data
         instance.document_instance.save(update_fields=['filled_data', 'updated_at'])
         
         # Update PilotAcceptance
@@ -300,8 +299,7 @@ class PilotAcceptanceSignatureSerializer(serializers.Serializer):
         
         # Check if user can sign this acceptance
         if not pilot_acceptance.can_be_signed_by(user):
-            user_role = getattr(user, 'role', None)
-            role_name = user_role.codename if user_role else 'unknown'
+            role_name = getattr(user, 'role_codename', '') or 'unknown'
             raise serializers.ValidationError(
                 f"User with role '{role_name}' cannot sign this acceptance document."
             )
@@ -258,7 +258,7 @@ class PilotHandoverSerializer(serializers.ModelSerializer):
         signatures_data = validated_data.pop('signatures', {})
         
         # Update DocumentInstance filled_data
-        filled_data = instance.document_instance.filled_data.copy()
+        filled_data = instance.document_instance.filled_data
         
         if project_reference_data:
             if 'project_reference' not in filled_data:
@@ -281,7 +281,6 @@ class PilotHandoverSerializer(serializers.ModelSerializer):
             filled_data['signatures'].update(signatures_data)
         
         # Save DocumentInstance
-        instance.document_instance.filled_data = filled_data
         instance.document_instance.save(update_fields=['filled_data', 'updated_at'])
         
         # Update PilotHandover
@@ -382,8 +381,7 @@ class PilotHandoverSignatureSerializer(serializers.Serializer):
         
         # Check if user can sign this handover
         if not pilot_handover.can_be_signed_by(user):
-            user_role = getattr(user, 'role', None)
-            role_name = user_role.codename if user_role else 'unknown'
+            role_name = getattr(user, 'role_codename', '') or 'unknown'
             raise serializers.ValidationError(
                 f"User with role '{role_name}' cannot sign this handover document."
             )
@@ -0,0 +1,130 @@
+"""
+Download counter service for Sumano OMS.
+
+This service coalesces attachment download counts in Redis so bursts of
+downloads cost one batched UPDATE per flush instead of one UPDATE each.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from apps.core.models import Attachment
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadCounterService:
+    """
+    Buffered attachment download counters.
+
+    When ``ATTACHMENT_DOWNLOAD_BUFFER`` is enabled, downloads are counted in
+    two Redis hashes keyed by attachment id and applied to the database by
+    ``flush`` (run ``manage.py flush_download_counts`` every minute).
+    """
+
+    COUNTS_KEY = 'attach:dl'
+    LAST_DOWNLOADED_KEY = 'attach:last'
+    FLUSH_BATCH_SIZE = 500
+
+    @classmethod
+    def record(cls, attachment: Attachment, downloaded_at: datetime) -> bool:
+        """
+        Buffer one download of an attachment.
+
+        Args:
+            attachment (Attachment): Downloaded attachment
+            downloaded_at (datetime): When the download happened
+
+        Returns:
+            bool: True if buffered, False if the caller should update the
+            database directly (buffering disabled or Redis unavailable)
+        """
+        if not getattr(settings, 'ATTACHMENT_DOWNLOAD_BUFFER', False):
+            return False
+
+        try:
+            pipe = cls._get_connection().pipeline(transaction=False)
+            pipe.hincrby(cls.COUNTS_KEY, str(attachment.pk), 1)
+            pipe.hset(cls.LAST_DOWNLOADED_KEY, str(attachment.pk), downloaded_at.isoformat())
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Download counter buffer unavailable, writing directly: {e}")
+            return False
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Drain the buffered counters and apply them to the database.
+
+        Returns:
+            int: Number of attachments updated
+        """
+        connection = cls._get_connection()
+
+        # Read and clear both hashes atomically so no download is counted twice
+        pipe = connection.pipeline(transaction=True)
+        pipe.hgetall(cls.COUNTS_KEY)
+        pipe.hgetall(cls.LAST_DOWNLOADED_KEY)
+        pipe.delete(cls.COUNTS_KEY, cls.LAST_DOWNLOADED_KEY)
+        raw_counts, raw_last, _ = pipe.execute()
+
+        pending = {}
+        for pk, count in raw_counts.items():
+            pk = pk.decode()
+            last = raw_last.get(pk.encode())
+            pending[pk] = (
+                int(count),
+                datetime.fromisoformat(last.decode()) if last else timezone.now(),
+            )
+
+        try:
+            return cls.apply_counts(pending)
+        except Exception:
+            # Put the counts back so the next flush retries them
+            restore = connection.pipeline(transaction=False)
+            for pk, (count, last) in pending.items():
+                restore.hincrby(cls.COUNTS_KEY, pk, count)
+                restore.hsetnx(cls.LAST_DOWNLOADED_KEY, pk, last.isoformat())
+            restore.execute()
+            raise
+
+    @classmethod
+    def apply_counts(cls, pending: Dict[str, Tuple[int, datetime]]) -> int:
+        """
+        Add download counts to attachments with one UPDATE per batch.
+
+        Args:
+            pending (dict): Attachment id -> (downloads, last downloaded at)
+
+        Returns:
+            int: Number of attachments updated
+        """
+        items = list(pending.items())
+        now = timezone.now()
+        updated = 0
+        for start in range(0, len(items), cls.FLUSH_BATCH_SIZE):
+            batch = items[start:start + cls.FLUSH_BATCH_SIZE]
+            updated += Attachment.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                download_count=F('download_count') + Case(
+                    *[When(pk=pk, then=Value(count)) for pk, (count, _) in batch],
+                    default=Value(0),
+                ),
+                last_downloaded_at=Case(
+                    *[When(pk=pk, then=Value(last)) for pk, (_, last) in batch],
+                    default=F('last_downloaded_at'),
+                ),
+                updated_at=now,
+            )
+        return updated
+
+    @staticmethod
+    def _get_connection():
+        """Get the raw Redis client behind the default cache."""
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
@@ -8,7 +8,9 @@ types across the system, ensuring consistent formatting and branding.
 import os
 import time
 import logging
-from typing import Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from io import BytesIO
 
 from django.conf import settings
@@ -22,12 +24,18 @@ from django.contrib.auth import get_user_model
 # from weasyprint import HTML, CSS
 # from weasyprint.text.fonts import FontConfiguration
 
-from apps.core.models import DocumentTemplate, DocumentInstance, Project
+from apps.core.models import Client, DocumentTemplate, DocumentInstance, Project
 from apps.core.services.security_service import SecurityService
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Compiled Django templates keyed by (template pk, updated_at), least recently used first
+_COMPILED_TEMPLATES: "OrderedDict[Tuple[Any, Any], Template]" = OrderedDict()
+# Guards _COMPILED_TEMPLATES across the threads of a worker process
+_COMPILED_TEMPLATES_LOCK = threading.Lock()
+COMPILED_TEMPLATE_CACHE_SIZE = 64
+
 
 class PDFGenerationService:
     """
@@ -35,6 +43,10 @@ class PDFGenerationService:
     
     This service handles PDF generation from HTML templates with consistent
     formatting, performance monitoring, and error handling.
+    
+    Scan-style queries over templates or documents should stream rows with
+    ``.iterator(chunk_size=1000)`` (server-side cursors on PostgreSQL)
+    rather than materializing whole querysets.
     """
     
     # Performance thresholds (in seconds)
@@ -82,6 +94,10 @@ class PDFGenerationService:
             if not is_valid:
                 raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
             
+            # Templates may traverse project relations; flag unjoined ones in development
+            if settings.DEBUG and project is not None:
+                cls._warn_unloaded_relations(project)
+            
             # Prepare template context
             context = cls._prepare_template_context(data, signature_context, user, project)
             
@@ -206,6 +222,25 @@ class PDFGenerationService:
         except DocumentTemplate.DoesNotExist:
             raise ValueError(f"Published template not found: {template_name}")
     
+    @classmethod
+    def _warn_unloaded_relations(cls, project: Project) -> None:
+        """
+        Warn when a project is passed without its client relations joined.
+        
+        Callers should fetch projects with
+        ``select_related('client__organization')`` so rendering a batch of
+        documents does not issue one extra query per project.
+        """
+        client_loaded = Project.client.is_cached(project)
+        if not client_loaded or (
+            project.client is not None
+            and not Client.organization.is_cached(project.client)
+        ):
+            logger.warning(
+                f"Project {project.pk} passed to PDF generation without "
+                f"select_related('client__organization')"
+            )
+    
     @classmethod
     def _prepare_template_context(
         cls,
@@ -238,11 +273,133 @@ class PDFGenerationService:
         return Context(context_data)
     
     @classmethod
-    def _generate_pdf(cls, template: DocumentTemplate, context: Context) -> bytes:
+    def get_compiled_template(cls, template: DocumentTemplate) -> Template:
+        """
+        Return the compiled Django template for a DocumentTemplate.
+        
+        Compiled templates are memoized per process by ``(pk, updated_at)``,
+        so saving a template picks up the new content without a restart.
+        The cache keeps the most recently used templates. Unsaved templates
+        are compiled on every call. Compilation runs outside the lock, so
+        two threads may compile the same template once each.
+        """
+        key = (template.pk, template.updated_at)
+        if key[0] is None or key[1] is None:
+            return Template(template.content)
+        
+        with _COMPILED_TEMPLATES_LOCK:
+            compiled = _COMPILED_TEMPLATES.get(key)
+            if compiled is not None:
+                _COMPILED_TEMPLATES.move_to_end(key)
+                return compiled
+        
+        compiled = Template(template.content)
+        with _COMPILED_TEMPLATES_LOCK:
+            _COMPILED_TEMPLATES[key] = compiled
+            _COMPILED_TEMPLATES.move_to_end(key)
+            if len(_COMPILED_TEMPLATES) > COMPILED_TEMPLATE_CACHE_SIZE:
+                # Evict the least recently used entry
+                _COMPILED_TEMPLATES.popitem(last=False)
+        return compiled
+    
+    @classmethod
+    def evict_compiled_template(cls, template_pk: Any) -> None:
+        """Drop every compiled version of a template from the cache."""
+        with _COMPILED_TEMPLATES_LOCK:
+            for key in [key for key in _COMPILED_TEMPLATES if key[0] == template_pk]:
+                del _COMPILED_TEMPLATES[key]
+    
+    @classmethod
+    def render_bytes(
+        cls,
+        template: DocumentTemplate,
+        data: Dict[str, Any],
+        compiled: Optional[Template] = None,
+        signature_context: Optional[Dict[str, Any]] = None,
+        user: Optional[User] = None,
+        project: Optional[Project] = None
+    ) -> bytes:
+        """
+        Render PDF bytes for a template without touching the database.
+        
+        Templates are compiled through ``get_compiled_template``; callers
+        holding a compiled template may pass it as ``compiled``.
+        
+        Args:
+            template (DocumentTemplate): Template to render
+            data (dict): Data to fill the template
+            compiled (Template, optional): Pre-compiled Django template
+            signature_context (dict, optional): Additional context for signatures
+            user (User, optional): User generating the document
+            project (Project, optional): Project this document belongs to
+            
+        Returns:
+            bytes: Generated PDF content
+        """
+        context = cls._prepare_template_context(data, signature_context, user, project)
+        return cls._generate_pdf(template, context, compiled)
+    
+    @classmethod
+    def build_document_instance(
+        cls,
+        template: DocumentTemplate,
+        data: Dict[str, Any],
+        pdf_bytes: bytes,
+        user: Optional[User] = None,
+        project: Optional[Project] = None
+    ) -> DocumentInstance:
+        """
+        Build an unsaved DocumentInstance with its PDF already in storage.
+        
+        Pair with ``persist_many`` to insert a batch of generated documents
+        in a single ``bulk_create``.
+        """
+        # Generate document title
+        document_title = f"{template.name} - {data.get('title', 'Document')}"
+        if project:
+            document_title = f"{document_title} - {project.project_name}"
+        
+        # Generate document number
+        timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+        document_number = f"{template.template_type}-{timestamp}"
+        
+        document_instance = DocumentInstance(
+            template=template,
+            project=project,
+            filled_data=data,
+            document_title=document_title,
+            document_number=document_number,
+            created_by=user or User.objects.filter(is_superuser=True).first()
+        )
+        
+        # Store the PDF file; the row itself is written by the caller
+        document_instance.store_pdf(pdf_bytes, save=False)
+        return document_instance
+    
+    @classmethod
+    def persist_many(cls, instances: List[DocumentInstance]) -> List[DocumentInstance]:
+        """
+        Insert document instances built by ``build_document_instance`` in bulk.
+        
+        Args:
+            instances (list): Unsaved DocumentInstance objects
+            
+        Returns:
+            list: The saved instances
+        """
+        return DocumentInstance.objects.bulk_create(instances, batch_size=1000)
+    
+    @classmethod
+    def _generate_pdf(
+        cls,
+        template: DocumentTemplate,
+        context: Context,
+        compiled: Optional[Template] = None
+    ) -> bytes:
         """Generate PDF from template and context."""
         try:
-            # Create Django template from content
-            django_template = Template(template.content)
+            # Reuse the compiled Django template unless the caller passed one
+            django_template = compiled or cls.get_compiled_template(template)
             rendered_html = django_template.render(context)
             
             # TODO: Implement WeasyPrint PDF generation
@@ -267,33 +424,11 @@ class PDFGenerationService:
     ) -> DocumentInstance:
         """Create a DocumentInstance with the generated PDF."""
         try:
-            # Generate document title
-            document_title = f"{template.name} - {data.get('title', 'Document')}"
-            if project:
-                document_title = f"{document_title} - {project.project_name}"
-            
-            # Generate document number
-            timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
-            document_number = f"{template.template_type}-{timestamp}"
-            
-            # Create document instance
-            document_instance = DocumentInstance.objects.create(
-                template=template,
-                project=project,
-                filled_data=data,
-                document_title=document_title,
-                document_number=document_number,
-                created_by=user or User.objects.filter(is_superuser=True).first()
-            )
-            
-            # Save PDF file
-            filename = f"{document_number}.pdf"
-            document_instance.generated_pdf.save(
-                filename,
-                ContentFile(pdf_bytes),
-                save=True
+            # Store the file first so the row is written with a single INSERT
+            document_instance = cls.build_document_instance(
+                template, data, pdf_bytes, user, project
             )
-            
+            document_instance.save(force_insert=True)
             return document_instance
             
         except Exception as e:
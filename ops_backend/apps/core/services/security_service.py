@@ -5,10 +5,96 @@ This service handles security event logging, authentication monitoring,
 and security-related operations.
 """
 
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
-from django.db import models
+from django.db import models, close_old_connections
 from apps.core.models import SecurityEvent, User
 
+logger = logging.getLogger(__name__)
+
+# Failed logins per IP are counted in hourly cache buckets
+FAILED_LOGIN_KEY = 'sec:ip:{ip}:{bucket}'
+FAILED_LOGIN_BUCKET_SECONDS = 3600
+FAILED_LOGIN_WINDOW_HOURS = 24
+
+
+class _SecurityEventWriter:
+    """
+    Background writer that persists security events in batches.
+    
+    Events are queued by request threads and written by a single daemon
+    thread with bulk_create, either every ``flush_interval`` seconds or as
+    soon as ``batch_size`` events are pending.
+    """
+    
+    flush_interval = 0.25
+    batch_size = 500
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, event):
+        """Queue an unsaved SecurityEvent for writing."""
+        self._ensure_started()
+        self._queue.put(event)
+    
+    def flush(self):
+        """Synchronously write every event still waiting in the queue."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+    
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='security-event-writer',
+                    daemon=True,
+                )
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            close_old_connections()
+    
+    def _write(self, batch):
+        try:
+            SecurityEvent.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Failed to write %d security events", len(batch))
+
+
+_event_writer = _SecurityEventWriter()
+atexit.register(_event_writer.flush)
+
 
 class SecurityService:
     """
@@ -38,6 +124,9 @@ class SecurityService:
         Returns:
             SecurityEvent: The created security event record
         """
+        if event_type == 'login_failure':
+            cls.record_failed_login(ip_address or '127.0.0.1')
+        
         # Create security event
         security_event = SecurityEvent.objects.create(
             event_type=event_type,
@@ -52,19 +141,119 @@ class SecurityService:
         
         return security_event
     
+    @classmethod
+    def log_security_event_async(cls, event_type, user=None, ip_address=None,
+                                 user_agent=None, request_path=None, request_method=None,
+                                 details=None, severity='medium', request=None):
+        """
+        Log a security event without blocking the request on the INSERT.
+        
+        If ``request`` has an event buffer (opened by SecurityMiddleware),
+        the event is appended to it and written together with the request's
+        other events when the response is processed. Otherwise the event is
+        queued and written in bulk by a background thread. When
+        ``settings.SECURITY_LOG_SYNC`` is enabled (e.g. in tests) unbuffered
+        events are written immediately via ``log_security_event``.
+        
+        Args:
+            Same as ``log_security_event``, plus:
+            request (HttpRequest, optional): Request the event belongs to
+            
+        Returns:
+            SecurityEvent: The security event record (unsaved when deferred)
+        """
+        buffer = cls._get_request_buffer(request)
+        if buffer is None and getattr(settings, 'SECURITY_LOG_SYNC', False):
+            return cls.log_security_event(
+                event_type=event_type,
+                user=user,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                request_path=request_path,
+                request_method=request_method,
+                details=details,
+                severity=severity
+            )
+        
+        security_event = SecurityEvent(
+            event_type=event_type,
+            user=user,
+            ip_address=ip_address or '127.0.0.1',
+            user_agent=user_agent or '',
+            request_path=request_path or '',
+            request_method=request_method or '',
+            details=details or {},
+            severity=severity
+        )
+        if event_type == 'login_failure':
+            cls.record_failed_login(security_event.ip_address)
+        
+        if buffer is not None:
+            buffer.append(security_event)
+        else:
+            _event_writer.submit(security_event)
+        
+        return security_event
+    
+    @classmethod
+    def start_request_buffer(cls, request):
+        """Start collecting the security events logged while handling a request."""
+        request._sec_buffer = []
+    
+    @classmethod
+    def flush_request_buffer(cls, request):
+        """
+        Write all security events collected for a request in one batch.
+        
+        Returns:
+            int: Number of events flushed
+        """
+        events = getattr(request, '_sec_buffer', None)
+        request._sec_buffer = None
+        if not events:
+            return 0
+        
+        if getattr(settings, 'SECURITY_LOG_SYNC', False):
+            SecurityEvent.objects.bulk_create(events, batch_size=100)
+        else:
+            for event in events:
+                _event_writer.submit(event)
+        
+        return len(events)
+    
+    @classmethod
+    def _get_request_buffer(cls, request):
+        """Return the open event buffer of a (possibly DRF-wrapped) request."""
+        if request is None:
+            return None
+        http_request = getattr(request, '_request', request)
+        return getattr(http_request, '_sec_buffer', None)
+    
     @classmethod
     def get_client_ip(cls, request):
-        """Get the client IP address from the request."""
+        """
+        Get the client IP address from the request.
+        
+        The result is cached on the underlying HttpRequest so middleware,
+        authentication backends and DRF permissions share one computation.
+        """
         if not request:
             return '127.0.0.1'
         
+        # DRF wraps the Django request; cache on the shared HttpRequest
+        http_request = getattr(request, '_request', request)
+        ip = getattr(http_request, '_cached_client_ip', None)
+        if ip is not None:
+            return ip
+        
         # Check for forwarded IP first
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        x_forwarded_for = http_request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+            ip = x_forwarded_for.partition(',')[0].strip()
         else:
-            ip = request.META.get('REMOTE_ADDR', '127.0.0.1')
+            ip = http_request.META.get('REMOTE_ADDR', '127.0.0.1')
         
+        http_request._cached_client_ip = ip
         return ip
     
     @classmethod
@@ -87,6 +276,51 @@ class SecurityService:
             created_at__gte=since
         ).count()
     
+    @classmethod
+    def record_failed_login(cls, ip_address):
+        """
+        Count a failed login for an IP in the current hourly cache bucket.
+        
+        Args:
+            ip_address (str): IP address of the failed attempt
+        """
+        bucket = int(time.time()) // FAILED_LOGIN_BUCKET_SECONDS
+        key = FAILED_LOGIN_KEY.format(ip=ip_address, bucket=bucket)
+        try:
+            cache.add(key, 0, timeout=(FAILED_LOGIN_WINDOW_HOURS + 1) * FAILED_LOGIN_BUCKET_SECONDS)
+            cache.incr(key)
+        except Exception:
+            logger.warning("Could not record failed login for %s in cache", ip_address)
+    
+    @classmethod
+    def get_recent_failed_login_count(cls, ip_address, hours=24):
+        """
+        Get the number of failed logins from an IP using the cache counters.
+        
+        Sums the hourly buckets covering the window in a single cache round
+        trip. Falls back to counting SecurityEvent rows when the window is
+        longer than the counters are kept or the cache is unavailable.
+        
+        Args:
+            ip_address (str): IP address to check
+            hours (int): Number of hours to look back
+            
+        Returns:
+            int: Number of failed login attempts
+        """
+        if hours > FAILED_LOGIN_WINDOW_HOURS:
+            return cls.get_failed_login_attempts(ip_address, hours)
+        
+        current_bucket = int(time.time()) // FAILED_LOGIN_BUCKET_SECONDS
+        keys = [
+            FAILED_LOGIN_KEY.format(ip=ip_address, bucket=current_bucket - offset)
+            for offset in range(hours)
+        ]
+        try:
+            return sum(cache.get_many(keys).values())
+        except Exception:
+            return cls.get_failed_login_attempts(ip_address, hours)
+    
     @classmethod
     def is_ip_blocked(cls, ip_address, max_attempts=5, hours=24):
         """
@@ -100,7 +334,7 @@ class SecurityService:
         Returns:
             bool: True if IP should be blocked
         """
-        failed_attempts = cls.get_failed_login_attempts(ip_address, hours)
+        failed_attempts = cls.get_recent_failed_login_count(ip_address, hours)
         return failed_attempts >= max_attempts
     
     @classmethod
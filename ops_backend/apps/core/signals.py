@@ -0,0 +1,80 @@
+"""
+Signal handlers for the core app.
+
+These handlers keep per-instance caches and denormalized columns on core
+models consistent with the database.
+"""
+
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.core.authentication.backends import JWTAuthenticationBackend
+from apps.core.models import Contact, DocumentTemplate, Organization, User
+from apps.core.services.pdf_service import PDFGenerationService
+
+
+@receiver(user_logged_in)
+def clear_permission_cache_on_login(sender, user, **kwargs):
+    """Recompute permissions for a freshly logged-in user."""
+    if isinstance(user, User):
+        user.clear_permission_cache()
+
+
+@receiver(post_save, sender=User)
+def clear_permission_cache_on_save(sender, instance, **kwargs):
+    """Drop cached permissions when a user (e.g. their primary role) changes."""
+    instance.clear_permission_cache()
+    JWTAuthenticationBackend.invalidate_cached_users(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_jwt_users_on_delete(sender, instance, **kwargs):
+    """Stop serving JWT-cached copies of a deleted user."""
+    JWTAuthenticationBackend.invalidate_cached_users(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.additional_roles.through)
+def clear_permission_cache_on_role_change(sender, instance, action, **kwargs):
+    """Drop cached permissions when a user's additional roles change."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, User):
+        instance.clear_permission_cache()
+        JWTAuthenticationBackend.invalidate_cached_users(instance.pk)
+
+
+@receiver(pre_save, sender=Contact)
+def demote_other_primary_contacts(sender, instance, raw=False, **kwargs):
+    """
+    Clear the primary flag on the other contacts of a new primary contact.
+    
+    This runs before the save so the uniq_primary_contact_per_org constraint
+    never sees two primary contacts for one organization.
+    """
+    if raw or not instance.is_primary_contact:
+        return
+    Contact.objects.filter(
+        organization_id=instance.organization_id,
+        is_primary_contact=True,
+    ).exclude(pk=instance.pk).update(is_primary_contact=False, updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Contact)
+def sync_organization_primary_contact(sender, instance, raw=False, **kwargs):
+    """Keep Organization.primary_contact in step with Contact.is_primary_contact."""
+    if raw:
+        return
+    stale = Organization.objects.filter(primary_contact=instance)
+    if instance.is_primary_contact:
+        stale = stale.exclude(pk=instance.organization_id)
+        Organization.objects.filter(pk=instance.organization_id).update(primary_contact=instance)
+        if Contact.organization.is_cached(instance):
+            instance.organization.primary_contact = instance
+    stale.update(primary_contact=None)
+
+
+@receiver(post_save, sender=DocumentTemplate)
+@receiver(post_delete, sender=DocumentTemplate)
+def evict_compiled_document_template(sender, instance, **kwargs):
+    """Drop compiled versions of a template that was edited or deleted."""
+    PDFGenerationService.evict_compiled_template(instance.pk)
@@ -0,0 +1,42 @@
+"""
+Shared test case classes for the core app.
+
+Security counters, login throttles and cached JWT users live in the
+cache, which a test's database rollback does not reset. These classes
+give every test a process-local cache and empty it before each test, so
+e.g. failed logins recorded by one test cannot get the test client's IP
+blocked in the next.
+"""
+
+from django.core.cache import cache
+from django.test import (
+    TestCase as DjangoTestCase,
+    TransactionTestCase as DjangoTransactionTestCase,
+    override_settings,
+)
+from rest_framework.test import APITestCase as DRFAPITestCase
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class CacheIsolationMixin:
+    """Start every test with an empty cache."""
+
+    def _pre_setup(self):
+        super()._pre_setup()
+        cache.clear()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCase(CacheIsolationMixin, DjangoTestCase):
+    """Django TestCase with an isolated cache."""
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TransactionTestCase(CacheIsolationMixin, DjangoTransactionTestCase):
+    """Django TransactionTestCase with an isolated cache."""
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class APITestCase(CacheIsolationMixin, DRFAPITestCase):
+    """DRF APITestCase with an isolated cache."""
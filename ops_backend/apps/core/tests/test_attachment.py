@@ -3,14 +3,17 @@ Tests for Attachment functionality.
 """
 import os
 import tempfile
-from django.test import TestCase, override_settings
+from unittest.mock import patch
+from django.db import IntegrityError, transaction
+from django.test import override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework import status
 from django.conf import settings
 
+from apps.core.tests.base import TestCase, APITestCase
 from apps.core.models import (
     Attachment, Project, Client, Organization, Contact, Role
 )
@@ -145,6 +148,62 @@ class AttachmentModelTestCase(TestCase):
         )
         self.assertEqual(attachment.file_type, 'document')
     
+    def test_mime_type_detection(self):
+        """Test MIME types come from the upload table, then the mimetypes database."""
+        for name, expected in [
+            ("archive.gz", 'application/gzip'),
+            ("data.json", 'application/json'),
+            ("blob.unknownext", 'application/octet-stream'),
+        ]:
+            attachment = Attachment(
+                file=SimpleUploadedFile(name, b"content"),
+                project=self.project,
+                uploaded_by=self.staff_user
+            )
+            self.assertEqual(attachment._get_mime_type(), expected)
+    
+    def test_file_url_is_memoized(self):
+        """Test that storage URLs are reused within the cache window."""
+        attachment = Attachment.objects.create(
+            file=self.test_file,
+            project=self.project,
+            uploaded_by=self.staff_user
+        )
+        storage = attachment.file.storage
+        
+        with patch.object(storage, 'url', wraps=storage.url) as url:
+            first = attachment.get_file_url()
+            self.assertEqual(Attachment.objects.get(pk=attachment.pk).get_file_url(), first)
+            self.assertEqual(url.call_count, 1)
+            
+            with override_settings(ATTACHMENT_URL_CACHE_SECONDS=0):
+                attachment.get_file_url()
+            self.assertEqual(url.call_count, 2)
+    
+    def test_extension_validator(self):
+        """Test that the file field validator accepts listed extensions only."""
+        from django.core.exceptions import ValidationError
+        
+        validator = Attachment._meta.get_field('file').validators[0]
+        validator(SimpleUploadedFile("Report.PDF", b"content"))
+        with self.assertRaises(ValidationError) as cm:
+            validator(SimpleUploadedFile("script.exe", b"content"))
+        self.assertEqual(cm.exception.params['extension'], 'exe')
+    
+    def test_file_size_limit_enforced_by_database(self):
+        """Test that file_size holds values above 2 GB but not above the stored ceiling."""
+        attachment = Attachment.objects.create(
+            file=self.test_file,
+            project=self.project,
+            uploaded_by=self.staff_user,
+            file_size=3 * 1024 ** 3
+        )
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.file_size, 3 * 1024 ** 3)
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Attachment.objects.filter(pk=attachment.pk).update(file_size=11 * 1024 ** 3)
+    
     def test_file_size_display(self):
         """Test human-readable file size display."""
         # Create a file with known size
@@ -202,6 +261,28 @@ class AttachmentModelTestCase(TestCase):
         # For now, we'll test that the method works with the current structure
         pass
     
+    def test_permission_checks_use_loaded_role(self):
+        """Test permission checks need no queries once the user's role is joined."""
+        attachment = Attachment.objects.create(
+            file=self.test_file,
+            project=self.project,
+            uploaded_by=self.staff_user
+        )
+        attachment = Attachment.objects.get(pk=attachment.pk)
+        client_user = User.objects.select_related('role').get(pk=self.client_user.pk)
+        no_role_user = User.objects.create_user(
+            username='noroleuser',
+            email='norole@test.com',
+            password='testpass',
+            employee_id='NRU001'
+        )
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(attachment.can_be_accessed_by(client_user))
+            self.assertFalse(attachment.can_be_deleted_by(client_user))
+            self.assertFalse(attachment.can_be_accessed_by(no_role_user))
+            self.assertEqual(no_role_user.role_codename, '')
+    
     def test_download_tracking(self):
         """Test download tracking functionality."""
         attachment = Attachment.objects.create(
@@ -220,6 +301,78 @@ class AttachmentModelTestCase(TestCase):
         self.assertEqual(attachment.download_count, initial_count + 1)
         self.assertIsNotNone(attachment.last_downloaded_at)
         self.assertNotEqual(attachment.last_downloaded_at, initial_time)
+        
+        # A stale instance must not overwrite downloads recorded elsewhere
+        stale = Attachment.objects.get(pk=attachment.pk)
+        attachment.record_download(self.staff_user)
+        with self.assertNumQueries(1):
+            stale.record_download(self.staff_user)
+        
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.download_count, initial_count + 3)
+    
+    def test_bulk_queryset_operations(self):
+        """Test bulk deactivate, download and metadata refresh helpers."""
+        attachments = [
+            Attachment.objects.create(
+                file=SimpleUploadedFile(f"bulk_{i}.pdf", b"PDF content", content_type="application/pdf"),
+                project=self.project,
+                uploaded_by=self.staff_user
+            )
+            for i in range(3)
+        ]
+        queryset = Attachment.objects.filter(pk__in=[a.pk for a in attachments])
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(queryset.bump_downloads(), 3)
+        with self.assertNumQueries(1):
+            self.assertEqual(queryset.deactivate(), 3)
+        self.assertEqual(
+            list(queryset.order_by().values_list('is_active', 'download_count').distinct()),
+            [(False, 1)]
+        )
+        
+        # Only rows with stale metadata are rewritten
+        Attachment.objects.filter(pk=attachments[0].pk).update(file_type='other', mime_type='')
+        self.assertEqual(queryset.refresh_file_metadata(), 1)
+        attachments[0].refresh_from_db()
+        self.assertEqual(attachments[0].file_type, 'pdf')
+        self.assertEqual(attachments[0].mime_type, 'application/pdf')
+    
+    def test_buffered_download_counts(self):
+        """Test applying buffered download counts and falling back without Redis."""
+        from apps.core.services.download_service import DownloadCounterService
+        
+        first = Attachment.objects.create(
+            file=self.test_file,
+            project=self.project,
+            uploaded_by=self.staff_user
+        )
+        second = Attachment.objects.create(
+            file=SimpleUploadedFile("second.pdf", b"PDF content", content_type="application/pdf"),
+            project=self.project,
+            uploaded_by=self.staff_user
+        )
+        downloaded_at = timezone.now()
+        
+        with self.assertNumQueries(1):
+            updated = DownloadCounterService.apply_counts({
+                str(first.pk): (3, downloaded_at),
+                str(second.pk): (1, downloaded_at),
+            })
+        self.assertEqual(updated, 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.download_count, 3)
+        self.assertEqual(second.download_count, 1)
+        self.assertEqual(first.last_downloaded_at, downloaded_at)
+        
+        # An unreachable buffer falls back to the direct UPDATE
+        with override_settings(ATTACHMENT_DOWNLOAD_BUFFER=True), \
+                patch.object(DownloadCounterService, '_get_connection', side_effect=ConnectionError):
+            first.record_download(self.staff_user)
+        first.refresh_from_db()
+        self.assertEqual(first.download_count, 4)
     
     def test_file_extension_methods(self):
         """Test file extension and type checking methods."""
@@ -265,6 +418,20 @@ class AttachmentModelTestCase(TestCase):
         
         expected_str = f"test_document.pdf - {self.project.project_name}"
         self.assertEqual(str(attachment), expected_str)
+    
+    def test_with_related_avoids_per_row_queries(self):
+        """Test with_related() joins project and uploader role in one query."""
+        for i in range(3):
+            Attachment.objects.create(
+                file=SimpleUploadedFile(f"doc_{i}.pdf", b"PDF content", content_type="application/pdf"),
+                project=self.project,
+                uploaded_by=self.staff_user
+            )
+        
+        with self.assertNumQueries(1):
+            for attachment in Attachment.objects.with_related():
+                str(attachment)
+                attachment.uploaded_by.role.codename
 
 
 class AttachmentSerializerTestCase(TestCase):
@@ -492,6 +659,26 @@ class AttachmentAPITestCase(APITestCase):
         self.assertEqual(attachment.project, self.project)
         self.assertEqual(attachment.uploaded_by, self.staff_user)
     
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_large_upload_is_moved_from_spool(self):
+        """Test that spooled uploads are saved from the spool on the media filesystem."""
+        self.client.force_authenticate(user=self.staff_user)
+        
+        response = self.client.post(self.list_url, {
+            'file': self.upload_test_file,
+            'project_id': str(self.project.id),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        attachment = Attachment.objects.get(id=response.data['id'])
+        self.assertEqual(attachment.file.read(), b"PDF content for upload test")
+        attachment.file.close()
+        self.assertEqual(
+            os.stat(settings.FILE_UPLOAD_TEMP_DIR).st_dev,
+            os.stat(attachment.file.path).st_dev
+        )
+        self.assertEqual(os.listdir(settings.FILE_UPLOAD_TEMP_DIR), [])
+    
     def test_download_file(self):
         """Test file download."""
         self.client.force_authenticate(user=self.staff_user)
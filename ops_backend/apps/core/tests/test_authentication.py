@@ -5,13 +5,14 @@ This module contains comprehensive tests for the authentication system,
 RBAC functionality, and security event logging.
 """
 
-from django.test import TestCase, Client
+from django.test import Client, RequestFactory, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from unittest.mock import patch
+from apps.core.tests.base import TestCase, APITestCase
 from apps.core.models import Role, Permission, SecurityEvent, Organization, Client as ClientModel
 from apps.core.services.security_service import SecurityService
 
@@ -127,6 +128,72 @@ class AuthenticationBackendTestCase(TestCase):
             details__contains={'reason': 'account_locked'}
         )
         self.assertTrue(lockout_events.exists())
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_jwt_backend_caches_user(self):
+        """Test that the JWT backend reuses the cached user for a token."""
+        from apps.core.authentication.backends import JWTAuthenticationBackend
+        
+        backend = JWTAuthenticationBackend()
+        access_token = RefreshToken.for_user(self.user).access_token
+        
+        user = backend.authenticate(None, token=str(access_token))
+        self.assertEqual(user, self.user)
+        
+        # Second authentication only writes the security event
+        with self.assertNumQueries(1):
+            cached_user = backend.authenticate(None, token=str(access_token))
+        self.assertEqual(cached_user, self.user)
+        
+        JWTAuthenticationBackend.invalidate_cached_user(access_token['jti'])
+        with self.assertNumQueries(3):
+            backend.authenticate(None, token=str(access_token))
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_jwt_backend_drops_cached_user_on_change(self):
+        """Test that deactivating a user or changing roles bypasses the JWT cache."""
+        from apps.core.authentication.backends import JWTAuthenticationBackend
+        
+        backend = JWTAuthenticationBackend()
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.assertEqual(backend.authenticate(None, token=str(access_token)), self.user)
+        
+        self.user.additional_roles.add(self.superadmin_role)
+        with self.assertNumQueries(3):
+            backend.authenticate(None, token=str(access_token))
+        
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(backend.authenticate(None, token=str(access_token)))
+    
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        LOGIN_ATTEMPTS_PER_MINUTE=2
+    )
+    def test_login_throttle_short_circuits(self):
+        """Test that throttled logins are rejected by every backend without DB access."""
+        from django.contrib.auth import authenticate
+        
+        for _ in range(2):
+            self.assertIsNone(authenticate(None, username='testuser', password='wrongpassword'))
+        
+        # Even the correct password is rejected once the window is exhausted,
+        # and later backends such as ModelBackend are not consulted
+        self.assertIsNone(authenticate(None, username='testuser', password='testpass123'))
+        self.assertTrue(SecurityEvent.objects.filter(
+            event_type='login_failure',
+            details__reason='rate_limited'
+        ).exists())
+        
+        with self.assertNumQueries(0):
+            self.assertIsNone(authenticate(None, username='testuser', password='testpass123'))
+    
+    def test_locked_account_rejected_by_every_backend(self):
+        """Test that a locked account cannot log in through a later backend."""
+        from django.contrib.auth import authenticate
+        
+        self.user.lock_account()
+        self.assertIsNone(authenticate(None, username='testuser', password='testpass123'))
 
 
 class RBACPermissionTestCase(APITestCase):
@@ -267,6 +334,21 @@ class RBACPermissionTestCase(APITestCase):
         self.api_client.credentials(HTTP_AUTHORIZATION='Bearer invalid_token')
         response = self.api_client.get('/api/auth/profile/')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_required_roles_frozen_on_subclass(self):
+        """Test role requirements are frozen into sets at class creation."""
+        from apps.core.authentication.permissions import HasRole, IsStaff
+        
+        self.assertEqual(IsStaff._required_set, frozenset({'staff', 'superadmin'}))
+        
+        class RequiresStaffAndAuditor(HasRole):
+            required_roles = ['staff', 'auditor']
+            require_all_roles = True
+        
+        request = RequestFactory().get('/api/auth/users/')
+        request.user = self.staff_user
+        self.assertTrue(IsStaff().has_permission(request, None))
+        self.assertFalse(RequiresStaffAndAuditor().has_permission(request, None))
 
 
 class SecurityEventLoggingTestCase(APITestCase):
@@ -384,6 +466,71 @@ class SecurityEventLoggingTestCase(APITestCase):
         self.assertEqual(stats['login_attempts'], 1)
         self.assertEqual(stats['login_successes'], 1)
         self.assertEqual(stats['login_failures'], 0)
+    
+    @override_settings(SECURITY_LOG_SYNC=False)
+    def test_async_security_events_are_queued(self):
+        """Test that async security events are queued and written in bulk."""
+        from apps.core.services.security_service import _SecurityEventWriter
+        
+        writer = _SecurityEventWriter()
+        with patch('apps.core.services.security_service._event_writer', writer), \
+                patch.object(writer, '_ensure_started'):
+            event = SecurityService.log_security_event_async(
+                event_type='login_attempt',
+                ip_address='10.0.0.1',
+                details={'username': 'testuser'}
+            )
+        
+        # Nothing is written until the queue is flushed
+        self.assertFalse(SecurityEvent.objects.filter(pk=event.pk).exists())
+        
+        writer.flush()
+        self.assertTrue(SecurityEvent.objects.filter(
+            pk=event.pk,
+            ip_address='10.0.0.1'
+        ).exists())
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_ip_blocking_uses_cache_counters(self):
+        """Test that IP blocking reads failed-login counters from the cache."""
+        for _ in range(5):
+            SecurityService.record_failed_login('10.0.0.2')
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(SecurityService.is_ip_blocked('10.0.0.2'))
+            self.assertFalse(SecurityService.is_ip_blocked('10.0.0.3'))
+        self.assertEqual(SecurityService.get_recent_failed_login_count('10.0.0.2', hours=1), 5)
+    
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_only_liveness_endpoints_skip_monitoring(self):
+        """Test that the health/ mount of the API is monitored and blocked IPs get no exemption."""
+        from apps.core.authentication.middleware import _is_health_check
+        
+        self.assertTrue(_is_health_check('/api/health/'))
+        self.assertTrue(_is_health_check('/api/health/detailed/'))
+        self.assertFalse(_is_health_check('/health/auth/login/'))
+        
+        for _ in range(5):
+            SecurityService.record_failed_login('10.0.0.4')
+        response = self.client.get('/api/health/', REMOTE_ADDR='10.0.0.4')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_request_events_flushed_in_one_batch(self):
+        """Test that events logged during a request are written together."""
+        request = RequestFactory().get('/api/auth/users/')
+        SecurityService.start_request_buffer(request)
+        
+        for event_type in ('login_attempt', 'access_denied'):
+            SecurityService.log_security_event_async(
+                event_type=event_type,
+                ip_address='10.0.0.4',
+                request=request
+            )
+        self.assertFalse(SecurityEvent.objects.filter(ip_address='10.0.0.4').exists())
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(SecurityService.flush_request_buffer(request), 2)
+        self.assertEqual(SecurityEvent.objects.filter(ip_address='10.0.0.4').count(), 2)
 
 
 class UserRegistrationTestCase(APITestCase):
@@ -3,13 +3,13 @@ Test cases for Change Request functionality.
 """
 import json
 from decimal import Decimal
-from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.core.tests.base import TestCase
 from apps.core.models import (
     ChangeRequest, Project, Client, Organization, DocumentInstance,
     DocumentTemplate, Role, Permission
@@ -91,7 +91,7 @@ class ChangeRequestModelTestCase(TestCase):
                 }
             },
             created_by=self.staff_user,
-            title="Change Request Document"
+            document_title="Change Request Document"
         )
 
         # Create change request
@@ -156,6 +156,20 @@ class ChangeRequestModelTestCase(TestCase):
         data = self.change_request.get_change_request_data()
         self.assertEqual(data['description'], 'Updated description')
 
+    def test_update_change_request_data_patches_single_key(self):
+        """Test that a field update is one UPDATE that leaves other keys intact."""
+        change_request = ChangeRequest.objects.get(pk=self.change_request.pk)
+        with self.assertNumQueries(1):
+            change_request.update_change_request_data('reason', 'Updated reason')
+        change_request.sign_change_request(self.client_user, {'name': 'Client Rep'})
+
+        self.document_instance.refresh_from_db()
+        filled_data = self.document_instance.filled_data
+        self.assertEqual(filled_data['change_request']['reason'], 'Updated reason')
+        self.assertEqual(filled_data['change_request']['description'], 'Test change description')
+        self.assertEqual(filled_data['impact_assessment']['estimated_time'], 5)
+        self.assertEqual(filled_data['signatures'], {'client_representative': {'name': 'Client Rep'}})
+
     def test_update_impact_assessment(self):
         """Test updating impact assessment."""
         assessment_data = {
@@ -204,6 +218,14 @@ class ChangeRequestModelTestCase(TestCase):
         signature_data_stored = self.change_request.get_signature_data()
         self.assertEqual(signature_data_stored['provider_representative']['name'], 'Provider Rep')
 
+    def test_for_pdf_loads_data_in_one_query(self):
+        """Test that for_pdf() joins everything _prepare_pdf_data reads."""
+        with self.assertNumQueries(1):
+            change_request = ChangeRequest.objects.for_pdf().get(pk=self.change_request.pk)
+            pdf_data = change_request._prepare_pdf_data()
+        self.assertEqual(pdf_data['client_name'], self.organization.name)
+        self.assertEqual(pdf_data['description'], 'Test change description')
+
     def test_can_be_signed_by(self):
         """Test can_be_signed_by method."""
         # Client user can sign (not signed yet)
@@ -288,7 +310,7 @@ class ChangeRequestSerializerTestCase(TestCase):
             project=self.project,
             filled_data={},
             created_by=self.staff_user,
-            title="Change Request Document"
+            document_title="Change Request Document"
         )
 
         self.change_request = ChangeRequest.objects.create(
@@ -408,7 +430,7 @@ class ChangeRequestAPITestCase(TestCase):
             project=self.project,
             filled_data={},
             created_by=self.staff_user,
-            title="API Change Request Document"
+            document_title="API Change Request Document"
         )
 
         self.change_request = ChangeRequest.objects.create(
@@ -7,13 +7,13 @@ API endpoints, and PDF generation integration.
 
 import json
 from datetime import date, timedelta
-from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.core.tests.base import TestCase
 from apps.core.models import Client, Organization, Contact, Role, DocumentTemplate
 from apps.core.services.pdf_service import PDFGenerationService
 
@@ -160,6 +160,129 @@ class ClientModelTestCase(TestCase):
         
         self.assertFalse(client.content_availability)
 
+    def test_with_completion_matches_python_calculation(self):
+        """Test with_completion() annotations agree with the intake properties."""
+        complete_org = Organization.objects.create(
+            name='Complete School',
+            organization_type='educational',
+            email='admin@completeschool.edu'
+        )
+        Client.objects.create(
+            organization=complete_org,
+            client_since=timezone.now().date(),
+            school_name='Complete School',
+            contact_person='John Doe',
+            email='john@completeschool.edu',
+            project_type=['website_development'],
+            project_purpose=['improve_student_engagement'],
+            pilot_scope_features=['user_authentication'],
+            timeline_preference='asap',
+            number_of_students=0,
+            design_preferences={'style': 'modern'},
+            token_commitment_fee='100.00'
+        )
+
+        clients = list(Client.objects.with_completion())
+        self.assertEqual(len(clients), 2)
+        for client in clients:
+            plain = Client.objects.get(pk=client.pk)
+            self.assertEqual(client.is_intake_complete, plain.is_intake_complete)
+            self.assertEqual(client.intake_completion_percentage, plain.intake_completion_percentage)
+        self.assertEqual(
+            Client.objects.with_completion().filter(intake_complete=True).get().organization,
+            complete_org
+        )
+
+    def test_list_fields_are_mirrored_into_features(self):
+        """Test saving a client keeps its ClientFeature rows in sync with the list fields."""
+        self.client.project_type = ['website_development', 'student_portal']
+        self.client.pilot_scope_features = ['user_authentication']
+        self.client.save()
+
+        self.assertEqual(
+            set(self.client.features.values_list('feature_type', 'code')),
+            {
+                ('project_type', 'website_development'),
+                ('project_type', 'student_portal'),
+                ('pilot_scope_features', 'user_authentication'),
+            }
+        )
+
+        self.client.project_type = ['student_portal']
+        self.client.save(update_fields=['project_type'])
+        self.assertEqual(
+            list(self.client.features.filter(feature_type='project_type').values_list('code', flat=True)),
+            ['student_portal']
+        )
+
+        # Saving without touching the list fields leaves the features alone
+        client = Client.objects.get(pk=self.client.pk)
+        client.school_name = 'Renamed School'
+        with self.assertNumQueries(1):
+            client.save()
+
+    def test_list_default_defers_large_columns(self):
+        """Test list_default() leaves the large text and JSON columns out of the SELECT."""
+        client = Client.objects.list_default().get(pk=self.client.pk)
+        self.assertEqual(client.get_deferred_fields(), set(Client.LIST_DEFERRED_FIELDS))
+
+        # Deferred columns still load on access
+        self.assertEqual(client.project_type, [])
+
+    def test_with_related_loads_primary_contact(self):
+        """Test with_related() loads __str__ and primary_contact without per-row queries."""
+        contact = Contact.objects.create(
+            organization=self.organization,
+            first_name='Jane',
+            last_name='Doe',
+            email='jane@testschool.edu',
+            role_type='decision_maker',
+            is_primary_contact=True
+        )
+        other_org = Organization.objects.create(
+            name='Other School',
+            organization_type='educational',
+            email='admin@otherschool.edu'
+        )
+        Client.objects.create(
+            organization=other_org,
+            client_since=timezone.now().date()
+        )
+
+        with self.assertNumQueries(1):
+            clients = {str(client): client.primary_contact for client in Client.objects.with_related()}
+
+        self.assertEqual(clients[str(self.client)], contact)
+        self.assertIn(None, clients.values())
+        self.assertEqual(self.client.primary_contact, contact)
+
+    def test_primary_contact_is_kept_in_sync(self):
+        """Test promoting a contact demotes the previous primary and updates the organization."""
+        first = Contact.objects.create(
+            organization=self.organization,
+            first_name='Jane',
+            last_name='Doe',
+            email='jane@testschool.edu',
+            is_primary_contact=True
+        )
+        second = Contact.objects.create(
+            organization=self.organization,
+            first_name='John',
+            last_name='Roe',
+            email='john@testschool.edu',
+            is_primary_contact=True
+        )
+
+        first.refresh_from_db()
+        self.organization.refresh_from_db()
+        self.assertFalse(first.is_primary_contact)
+        self.assertEqual(self.organization.primary_contact, second)
+
+        second.is_primary_contact = False
+        second.save()
+        self.organization.refresh_from_db()
+        self.assertIsNone(self.organization.primary_contact)
+
 
 class ClientSerializerTestCase(TestCase):
     """Test cases for Client serializers."""
@@ -250,6 +373,16 @@ class ClientSerializerTestCase(TestCase):
         self.assertEqual(updated_client.school_name, 'Updated School Name')
         self.assertEqual(updated_client.contact_person, 'Jane Doe')
 
+    def test_client_intake_update_serializer_rejects_unknown_features(self):
+        """Test that intake updates only accept known list values."""
+        from apps.core.serializers.client import ClientIntakeUpdateSerializer
+        
+        serializer = ClientIntakeUpdateSerializer(
+            instance=self.client, data={'pilot_scope_features': ['x' * 200]}, partial=True
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('pilot_scope_features', serializer.errors)
+
 
 class ClientAPITestCase(TestCase):
     """Test cases for Client API endpoints."""
@@ -1,10 +1,17 @@
 """
 Database connection and model tests for Sumano OMS.
 """
-from django.test import TestCase
+import time
+import uuid
+from unittest import skipUnless
+
 from django.db import connection
 from django.core.exceptions import ValidationError
-from apps.core.models import Organization, Client, Project, Contact
+from django.utils import timezone
+from apps.core.tests.base import TestCase
+from apps.core.models import Organization, Client, Project, Contact, DocumentTemplate
+from apps.core.utils.bulk import COPY_NULL, _to_copy_value, copy_from, supports_copy
+from apps.core.utils.ids import uuid7
 
 
 class DatabaseConnectionTestCase(TestCase):
@@ -23,6 +30,60 @@ class DatabaseConnectionTestCase(TestCase):
         self.assertIn('sumano_ops', db_name)
 
 
+class BulkCopyTestCase(TestCase):
+    """Test the PostgreSQL COPY bulk loading helper."""
+
+    def test_copy_values(self):
+        """Test NULLs and JSON are encoded for COPY's CSV format."""
+        opts = DocumentTemplate._meta
+        self.assertEqual(_to_copy_value(opts.get_field('description'), None, connection), COPY_NULL)
+        self.assertEqual(_to_copy_value(opts.get_field('description'), '', connection), '')
+        self.assertEqual(
+            _to_copy_value(opts.get_field('required_fields'), ['title'], connection),
+            '["title"]'
+        )
+
+    @skipUnless(supports_copy(), "COPY requires PostgreSQL")
+    def test_copy_from(self):
+        """Test rows are loaded with COPY."""
+        now = timezone.now()
+        field_names = [
+            'id', 'created_at', 'updated_at', 'name', 'description', 'template_type',
+            'content', 'version', 'status', 'required_fields', 'optional_fields', 'created_by',
+        ]
+        rows = [
+            [uuid.uuid4(), now, now, f'Copied Template {i}', '', 'INTAKE',
+             '<p>{{ data.title }}</p>', '1.0', 'DRAFT', ['title'], [], None]
+            for i in range(3)
+        ]
+        
+        self.assertEqual(copy_from(DocumentTemplate, field_names, rows), 3)
+        
+        copied = DocumentTemplate.objects.filter(name__startswith='Copied Template')
+        self.assertEqual(copied.count(), 3)
+        self.assertEqual(copied.first().required_fields, ['title'])
+
+
+class UUID7TestCase(TestCase):
+    """Test time-ordered primary keys."""
+
+    def test_uuid7_layout_and_order(self):
+        """Test that uuid7() sets version and variant bits and sorts by time."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        
+        self.assertEqual(first.version, 7)
+        self.assertEqual(first.variant, uuid.RFC_4122)
+        self.assertLess(first, second)
+        self.assertAlmostEqual(first.int >> 80, time.time_ns() // 1_000_000, delta=1000)
+
+    def test_organization_uses_uuid7(self):
+        """Test that new organizations get UUIDv7 primary keys."""
+        org = Organization.objects.create(name="UUID7 Org")
+        self.assertEqual(org.id.version, 7)
+
+
 class NormalizedModelsBasicTestCase(TestCase):
     """Test basic functionality of normalized models."""
 
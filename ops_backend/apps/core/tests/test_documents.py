@@ -5,9 +5,12 @@ This module tests the unified document engine functionality including
 template management, PDF generation, and document instances.
 """
 
+import hashlib
 import json
 import time
-from django.test import TestCase
+from unittest.mock import patch
+from django.test import override_settings
+from django.template import Template
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
 from django.urls import reverse
@@ -15,9 +18,11 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.core.tests.base import TestCase
 from apps.core.models import (
     DocumentTemplate, DocumentInstance, Project, Client, Organization, Contact, Role
 )
+from apps.core.services import pdf_service
 from apps.core.services.pdf_service import PDFGenerationService
 
 User = get_user_model()
@@ -167,6 +172,29 @@ class DocumentInstanceTestCase(TestCase):
         self.assertEqual(self.document.status, 'SIGNED')
         self.assertEqual(self.document.signed_by, self.user)
 
+    def test_bulk_sign_and_archive(self):
+        """Test signing and archiving a queryset with one UPDATE each."""
+        signable = DocumentInstance.objects.create(
+            template=self.template,
+            project=self.project,
+            document_title='Signable Document',
+            created_by=self.user
+        )
+        signable.store_pdf(b'%PDF-1.4 fake pdf content')
+        
+        documents = DocumentInstance.objects.filter(pk__in=[self.document.pk, signable.pk])
+        with self.assertNumQueries(1):
+            self.assertEqual(documents.sign(self.user), 1)
+        
+        signable.refresh_from_db()
+        self.document.refresh_from_db()
+        self.assertTrue(signable.is_signed())
+        self.assertEqual(self.document.status, 'GENERATED')
+        
+        self.assertEqual(documents.archive(), 2)
+        self.assertEqual(documents.archive(), 0)
+        self.assertFalse(documents.exclude(status='ARCHIVED').exists())
+
     def test_document_file_operations(self):
         """Test document file operations."""
         # Test without file
@@ -175,15 +203,38 @@ class DocumentInstanceTestCase(TestCase):
         
         # Test with file
         pdf_content = b'%PDF-1.4 fake pdf content'
-        self.document.generated_pdf.save(
-            'test.pdf',
-            ContentFile(pdf_content),
-            save=True
-        )
+        self.document.store_pdf(pdf_content)
         
+        self.document.refresh_from_db()
         self.assertEqual(self.document.get_file_size(), len(pdf_content))
+        self.assertEqual(self.document.file_sha256, hashlib.sha256(pdf_content).hexdigest())
         self.assertIsNotNone(self.document.get_file_url())
 
+        # Identical content is stored once, under its digest
+        duplicate = DocumentInstance.objects.create(
+            template=self.template,
+            project=self.project,
+            document_title='Duplicate Document',
+            created_by=self.user
+        )
+        duplicate.store_pdf(pdf_content)
+        self.assertEqual(duplicate.generated_pdf.name, self.document.generated_pdf.name)
+        self.assertIn(self.document.file_sha256, self.document.generated_pdf.name)
+
+    def test_document_file_url_cached(self):
+        """Test that PDF URLs are reused within the cache window."""
+        self.document.store_pdf(b'%PDF-1.4 cached url content')
+        storage = self.document.generated_pdf.storage
+        
+        with patch.object(storage, 'url', wraps=storage.url) as url:
+            first = self.document.get_file_url()
+            self.assertEqual(DocumentInstance.objects.get(pk=self.document.pk).get_file_url(), first)
+            self.assertEqual(url.call_count, 1)
+            
+            with override_settings(DOCUMENT_URL_CACHE_SECONDS=0):
+                self.document.get_file_url()
+            self.assertEqual(url.call_count, 2)
+
     def test_document_str_representation(self):
         """Test string representation."""
         expected = 'Test Document Title - Test Project'
@@ -288,6 +339,51 @@ class PDFGenerationServiceTestCase(TestCase):
         
         self.assertIn('Published template not found', str(context.exception))
 
+    @override_settings(DEBUG=True)
+    def test_unjoined_project_relations_warn_in_debug(self):
+        """Test that projects without client relations joined are flagged."""
+        data = {'title': 'Test Document Title'}
+        
+        project = Project.objects.get(pk=self.project.pk)
+        with self.assertLogs('apps.core.services.pdf_service', level='WARNING') as logs:
+            PDFGenerationService.generate_from_template(
+                template_name='Test Template', data=data, user=self.user, project=project
+            )
+        self.assertTrue(any('select_related' in line for line in logs.output))
+        
+        project = Project.objects.select_related('client__organization').get(pk=self.project.pk)
+        with self.assertNoLogs('apps.core.services.pdf_service', level='WARNING'):
+            PDFGenerationService.generate_from_template(
+                template_name='Test Template', data=data, user=self.user, project=project
+            )
+
+    def test_compiled_template_memoized_until_saved(self):
+        """Test compiled templates are reused until the template changes."""
+        compiled = PDFGenerationService.get_compiled_template(self.template)
+        
+        template = DocumentTemplate.objects.get(pk=self.template.pk)
+        self.assertIs(PDFGenerationService.get_compiled_template(template), compiled)
+        
+        template.content = '<html><body><h2>{{ data.title }}</h2></body></html>'
+        template.save()
+        
+        pdf_bytes = PDFGenerationService.render_bytes(template, {'title': 'Edited'})
+        self.assertIn(b'<h2>Edited</h2>', pdf_bytes)
+
+    def test_compiled_template_evicted_on_save(self):
+        """Test saving a template drops its stale compiled versions."""
+        compiled = PDFGenerationService.get_compiled_template(self.template)
+        
+        self.template.content = '<html><body><h3>{{ data.title }}</h3></body></html>'
+        self.template.save()
+        
+        recompiled = PDFGenerationService.get_compiled_template(self.template)
+        self.assertIsNot(recompiled, compiled)
+        self.assertEqual(
+            [key for key in pdf_service._COMPILED_TEMPLATES if key[0] == self.template.pk],
+            [(self.template.pk, self.template.updated_at)],
+        )
+
     def test_validate_required_fields(self):
         """Test field validation."""
         # Valid data
@@ -439,6 +535,33 @@ class DocumentAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
 
+    def test_bulk_sign_documents(self):
+        """Test signing several documents through the API."""
+        self.client.force_authenticate(user=self.user)
+        
+        documents = []
+        for i in range(3):
+            document = DocumentInstance.objects.create(
+                template=self.template,
+                project=self.project,
+                document_title=f'Bulk Document {i}',
+                created_by=self.user
+            )
+            document.store_pdf(b'%PDF-1.4 fake pdf content')
+            documents.append(document)
+        
+        data = {'document_ids': [str(document.id) for document in documents]}
+        response = self.client.post('/api/documents/sign/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'requested': 3, 'signed': 3})
+        self.assertEqual(
+            DocumentInstance.objects.filter(status='SIGNED', signed_by=self.user).count(),
+            3
+        )
+        
+        response = self.client.post('/api/documents/sign/', {'document_ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_document_statistics(self):
         """Test document statistics endpoint."""
         self.client.force_authenticate(user=self.user)
@@ -514,3 +637,31 @@ class DocumentPerformanceTestCase(TestCase):
         # Verify all documents were created
         documents = DocumentInstance.objects.filter(template=self.simple_template)
         self.assertEqual(documents.count(), 5)
+
+    def test_batch_render_and_persist(self):
+        """Test rendering with a compiled template and persisting in bulk."""
+        compiled = Template(self.simple_template.content)
+        
+        instances = []
+        for i in range(5):
+            data = {'title': f'Bulk Document {i+1}'}
+            pdf_bytes = PDFGenerationService.render_bytes(
+                self.simple_template, data, compiled=compiled, user=self.user
+            )
+            self.assertIn(data['title'].encode(), pdf_bytes)
+            instances.append(
+                PDFGenerationService.build_document_instance(
+                    self.simple_template, data, pdf_bytes, self.user
+                )
+            )
+        
+        # Nothing is written until the batch is persisted
+        self.assertFalse(DocumentInstance.objects.filter(template=self.simple_template).exists())
+        
+        with self.assertNumQueries(1):
+            PDFGenerationService.persist_many(instances)
+        
+        documents = DocumentInstance.objects.filter(template=self.simple_template)
+        self.assertEqual(documents.count(), 5)
+        self.assertTrue(all(doc.generated_pdf for doc in documents))
+        self.assertTrue(all(doc.file_size and len(doc.file_sha256) == 64 for doc in documents))
@@ -12,7 +12,6 @@ import time
 import tempfile
 import uuid
 from io import BytesIO
-from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
@@ -27,6 +26,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ops_backend.settings')
 import django
 django.setup()
 
+from apps.core.tests.base import TestCase, TransactionTestCase
 from apps.core.models import (
     Organization, Client, Project, Role, Permission, Attachment
 )
@@ -1,9 +1,11 @@
 """
 Tests for health check endpoints.
 """
-from django.test import TestCase, Client
+from django.test import Client
 from django.urls import reverse
 
+from apps.core.tests.base import TestCase
+
 
 class HealthCheckTestCase(TestCase):
     """Test cases for health check endpoints."""
@@ -120,6 +120,35 @@ class TestContactModel:
             email="john@testorg.com"
         )
         assert str(contact) == "John Doe (Test Org)"
+    
+    @pytest.mark.django_db
+    def test_contact_bulk_upsert(self):
+        """Test bulk upsert inserts new contacts and updates existing emails."""
+        org = Organization.objects.create(name="Test Org")
+        existing = Contact.objects.create(
+            organization=org,
+            first_name="John",
+            last_name="Doe",
+            email="john@testorg.com"
+        )
+        
+        Contact.objects.bulk_upsert(org, [
+            {'first_name': 'Johnny', 'last_name': 'Doe', 'email': 'john@testorg.com',
+             'title': 'Principal'},
+            {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'jane@testorg.com'},
+        ])
+        
+        assert org.contacts.count() == 2
+        existing.refresh_from_db()
+        assert existing.first_name == "Johnny"
+        assert existing.title == "Principal"
+        assert org.contacts.filter(email="jane@testorg.com").exists()
+        
+        with pytest.raises(ValueError):
+            Contact.objects.bulk_upsert(org, [
+                {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'jane@testorg.com',
+                 'is_primary_contact': True},
+            ])
 
 
 class TestClientModel:
@@ -203,6 +232,16 @@ class TestProjectModel:
         assert project.client_name == "Test Org"  # property
         assert project.is_active is True  # default status is planning
     
+    def test_choice_display_labels(self):
+        """Test get_FOO_display() labels, including unknown values."""
+        project = Project(service_type="web_development")
+        label = dict(Project._meta.get_field("service_type").flatchoices)["web_development"]
+        assert project.get_service_type_display() == label
+        assert project.get_service_type_display() == label
+        
+        project.service_type = "not_a_choice"
+        assert project.get_service_type_display() == "not_a_choice"
+    
     @pytest.mark.django_db
     def test_project_client_relationship(self):
         """Test project-client relationship."""
@@ -697,6 +736,66 @@ class TestUserModel:
         
         assert user.has_permission("view_projects")
         assert permission in user.get_all_permissions()
+    
+    @pytest.mark.django_db
+    def test_permission_codenames_cached_until_roles_change(self):
+        """Test permission codenames are memoized and refreshed on role changes."""
+        permission = Permission.objects.create(
+            name="Approve Test Documents",
+            codename="approve_test_docs",
+            description="Can approve documents",
+            category="document"
+        )
+        role = Role.objects.create(
+            name="Test Approver",
+            codename="test_approver",
+            description="Approves documents",
+            level=2
+        )
+        role.permissions.add(permission)
+        
+        user = User.objects.create_user(
+            username="approver",
+            email="approver@sumano.tech",
+            employee_id="EMP901"
+        )
+        assert not user.has_permission("approve_test_docs")
+        assert user.get_permission_codenames() is user.get_permission_codenames()
+        
+        user.additional_roles.add(role)
+        assert user.has_permission("approve_test_docs")
+    
+    @pytest.mark.django_db
+    def test_failed_login_attempts_lock_account(self):
+        """Test atomic failed-login counting and lockout."""
+        user = User.objects.create_user(
+            username="lockuser",
+            email="lock@sumano.tech",
+            employee_id="EMP900"
+        )
+        
+        for _ in range(4):
+            user.increment_failed_login_attempts()
+        user.refresh_from_db()
+        assert user.failed_login_attempts == 4
+        assert not user.is_account_locked()
+        
+        user.increment_failed_login_attempts()
+        assert user.is_account_locked()
+        user.refresh_from_db()
+        assert user.failed_login_attempts == 5
+        assert user.is_account_locked()
+        
+        user.reset_failed_login_attempts()
+        user.refresh_from_db()
+        assert user.failed_login_attempts == 0
+        
+        # A copy loaded before the failures still resets the stored counter
+        stale = User.objects.get(pk=user.pk)
+        user.increment_failed_login_attempts()
+        stale.reset_failed_login_attempts()
+        user.refresh_from_db()
+        assert user.failed_login_attempts == 0
 
 
 class TestModelRelationships:
@@ -1,7 +1,9 @@
 """
 Tests for PDF generation endpoints.
 """
-from django.test import TestCase, Client
+from django.test import Client
+
+from apps.core.tests.base import TestCase
 
 
 class PDFTestCase(TestCase):
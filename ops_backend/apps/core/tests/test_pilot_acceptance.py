@@ -6,13 +6,13 @@ and integration with the unified document system for pilot acceptance workflows.
 """
 
 import json
-from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.core.tests.base import TestCase
 from apps.core.models import (
     PilotAcceptance, Project, Client, Organization, DocumentInstance, 
     DocumentTemplate, Role, Permission, StatusTransition
@@ -132,6 +132,17 @@ class PilotAcceptanceModelTestCase(TestCase):
         with self.assertRaises(ValueError):
             acceptance.update_checklist_item('invalid_field', True)
 
+        # Test updating several items at once keeps the others
+        acceptance.update_checklist_items({'pages_present': True, 'mobile_friendly': True})
+        stored = DocumentInstance.objects.get(pk=document_instance.pk).filled_data['checklist']
+        self.assertEqual(stored, {
+            'digital_gateway_live': True, 'mobile_friendly': True, 'pages_present': True
+        })
+        self.assertEqual(acceptance.get_checklist_data(), stored)
+
+        with self.assertRaises(ValueError):
+            acceptance.update_checklist_items({'pages_present': True, 'invalid_field': True})
+
     def test_completion_percentage_calculation(self):
         """Test completion percentage calculation."""
         document_instance = DocumentInstance.objects.create(
@@ -229,6 +240,7 @@ class PilotAcceptanceModelTestCase(TestCase):
         self.assertTrue(acceptance.company_representative_signed)
         self.assertIsNotNone(acceptance.company_representative_signed_at)
         self.assertTrue(acceptance.is_fully_signed)
+        self.assertEqual(list(PilotAcceptance.objects.fully_signed()), [acceptance])
 
     def test_pdf_data_preparation(self):
         """Test PDF data preparation."""
@@ -270,6 +282,11 @@ class PilotAcceptanceModelTestCase(TestCase):
         self.assertEqual(pdf_data['school_representative_name'], 'Jane Doe')
         self.assertIn('completion_percentage', pdf_data)
 
+        with self.assertNumQueries(1):
+            acceptance = PilotAcceptance.objects.for_pdf().get(pk=acceptance.pk)
+            pdf_data = acceptance._prepare_pdf_data()
+        self.assertEqual(pdf_data['school_name'], self.organization.name)
+
 
 class PilotAcceptanceSerializerTestCase(TestCase):
     """Test cases for PilotAcceptance serializers."""
@@ -3,13 +3,13 @@ Test cases for Pilot Handover functionality.
 """
 import json
 from decimal import Decimal
-from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.core.tests.base import TestCase
 from apps.core.models import (
     PilotHandover, Project, Client, Organization, DocumentInstance,
     DocumentTemplate, Role, Permission
@@ -121,6 +121,15 @@ class PilotHandoverModelTestCase(TestCase):
         self.pilot_handover.team_lead_signed = True
         self.assertTrue(self.pilot_handover.is_ready_for_handover)
 
+    def test_ready_for_handover_queryset(self):
+        """Test ready_for_handover() matches is_ready_for_handover."""
+        self.assertFalse(PilotHandover.objects.ready_for_handover().exists())
+        
+        self.pilot_handover.status = 'ready_for_review'
+        self.pilot_handover.team_lead_signed = True
+        self.pilot_handover.save()
+        self.assertEqual(list(PilotHandover.objects.ready_for_handover()), [self.pilot_handover])
+
     def test_completion_percentage_property(self):
         """Test completion_percentage property."""
         # With current test data (2 out of 3 items completed: domain_configured=True, ssl_active=True, site_load_ok=False)
@@ -160,6 +169,28 @@ class PilotHandoverModelTestCase(TestCase):
         data = self.pilot_handover.get_checklist_data()
         self.assertFalse(data['technical_setup']['domain_configured'])
         self.assertTrue(data['technical_setup']['site_load_ok'])
+        
+        # Only the section is patched; the rest of filled_data is kept
+        stored = DocumentInstance.objects.get(pk=self.document_instance.pk).filled_data
+        self.assertEqual(stored['checklist']['technical_setup'], new_section_data)
+        self.assertIn('project_reference', stored)
+
+    def test_update_checklist_sections(self):
+        """Test updating several checklist sections at once."""
+        core_pages = {'home_completed': True, 'contact_correct': False}
+        final_test_run = {'backup_taken': True}
+        self.pilot_handover.update_checklist_sections({
+            'core_pages': core_pages, 'final_test_run': final_test_run
+        })
+        
+        stored = DocumentInstance.objects.get(pk=self.document_instance.pk).filled_data['checklist']
+        self.assertEqual(stored['core_pages'], core_pages)
+        self.assertEqual(stored['final_test_run'], final_test_run)
+        self.assertTrue(stored['technical_setup']['domain_configured'])
+        self.assertEqual(self.pilot_handover.get_checklist_data(), stored)
+        
+        with self.assertRaises(ValueError):
+            self.pilot_handover.update_checklist_sections({'invalid_section': {}})
 
     def test_sign_handover(self):
         """Test signing handover document."""
@@ -174,6 +205,33 @@ class PilotHandoverModelTestCase(TestCase):
         
         signature_data_stored = self.pilot_handover.get_signature_data()
         self.assertEqual(signature_data_stored['team_lead']['name'], 'Team Lead')
+        
+        stored = PilotHandover.objects.select_related('document_instance').get(pk=self.pilot_handover.pk)
+        self.assertTrue(stored.team_lead_signed)
+        self.assertEqual(stored.get_signature_data()['team_lead']['name'], 'Team Lead')
+
+    def test_sign_handover_with_deferred_filled_data(self):
+        """Test signing does not load a deferred filled_data."""
+        handover = PilotHandover.objects.select_related('document_instance').defer(
+            'document_instance__filled_data'
+        ).get(pk=self.pilot_handover.pk)
+        
+        handover.sign_handover(self.staff_user, {'name': 'Team Lead'})
+        
+        self.assertIn('filled_data', handover.document_instance.get_deferred_fields())
+        self.assertEqual(handover.get_signature_data()['team_lead']['name'], 'Team Lead')
+
+    def test_sign_handover_serializes_dates(self):
+        """Test datetime and date signature values are stored as ISO strings."""
+        signed_at = timezone.now()
+        self.pilot_handover.sign_handover(self.staff_user, {
+            'name': 'Team Lead', 'date': signed_at, 'day': signed_at.date()
+        })
+        
+        stored = self.pilot_handover.get_signature_data()['team_lead']
+        self.assertEqual(stored['date'], signed_at.isoformat())
+        self.assertEqual(stored['day'], signed_at.date().isoformat())
+        self.assertEqual(stored['name'], 'Team Lead')
 
     def test_can_be_signed_by(self):
         """Test can_be_signed_by method."""
@@ -197,6 +255,13 @@ class PilotHandoverModelTestCase(TestCase):
         self.assertIn('technical_setup', pdf_data)
         self.assertEqual(pdf_data['status'], 'Draft')
 
+    def test_for_pdf_loads_data_in_one_query(self):
+        """Test that for_pdf() joins everything _prepare_pdf_data reads."""
+        with self.assertNumQueries(1):
+            handover = PilotHandover.objects.for_pdf().get(pk=self.pilot_handover.pk)
+            pdf_data = handover._prepare_pdf_data()
+        self.assertEqual(pdf_data['client_school_name'], self.organization.name)
+
 
 class PilotHandoverSerializerTestCase(TestCase):
     """Test cases for PilotHandover serializers."""
@@ -471,7 +536,10 @@ class PilotHandoverAPITestCase(TestCase):
         self.assertIn('total_handovers', data)
         self.assertIn('status_breakdown', data)
         self.assertIn('approval_breakdown', data)
-        self.assertIn('average_completion_percentage', data)
+        self.assertEqual(
+            data['average_completion_percentage'],
+            f"{self.pilot_handover.completion_percentage:.1f}%"
+        )
 
     def test_my_handovers(self):
         """Test getting handovers assigned to current user."""
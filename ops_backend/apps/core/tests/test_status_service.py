@@ -6,9 +6,9 @@ status transitions, validation, progress calculation, and audit trails.
 """
 
 import pytest
-from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from apps.core.tests.base import TestCase
 from apps.core.models import Project, StatusTransition, Organization, Client, User
 from apps.core.services.status_service import ProjectStatusService
 
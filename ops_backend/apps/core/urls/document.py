@@ -18,6 +18,7 @@ from apps.core.views.document import (
     generate_document,
     download_pdf,
     sign_document,
+    bulk_sign_documents,
     document_statistics,
 )
 
@@ -39,5 +40,6 @@ urlpatterns = [
     path('generate/', generate_document, name='document-generate'),
     path('<uuid:document_id>/pdf/', download_pdf, name='document-download-pdf'),
     path('<uuid:document_id>/sign/', sign_document, name='document-sign'),
+    path('sign/', bulk_sign_documents, name='document-bulk-sign'),
     path('statistics/', document_statistics, name='document-statistics'),
 ]
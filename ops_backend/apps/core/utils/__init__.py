@@ -0,0 +1,6 @@
+"""
+Utilities package for Sumano OMS.
+
+This package contains small, model-agnostic helpers shared by services,
+management commands and data migrations.
+"""
@@ -0,0 +1,117 @@
+"""
+Database expressions for the Sumano Operations Management System.
+
+This module provides ``JSONSet``, which patches one key of a JSON column in
+the UPDATE itself instead of loading, copying and rewriting the whole value,
+and ``JSONMerge``, which patches several keys of one object the same way.
+"""
+
+import json
+from typing import Any, Dict, Sequence
+
+from django.db import NotSupportedError
+from django.db.models import Expression, F, JSONField
+
+
+class JSONSet(Expression):
+    """
+    Set ``value`` at ``path`` inside a JSON column.
+
+    Missing intermediate objects are created, so
+    ``JSONSet('filled_data', ['signatures', 'client_representative'], data)``
+    works whether or not ``filled_data`` already has a ``signatures`` key.
+    Supported on PostgreSQL (``jsonb_set``) and SQLite (``json_set``).
+    """
+
+    output_field = JSONField()
+
+    def __init__(self, field_name: str, path: Sequence[str], value: Any):
+        super().__init__()
+        if not path:
+            raise ValueError("JSONSet requires a non-empty path")
+        self.target = F(field_name)
+        self.path = list(path)
+        self.value = json.dumps(value)
+
+    def get_source_expressions(self):
+        return [self.target]
+
+    def set_source_expressions(self, exprs):
+        (self.target,) = exprs
+
+    def resolve_expression(self, *args, **kwargs):
+        clone = self.copy()
+        clone.target = self.target.resolve_expression(*args, **kwargs)
+        return clone
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(f"JSONSet is not supported on {connection.vendor}")
+
+    def as_postgresql(self, compiler, connection):
+        target_sql, target_params = compiler.compile(self.target)
+        return self._jsonb_set(target_sql, list(target_params), self.path)
+
+    def _jsonb_set(self, target_sql, target_params, path):
+        # jsonb_set() only creates the last path element, so nested keys are
+        # set on a COALESCEd copy of their parent object.
+        key, rest = path[0], path[1:]
+        if rest:
+            value_sql, value_params = self._jsonb_set(
+                f"({target_sql} -> %s)", [*target_params, key], rest
+            )
+        else:
+            value_sql, value_params = self._jsonb_value(target_sql, target_params, key)
+        return (
+            f"jsonb_set(COALESCE({target_sql}, '{{}}'::jsonb), ARRAY[%s], {value_sql}, true)",
+            [*target_params, key, *value_params],
+        )
+
+    def _jsonb_value(self, parent_sql, parent_params, key):
+        """Return the SQL for the new value stored under ``key`` of the parent."""
+        return "%s::jsonb", [self.value]
+
+    def as_sqlite(self, compiler, connection):
+        target_sql, target_params = compiler.compile(self.target)
+        json_path = '$' + ''.join(f'.{json.dumps(key)}' for key in self.path)
+        return (
+            f"json_set(COALESCE({target_sql}, '{{}}'), %s, json(%s))",
+            [*target_params, json_path, self.value],
+        )
+
+
+class JSONMerge(JSONSet):
+    """
+    Set each key of the dict ``value`` inside the object at ``path``.
+
+    Keys not in ``value`` are kept, so
+    ``JSONMerge('filled_data', ['checklist'], {'a': True, 'b': False})``
+    writes both items in one UPDATE and leaves the rest of the checklist
+    alone. A missing object at ``path`` is created.
+    """
+
+    def __init__(self, field_name: str, path: Sequence[str], value: Dict[str, Any]):
+        if not isinstance(value, dict):
+            raise TypeError("JSONMerge requires a dict value")
+        super().__init__(field_name, path, value)
+        self.items = value
+
+    def _jsonb_value(self, parent_sql, parent_params, key):
+        # || replaces the listed top-level keys and keeps the others
+        return (
+            f"(COALESCE(NULLIF({parent_sql} -> %s, 'null'::jsonb), '{{}}'::jsonb) || %s::jsonb)",
+            [*parent_params, key, self.value],
+        )
+
+    def as_sqlite(self, compiler, connection):
+        target_sql, target_params = compiler.compile(self.target)
+        json_path = '$' + ''.join(f'.{json.dumps(key)}' for key in self.path)
+        # json_set() takes any number of path/value pairs
+        pairs_sql, pairs_params = '', []
+        for key, value in self.items.items():
+            pairs_sql += ', %s, json(%s)'
+            pairs_params += [f'{json_path}.{json.dumps(key)}', json.dumps(value)]
+        return (
+            f"json_set(json_set(COALESCE({target_sql}, '{{}}'), %s, "
+            f"COALESCE(json(json_extract({target_sql}, %s)), json('{{}}'))){pairs_sql})",
+            [*target_params, json_path, *target_params, json_path, *pairs_params],
+        )
@@ -0,0 +1,38 @@
+"""
+Identifier helpers for the Sumano Operations Management System.
+
+This module provides time-ordered UUIDs for primary keys. Random UUIDv4 keys
+land anywhere in a B-tree index, so every insert can split a page; UUIDv7
+keys start with a timestamp and are appended near the right-hand edge.
+"""
+
+import os
+import time
+import uuid
+
+_TIMESTAMP_MASK = (1 << 48) - 1
+_RAND_A_MASK = (1 << 12) - 1
+_RAND_B_MASK = (1 << 62) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate an RFC 9562 version 7 UUID.
+
+    Layout: 48-bit Unix timestamp in milliseconds, 4-bit version, 12 random
+    bits, 2-bit variant, 62 random bits. UUIDs generated in different
+    milliseconds sort in creation order.
+
+    Returns:
+        uuid.UUID: Time-ordered UUID
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (
+        (timestamp_ms & _TIMESTAMP_MASK) << 80
+        | 0x7 << 76
+        | ((rand >> 62) & _RAND_A_MASK) << 64
+        | 0b10 << 62
+        | (rand & _RAND_B_MASK)
+    )
+    return uuid.UUID(int=value)
@@ -0,0 +1,28 @@
+"""
+Storage helpers for the Sumano Operations Management System.
+
+This module memoizes storage URLs so list views that render many file
+links do not rebuild (or, on signing backends, re-sign) each one per row.
+"""
+
+import time
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _cached_url(storage, name, window):
+    """Build a storage URL; ``window`` only rotates the cache key."""
+    return storage.url(name)
+
+
+def cached_file_url(field_file, timeout):
+    """
+    Return the URL of a stored file, reused for up to ``timeout`` seconds.
+    
+    Entries are keyed by storage, file name and the current ``timeout``
+    window, so every URL is rebuilt after at most one window. Keep the
+    timeout below the storage's URL expiry; 0 disables the cache.
+    """
+    if timeout <= 0:
+        return field_file.url
+    return _cached_url(field_file.storage, field_file.name, int(time.time() // timeout))
@@ -13,6 +13,7 @@ from django.db.models import Q, Sum, Count
 from django.utils import timezone
 
 from apps.core.models import Attachment, Project
+from apps.core.models.system import STAFF_ROLE_CODENAMES
 from apps.core.serializers.attachment import (
     AttachmentSerializer, AttachmentCreateSerializer, AttachmentUpdateSerializer,
     AttachmentDownloadSerializer, AttachmentListSerializer, AttachmentStatsSerializer
@@ -30,9 +31,7 @@ class AttachmentViewSet(viewsets.ModelViewSet):
     API endpoint for managing file attachments.
     Supports upload, download, list, and delete operations with proper security.
     """
-    queryset = Attachment.objects.all().select_related(
-        'project__client__organization', 'uploaded_by__role'
-    )
+    queryset = Attachment.objects.with_related()
     serializer_class = AttachmentSerializer
     permission_classes = [IsAuthenticatedUser]
     filterset_fields = ['project', 'file_type', 'uploaded_by', 'is_active']
@@ -76,12 +75,14 @@ class AttachmentViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         user = self.request.user
         
+        role_codename = getattr(user, 'role_codename', '')
+        
         # Staff and superadmin can see all files
-        if hasattr(user, 'role') and user.role.codename in ['staff', 'superadmin']:
+        if role_codename in STAFF_ROLE_CODENAMES:
             return queryset
         
         # Client contacts can only see files from their projects
-        if hasattr(user, 'role') and user.role.codename == 'client_contact':
+        if role_codename == 'client_contact':
             # For now, client contacts can see all files
             # In a real implementation, this would filter by project access
             return queryset
@@ -18,6 +18,7 @@ from apps.core.serializers.auth import (
     LoginSerializer, UserRegistrationSerializer, UserProfileSerializer,
     ChangePasswordSerializer, RoleSerializer, SecurityEventSerializer
 )
+from apps.core.authentication.backends import JWTAuthenticationBackend
 from apps.core.authentication.permissions import (
     IsAuthenticatedUser, IsSuperAdmin, CanViewUsers, CanManageUsers,
     CanViewSecurityEvents, CanManageSecurityEvents
@@ -194,6 +195,11 @@ class LogoutView(APIView):
             request_method=request.method
         )
         
+        # Stop serving this token's user from the JWT user cache
+        token = request.auth
+        if token is not None and hasattr(token, 'get'):
+            JWTAuthenticationBackend.invalidate_cached_user(token.get('jti'))
+        
         # Log user out
         logout(request)
         
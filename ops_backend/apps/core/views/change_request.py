@@ -14,6 +14,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from apps.core.models import ChangeRequest, Project, DocumentInstance
+from apps.core.models.system import STAFF_ROLE_CODENAMES
 from apps.core.serializers.change_request import (
     ChangeRequestSerializer, ChangeRequestCreateSerializer, 
     ChangeRequestSignatureSerializer, ImpactAssessmentUpdateSerializer
@@ -21,7 +22,6 @@ from apps.core.serializers.change_request import (
 from apps.core.authentication.permissions import (
     IsAuthenticatedUser, CanViewProjects, CanManageProjects, IsStaff
 )
-from apps.core.services.pdf_service import PDFGenerationService
 from apps.core.services.security_service import SecurityService
 
 logger = logging.getLogger(__name__)
@@ -49,6 +49,13 @@ class ChangeRequestViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'request_date', 'status']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        if self.action == 'generate_authorization_document':
+            return ChangeRequest.objects.for_pdf()
+        if self.action in ('list', 'pending_assessment', 'pending_client_decision'):
+            return ChangeRequest.objects.list_light()
+        return super().get_queryset()
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return ChangeRequestCreateSerializer
@@ -195,16 +202,7 @@ class ChangeRequestViewSet(viewsets.ModelViewSet):
         change_request = self.get_object()
         
         try:
-            # Prepare data for PDF generation
-            pdf_data = change_request._prepare_pdf_data()
-            
-            # Generate PDF using unified document system
-            document_instance, pdf_bytes = PDFGenerationService.generate_from_template(
-                template_name='Change Request Authorization',
-                data=pdf_data,
-                user=request.user,
-                project=change_request.project
-            )
+            document_instance, pdf_bytes = change_request.generate_change_authorization_document(request.user)
             
             SecurityService.log_security_event(
                 event_type='change_request_authorization_generated',
@@ -359,9 +357,7 @@ class ChangeRequestViewSet(viewsets.ModelViewSet):
         Get change requests pending impact assessment.
         """
         user = request.user
-        user_role = getattr(user, 'role', None)
-        
-        if not user_role or user_role.codename not in ['staff', 'superadmin']:
+        if getattr(user, 'role_codename', '') not in STAFF_ROLE_CODENAMES:
             return Response(
                 {'detail': 'Access denied. Only staff can view pending assessments.'},
                 status=status.HTTP_403_FORBIDDEN
@@ -379,9 +375,7 @@ class ChangeRequestViewSet(viewsets.ModelViewSet):
         Get change requests pending client decision.
         """
         user = request.user
-        user_role = getattr(user, 'role', None)
-        
-        if not user_role or user_role.codename not in ['client_contact', 'staff', 'superadmin']:
+        if getattr(user, 'role_codename', '') not in ('client_contact', 'staff', 'superadmin'):
             return Response(
                 {'detail': 'Access denied.'},
                 status=status.HTTP_403_FORBIDDEN
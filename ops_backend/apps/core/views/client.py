@@ -10,10 +10,10 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 
-from apps.core.models import Client, Organization, Contact
+from apps.core.models import Client, ClientFeature, Organization, Contact
 from apps.core.serializers.client import (
     ClientSerializer, ClientCreateSerializer, ClientIntakeUpdateSerializer, OrganizationSerializer
 )
@@ -25,6 +25,9 @@ from apps.core.services.security_service import SecurityService
 
 logger = logging.getLogger(__name__)
 
+# Choice labels used when building intake PDF data
+_TIMELINE_DISPLAY = dict(Client.TIMELINE_CHOICES)
+
 
 class ClientViewSet(viewsets.ModelViewSet):
     """
@@ -34,7 +37,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     for intake form management and PDF generation.
     """
     
-    queryset = Client.objects.select_related('organization', 'billing_contact').all()
+    queryset = Client.objects.with_related()
     permission_classes = [IsAuthenticatedUser, CanViewClients]
     
     def get_serializer_class(self):
@@ -60,6 +63,10 @@ class ClientViewSet(viewsets.ModelViewSet):
         """Filter queryset based on user permissions and query parameters."""
         queryset = super().get_queryset()
         
+        # Compute intake completion in SQL rather than per row in the serializer
+        if self.action == 'list':
+            queryset = queryset.with_completion()
+        
         # Filter by intake completion status
         intake_complete = self.request.query_params.get('intake_complete')
         if intake_complete is not None:
@@ -188,7 +195,7 @@ class ClientViewSet(viewsets.ModelViewSet):
                     'pilot_scope_features': ', '.join(client.pilot_scope_features) if client.pilot_scope_features else '',
                     'pilot_start_date': client.pilot_start_date.strftime('%Y-%m-%d') if client.pilot_start_date else '',
                     'pilot_end_date': client.pilot_end_date.strftime('%Y-%m-%d') if client.pilot_end_date else '',
-                    'timeline_preference': client.get_timeline_preference_display(),
+                    'timeline_preference': _TIMELINE_DISPLAY.get(client.timeline_preference, client.timeline_preference),
                     'additional_notes': client.additional_notes,
                     'submission_date': timezone.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
@@ -259,7 +266,7 @@ class ClientViewSet(viewsets.ModelViewSet):
                 'pilot_scope_features': ', '.join(client.pilot_scope_features) if client.pilot_scope_features else 'Not provided',
                 'pilot_start_date': client.pilot_start_date.strftime('%Y-%m-%d') if client.pilot_start_date else 'Not provided',
                 'pilot_end_date': client.pilot_end_date.strftime('%Y-%m-%d') if client.pilot_end_date else 'Not provided',
-                'timeline_preference': client.get_timeline_preference_display() if client.timeline_preference else 'Not provided',
+                'timeline_preference': _TIMELINE_DISPLAY.get(client.timeline_preference, client.timeline_preference) or 'Not provided',
                 'content_availability': 'Yes' if client.content_availability else 'No',
                 'token_commitment_fee': str(client.token_commitment_fee) if client.token_commitment_fee else 'Not provided',
                 'additional_notes': client.additional_notes or 'None',
@@ -319,16 +326,20 @@ class ClientViewSet(viewsets.ModelViewSet):
             incomplete_intakes = total_clients - complete_intakes
             
             # Project type distribution
-            project_types = {}
-            for client in Client.objects.exclude(project_type__isnull=True).exclude(project_type=[]):
-                for project_type in client.project_type:
-                    project_types[project_type] = project_types.get(project_type, 0) + 1
+            project_types = dict(
+                ClientFeature.objects.filter(feature_type='project_type')
+                .values_list('code')
+                .annotate(count=Count('client'))
+                .order_by()
+            )
             
             # Timeline preference distribution
-            timeline_preferences = {}
-            for client in Client.objects.exclude(timeline_preference=''):
-                pref = client.timeline_preference
-                timeline_preferences[pref] = timeline_preferences.get(pref, 0) + 1
+            timeline_preferences = dict(
+                Client.objects.exclude(timeline_preference='')
+                .values_list('timeline_preference')
+                .annotate(count=Count('id'))
+                .order_by()
+            )
             
             return Response({
                 'total_clients': total_clients,
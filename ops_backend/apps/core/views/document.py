@@ -19,7 +19,8 @@ from apps.core.models import DocumentTemplate, DocumentInstance, Project
 from apps.core.serializers.document import (
     DocumentTemplateSerializer,
     DocumentInstanceSerializer,
-    DocumentGenerationSerializer
+    DocumentGenerationSerializer,
+    DocumentBulkSignSerializer
 )
 from apps.core.authentication.permissions import (
     IsAuthenticatedUser,
@@ -106,7 +107,7 @@ class DocumentInstanceListView(generics.ListAPIView):
     
     def get_queryset(self):
         """Filter documents by project."""
-        queryset = DocumentInstance.objects.select_related('template', 'project', 'created_by')
+        queryset = DocumentInstance.objects.with_related()
         
         project_id = self.request.query_params.get('project', None)
         if project_id:
@@ -125,7 +126,7 @@ class DocumentInstanceDetailView(generics.RetrieveAPIView):
     
     GET /api/documents/{id}/
     """
-    queryset = DocumentInstance.objects.select_related('template', 'project', 'created_by')
+    queryset = DocumentInstance.objects.with_related()
     serializer_class = DocumentInstanceSerializer
     permission_classes = [IsAuthenticatedUser, CanViewDocuments]
 
@@ -292,6 +293,53 @@ def sign_document(request, document_id):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticatedUser, CanApproveDocuments])
+def bulk_sign_documents(request):
+    """
+    Sign several documents in one request.
+    
+    Documents that cannot be signed are skipped.
+    
+    POST /api/documents/sign/
+    """
+    serializer = DocumentBulkSignSerializer(data=request.data)
+    
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        document_ids = serializer.validated_data['document_ids']
+        signed_count = DocumentInstance.objects.filter(id__in=document_ids).sign(request.user)
+        
+        # Log one signing event for the batch
+        SecurityService.log_security_event(
+            event_type='document_signed',
+            user=request.user,
+            ip_address=SecurityService.get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            request_path=request.path,
+            request_method=request.method,
+            details={
+                'document_ids': [str(document_id) for document_id in document_ids],
+                'signed_count': signed_count,
+            },
+            severity='medium'
+        )
+        
+        return Response({
+            'requested': len(document_ids),
+            'signed': signed_count,
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"Bulk document signing failed: {str(e)}")
+        return Response(
+            {'error': 'Document signing failed'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticatedUser, CanViewDocuments])
 def document_statistics(request):
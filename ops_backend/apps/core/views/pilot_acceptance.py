@@ -13,14 +13,14 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from django.utils import timezone
 
-from apps.core.models import PilotAcceptance, Project, DocumentInstance
+from apps.core.models import PilotAcceptance, Client, Project, DocumentInstance
+from apps.core.models.system import STAFF_ROLE_CODENAMES
 from apps.core.serializers.pilot_acceptance import (
     PilotAcceptanceSerializer, PilotAcceptanceCreateSerializer, PilotAcceptanceSignatureSerializer
 )
 from apps.core.authentication.permissions import (
     IsAuthenticatedUser, CanViewProjects, CanManageProjects, IsStaff
 )
-from apps.core.services.pdf_service import PDFGenerationService
 from apps.core.services.security_service import SecurityService
 
 logger = logging.getLogger(__name__)
@@ -35,6 +35,9 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
     queryset = PilotAcceptance.objects.all().select_related(
         'project', 'project__client', 'project__client__organization',
         'document_instance', 'created_by'
+    ).defer(
+        # Only the client's organization is rendered
+        *(f'project__client__{name}' for name in Client.LIST_DEFERRED_FIELDS)
     ).prefetch_related('project__phases')
     
     serializer_class = PilotAcceptanceSerializer
@@ -48,6 +51,14 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'completion_date', 'acceptance_status']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        if self.action == 'generate_certificate':
+            return PilotAcceptance.objects.for_pdf()
+        if self.action == 'sign_acceptance':
+            # Signing patches filled_data in the database without reading it
+            return super().get_queryset().defer('document_instance__filled_data')
+        return super().get_queryset()
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return PilotAcceptanceCreateSerializer
@@ -156,16 +167,7 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
         pilot_acceptance = self.get_object()
         
         try:
-            # Prepare data for PDF generation
-            pdf_data = pilot_acceptance._prepare_pdf_data()
-            
-            # Generate PDF using unified document system
-            document_instance, pdf_bytes = PDFGenerationService.generate_from_template(
-                template_name='Pilot Acceptance Certificate',
-                data=pdf_data,
-                user=request.user,
-                project=pilot_acceptance.project
-            )
+            document_instance, pdf_bytes = pilot_acceptance.generate_acceptance_certificate(request.user)
             
             SecurityService.log_security_event(
                 event_type='pilot_acceptance_certificate_generated',
@@ -218,9 +220,8 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Update checklist items
-            for field_name, value in checklist_data.items():
-                pilot_acceptance.update_checklist_item(field_name, value)
+            # Update all checklist items in one write
+            pilot_acceptance.update_checklist_items(checklist_data)
             
             SecurityService.log_security_event(
                 event_type='pilot_acceptance_checklist_updated',
@@ -258,10 +259,7 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
         not_accepted_count = queryset.filter(acceptance_status='not_accepted').count()
         
         # Fully signed statistics
-        fully_signed_count = queryset.filter(
-            school_representative_signed=True,
-            company_representative_signed=True
-        ).count()
+        fully_signed_count = queryset.fully_signed().count()
         
         # Completion statistics
         completed_projects = queryset.filter(
@@ -284,9 +282,9 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
         Get acceptances pending signatures.
         """
         user = request.user
-        user_role = getattr(user, 'role', None)
+        role_codename = getattr(user, 'role_codename', '')
         
-        if not user_role:
+        if not role_codename:
             return Response(
                 {'detail': 'User role not found.'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -294,10 +292,10 @@ class PilotAcceptanceViewSet(viewsets.ModelViewSet):
         
         queryset = self.get_queryset()
         
-        if user_role.codename == 'client_contact':
+        if role_codename == 'client_contact':
             # School representative - show acceptances they can sign
             pending = queryset.filter(school_representative_signed=False)
-        elif user_role.codename in ['staff', 'superadmin']:
+        elif role_codename in STAFF_ROLE_CODENAMES:
             # Company representative - show acceptances they can sign
             pending = queryset.filter(company_representative_signed=False)
         else:
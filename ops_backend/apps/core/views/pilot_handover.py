@@ -13,7 +13,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q, Avg
 from django.utils import timezone
 
-from apps.core.models import PilotHandover, Project, DocumentInstance
+from apps.core.models import PilotHandover, Client, Project, DocumentInstance
 from apps.core.serializers.pilot_handover import (
     PilotHandoverSerializer, PilotHandoverCreateSerializer, 
     PilotHandoverSignatureSerializer, ChecklistSectionUpdateSerializer
@@ -21,7 +21,6 @@ from apps.core.serializers.pilot_handover import (
 from apps.core.authentication.permissions import (
     IsAuthenticatedUser, CanViewProjects, CanManageProjects, IsStaff
 )
-from apps.core.services.pdf_service import PDFGenerationService
 from apps.core.services.security_service import SecurityService
 
 logger = logging.getLogger(__name__)
@@ -37,6 +36,9 @@ class PilotHandoverViewSet(viewsets.ModelViewSet):
     queryset = PilotHandover.objects.all().select_related(
         'project', 'project__client', 'project__client__organization',
         'document_instance', 'created_by', 'reviewed_by'
+    ).defer(
+        # Only the client's organization is rendered
+        *(f'project__client__{name}' for name in Client.LIST_DEFERRED_FIELDS)
     ).prefetch_related('project__phases')
     
     serializer_class = PilotHandoverSerializer
@@ -50,6 +52,14 @@ class PilotHandoverViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'expected_delivery_date', 'status']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        if self.action == 'generate_handover_document':
+            return PilotHandover.objects.for_pdf()
+        if self.action in ('sign_handover', 'make_approval_decision'):
+            # Neither action reads filled_data; signing patches it in the database
+            return super().get_queryset().defer('document_instance__filled_data')
+        return super().get_queryset()
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return PilotHandoverCreateSerializer
@@ -229,16 +239,7 @@ class PilotHandoverViewSet(viewsets.ModelViewSet):
         pilot_handover = self.get_object()
         
         try:
-            # Prepare data for PDF generation
-            pdf_data = pilot_handover._prepare_pdf_data()
-            
-            # Generate PDF using unified document system
-            document_instance, pdf_bytes = PDFGenerationService.generate_from_template(
-                template_name='Internal Pilot Handover',
-                data=pdf_data,
-                user=request.user,
-                project=pilot_handover.project
-            )
+            document_instance, pdf_bytes = pilot_handover.generate_handover_document(request.user)
             
             SecurityService.log_security_event(
                 event_type='pilot_handover_document_generated',
@@ -368,10 +369,16 @@ class PilotHandoverViewSet(viewsets.ModelViewSet):
         approved_decisions = queryset.filter(final_go_no_go='approved').count()
         hold_decisions = queryset.filter(final_go_no_go='hold').count()
         
-        # Completion statistics - calculate manually since completion_percentage is a property
+        # Completion statistics - computed from the checklists alone, without building handovers
         avg_completion = 0
         if total_handovers > 0:
-            total_completion = sum(h.completion_percentage for h in queryset)
+            filled_data = queryset.prefetch_related(None).values_list(
+                'document_instance__filled_data', flat=True
+            )
+            total_completion = sum(
+                PilotHandover._completion_percentage((data or {}).get('checklist', {}))
+                for data in filled_data.iterator(chunk_size=1000)
+            )
             avg_completion = total_completion / total_handovers
         
         return Response({
@@ -57,7 +57,6 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'apps.core.authentication.middleware.IPBlockingMiddleware',
     'apps.core.authentication.middleware.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -136,6 +135,11 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads larger than FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk while the
+# request is parsed. Keeping the spool on the same filesystem as MEDIA_ROOT lets
+# FileSystemStorage save them with a rename instead of copying the bytes again.
+FILE_UPLOAD_TEMP_DIR = env('FILE_UPLOAD_TEMP_DIR', default=str(MEDIA_ROOT / '.uploads'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -152,7 +156,7 @@ AUTHENTICATION_BACKENDS = [
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.backends.RoleJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -165,6 +169,24 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Security event logging
+# When False, request-path security events are queued and bulk-written by a
+# background thread; set True to write them synchronously.
+SECURITY_LOG_SYNC = env.bool('SECURITY_LOG_SYNC', default=False)
+
+# Login attempts allowed per client IP and username each minute
+LOGIN_ATTEMPTS_PER_MINUTE = env.int('LOGIN_ATTEMPTS_PER_MINUTE', default=10)
+
+# Buffer attachment download counts in Redis; apply them by running
+# `manage.py flush_download_counts` every minute.
+ATTACHMENT_DOWNLOAD_BUFFER = env.bool('ATTACHMENT_DOWNLOAD_BUFFER', default=False)
+
+# Seconds an attachment's storage URL is reused before being rebuilt; keep
+# below the URL expiry of signing storage backends. 0 disables the cache.
+ATTACHMENT_URL_CACHE_SECONDS = env.int('ATTACHMENT_URL_CACHE_SECONDS', default=300)
+# The same for generated document PDFs
+DOCUMENT_URL_CACHE_SECONDS = env.int('DOCUMENT_URL_CACHE_SECONDS', default=300)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = env('CORS_ALLOWED_ORIGINS', default=[])
 CSRF_TRUSTED_ORIGINS = env('CSRF_TRUSTED_ORIGINS', default=[])